@@ -0,0 +1,186 @@
+"""
+Micro-benchmarks for the hot paths of a sync.
+
+Usage: `pdm run bench [name ...]`, or `python scripts/bench.py [name ...]`. Runs all benchmarks by default.
+"""
+
+from __future__ import annotations
+
+import sys
+import tempfile
+import timeit
+import tracemalloc
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+BENCHMARKS: dict[str, Callable[[], None]] = {}
+
+
+def benchmark(func: Callable[[], None]) -> Callable[[], None]:
+    BENCHMARKS[func.__name__] = func
+    return func
+
+
+def report(label: str, func: Callable[[], object], number: int = 5) -> float:
+    """Print and return the best time of `number` runs, in seconds."""
+    best = min(timeit.repeat(func, number=1, repeat=number))
+    print(f"  {label:<40} {best * 1000:>10.2f} ms")  # noqa: T201
+    return best
+
+
+def generate_pre_commit_config(nb_repos: int, nb_hooks: int = 3, nb_deps: int = 5) -> str:
+    """Generate a large block-style pre-commit configuration."""
+    lines = ["default_language_version:", "  python: python3.12", "repos:"]
+    for repo in range(nb_repos):
+        lines += [
+            f"  - repo: https://github.com/example/repo-{repo}",
+            "    # Some comment",
+            f"    rev: 'v1.{repo}.0'",
+            "    hooks:",
+        ]
+        for hook in range(nb_hooks):
+            lines += [f"      - id: hook-{repo}-{hook}", "        args: [--fix, --exit-non-zero-on-fix]"]
+            lines += ["        additional_dependencies:"]
+            lines += [f"          - types-package-{dep}==1.{dep}" for dep in range(nb_deps)]
+    return "\n".join(lines) + "\n"
+
+
+@benchmark
+def parse_pre_commit_config() -> None:
+    """Fast scanner vs strictyaml on large configurations."""
+    from sync_pre_commit_lock.pre_commit_config import PreCommitHookConfig
+    from sync_pre_commit_lock.scanner import scan_repos
+
+    path = Path(".pre-commit-config.yaml")
+    for nb_repos in (10, 100, 300):
+        text = generate_pre_commit_config(nb_repos)
+        print(f"{nb_repos} repos, {text.count(chr(10))} lines:")  # noqa: T201
+        scanner = report("scanner", lambda text=text: scan_repos(text))
+        strict = report("strictyaml", lambda text=text: PreCommitHookConfig(text, path)._load_yaml(), number=1)
+        print(f"  {'speedup':<40} {strict / scanner:>10.1f} x")  # noqa: T201
+
+
+def peak_memory(label: str, func: Callable[[], object]) -> None:
+    """Print the peak of memory allocated by the Python heap while running `func`."""
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    print(f"  {label:<40} {peak / 1024 / 1024:>10.2f} MiB")  # noqa: T201
+
+
+def generate_uv_lock(nb_packages: int, nb_wheels: int = 10) -> str:
+    """Generate a large `uv.lock`, with the hashes and dependencies uv writes."""
+    chunks = ['version = 1\nrevision = 2\nrequires-python = ">=3.10"\n']
+    for idx in range(nb_packages):
+        url = f"https://files.pythonhosted.org/packages/ab/cd/package-{idx}"
+        chunks.append(
+            f'\n[[package]]\nname = "package-{idx}"\nversion = "1.{idx}.0"\n'
+            'source = { registry = "https://pypi.org/simple" }\n'
+            f'dependencies = [\n    {{ name = "package-{idx // 2}" }},\n]\n'
+            f'sdist = {{ url = "{url}.tar.gz", hash = "sha256:{"0" * 64}", size = 219094 }}\n'
+            "wheels = [\n"
+            + "".join(
+                f'    {{ url = "{url}-{wheel}.whl", hash = "sha256:{"1" * 64}", size = 109097 }},\n'
+                for wheel in range(nb_wheels)
+            )
+            + "]\n"
+        )
+    return "".join(chunks)
+
+
+@benchmark
+def read_uv_lock() -> None:
+    """Streaming uv.lock reader vs full TOML parsing."""
+    from sync_pre_commit_lock.uv import _load_lock_toml, load_lock
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for nb_packages in (100, 1000, 10000):
+            path = Path(tmp) / "uv.lock"
+            path.write_text(generate_uv_lock(nb_packages))
+            print(f"{nb_packages} packages, {path.stat().st_size / 1024 / 1024:.1f} MiB:")  # noqa: T201
+            streaming = report("streaming", lambda path=path: load_lock(path))
+            parsed = report("toml", lambda path=path: _load_lock_toml(path), number=1)
+            print(f"  {'speedup':<40} {parsed / streaming:>10.1f} x")  # noqa: T201
+            peak_memory("streaming peak memory", lambda path=path: load_lock(path))
+            peak_memory("toml peak memory", lambda path=path: _load_lock_toml(path))
+
+
+@benchmark
+def pre_commit_repos() -> None:
+    """Memory and lookups of the repos of configurations with thousands of hooks."""
+    from sync_pre_commit_lock.pre_commit_config import PreCommitHookConfig
+
+    path = Path(".pre-commit-config.yaml")
+    for nb_repos in (100, 1000):
+        text = generate_pre_commit_config(nb_repos, nb_hooks=5)
+        config = PreCommitHookConfig(text, path)
+        print(f"{nb_repos} repos, {nb_repos * 5} hooks:")  # noqa: T201
+        peak_memory("repos peak memory", lambda text=text: PreCommitHookConfig(text, path).repos_normalized)
+        repos = config.repos_normalized
+        # Equal but distinct instances, so lookups don't short-circuit on identity
+        copies = [type(repo)(repo.repo, repo.rev, repo.hooks) for repo in repos]
+        report("build set", lambda config=config: set(config.repos))
+        report("lookups", lambda repos=repos, copies=copies: all(repo in repos for repo in copies))
+
+
+@benchmark
+def additional_dependencies() -> None:
+    """Analysis of a mypy hook with hundreds of `types-*` stubs, with cold and warm requirement caches."""
+    from unittest.mock import MagicMock
+
+    from sync_pre_commit_lock import Printer
+    from sync_pre_commit_lock.actions.sync_hooks import GenericLockedPackage, SyncPreCommitHooksVersion
+    from sync_pre_commit_lock.config import SyncPreCommitLockConfig
+    from sync_pre_commit_lock.pre_commit_config import PreCommitHook, PreCommitRepo
+    from sync_pre_commit_lock.requirements import parse_requirement, pin_requirement
+
+    for nb_deps in (100, 500):
+        deps = [f"types-package-{dep}>=1.{dep}" for dep in range(nb_deps)]
+        repos = {PreCommitRepo("https://github.com/pre-commit/mirrors-mypy", "v1.0.0", [PreCommitHook("mypy", deps)])}
+        locked = {
+            f"types-package-{dep}": GenericLockedPackage(f"types-package-{dep}", f"1.{dep}.1")
+            for dep in range(0, nb_deps, 2)
+        }
+        syncer = SyncPreCommitHooksVersion(MagicMock(spec=Printer), Path(), locked, SyncPreCommitLockConfig())
+
+        def cold(syncer: SyncPreCommitHooksVersion = syncer, repos: set[PreCommitRepo] = repos) -> None:
+            parse_requirement.cache_clear()
+            pin_requirement.cache_clear()
+            syncer.analyze_repos(repos)
+
+        print(f"{nb_deps} additional dependencies:")  # noqa: T201
+        report("cold cache", cold)
+        report("warm cache", lambda syncer=syncer, repos=repos: syncer.analyze_repos(repos))
+        print(f"  {'parse cache':<40} {parse_requirement.cache_info()}")  # noqa: T201
+
+
+@benchmark
+def url_patterns() -> None:
+    """Lookups of mirror URLs among thousands of user URL patterns."""
+    from sync_pre_commit_lock.mapping import UrlPatterns
+
+    for nb_patterns in (100, 1000, 5000):
+        patterns = UrlPatterns(
+            [(f"https://git-{idx % 50}.internal/*/package-{idx}", f"package-{idx}") for idx in range(nb_patterns)]
+        )
+        urls = [f"https://git-{idx % 50}.internal/mirrors/package-{idx}" for idx in range(0, nb_patterns, 10)]
+        print(f"{nb_patterns} patterns, {len(urls)} URLs:")  # noqa: T201
+        report("cold", lambda patterns=patterns, urls=urls: [patterns.match(url) for url in urls], number=1)
+        report("memoized", lambda patterns=patterns, urls=urls: [patterns.match(url) for url in urls])
+
+
+def main(names: list[str]) -> None:
+    for name in names or list(BENCHMARKS):
+        func = BENCHMARKS[name]
+        print(f"# {name}: {func.__doc__}")  # noqa: T201
+        func()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -1,40 +1,71 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING, Any, Final
+from typing import TYPE_CHECKING, Any, Final, Literal, TypeAlias
 
 if TYPE_CHECKING:
+    from collections.abc import Callable, Mapping, Sequence
+
     from sync_pre_commit_lock.pre_commit_config import PreCommitRepo
+    from sync_pre_commit_lock.pre_commit_store import EnvironmentEstimate
 
 PRE_COMMIT_CONFIG_FILENAME: Final[str] = ".pre-commit-config.yaml"
 
+Message: TypeAlias = "str | Callable[[], str]"
+"""A message, or a function building it, only called if the message is printed"""
+
+Level: TypeAlias = Literal["debug", "info", "warning", "error", "success"]
+
+
+def render(msg: Message) -> str:
+    return msg if isinstance(msg, str) else msg()
+
 
 class Printer(ABC):
+    """The output of the plugin, implemented for each frontend (shell, PDM, Poetry).
+
+    Internal: not an extension point, new arguments (e.g. `Message` functions) are passed to every printer.
+    """
+
     success_list_token: str
 
     @abstractmethod
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         raise NotImplementedError
 
+    def is_enabled(self, level: Level) -> bool:
+        """Whether messages of this level are printed, to skip building expensive ones."""
+        return True
+
     @abstractmethod
-    def debug(self, msg: str) -> None:
+    def debug(self, msg: Message) -> None:
         raise NotImplementedError
 
     @abstractmethod
-    def info(self, msg: str) -> None:
+    def info(self, msg: Message) -> None:
         raise NotImplementedError
 
     @abstractmethod
-    def warning(self, msg: str) -> None:
+    def warning(self, msg: Message) -> None:
         raise NotImplementedError
 
     @abstractmethod
-    def error(self, msg: str) -> None:
+    def error(self, msg: Message) -> None:
         raise NotImplementedError
 
     @abstractmethod
-    def success(self, msg: str) -> None:
+    def success(self, msg: Message) -> None:
         raise NotImplementedError
 
-    def list_updated_packages(self, packages: dict[str, tuple[PreCommitRepo, PreCommitRepo]]) -> None:
+    def list_updated_packages(
+        self,
+        packages: dict[str, tuple[PreCommitRepo, PreCommitRepo]],
+        environments: Mapping[str, EnvironmentEstimate] | None = None,
+    ) -> None:
+        """List the repos to update, by package, with the estimated hook environments they invalidate."""
         raise NotImplementedError
+
+    def print_diff(self, diff: Sequence[str]) -> None:
+        """Print the lines of a unified diff."""
+        for line in diff:
+            self.info(line.rstrip("\n"))
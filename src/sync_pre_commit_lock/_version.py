@@ -0,0 +1 @@
+__version__: str = "0.1.dev1+g93ebb34"
@@ -1,20 +1,40 @@
 from __future__ import annotations
 
+import platform
+import time
 from functools import cached_property
 from typing import TYPE_CHECKING, NamedTuple, Sequence
 
-from packaging.requirements import InvalidRequirement, Requirement
-from packaging.specifiers import SpecifierSet
-from packaging.utils import canonicalize_name
+from packaging.requirements import InvalidRequirement
 
-from sync_pre_commit_lock.db import DEPENDENCY_MAPPING, REPOSITORY_ALIASES, PackageRepoMapping
+from sync_pre_commit_lock.config import DEPENDENCY_UPDATE_POLICIES, DOWNGRADE_POLICIES
+from sync_pre_commit_lock.mapping import MappingIndex, mapping_index
 from sync_pre_commit_lock.pre_commit_config import PreCommitHook, PreCommitHookConfig, PreCommitRepo
+from sync_pre_commit_lock.pre_commit_store import PreCommitStore
+from sync_pre_commit_lock.requirements import (
+    evaluate_marker,
+    parse_requirement,
+    parse_version,
+    pin_requirement,
+    specifier_contains,
+    specifier_floor,
+)
+from sync_pre_commit_lock.rev_template import compile_rev_template
+from sync_pre_commit_lock.state import inputs_digest, repo_digest, settings_digest
+from sync_pre_commit_lock.utils import normalize_git_url
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
     from pathlib import Path
 
+    from packaging.version import Version
+
     from sync_pre_commit_lock import Printer
-    from sync_pre_commit_lock.config import SyncPreCommitLockConfig
+    from sync_pre_commit_lock.config import DependencyUpdatePolicy, DowngradePolicy, SyncPreCommitLockConfig
+    from sync_pre_commit_lock.db import RepoInfo
+    from sync_pre_commit_lock.pre_commit_store import EnvironmentEstimate
+    from sync_pre_commit_lock.rev_template import RevTemplate
+    from sync_pre_commit_lock.state import RepoVersions, SyncState
 
 
 class GenericLockedPackage(NamedTuple):
@@ -31,18 +51,47 @@ class SyncPreCommitHooksVersion:
         locked_packages: dict[str, GenericLockedPackage],
         plugin_config: SyncPreCommitLockConfig,
         dry_run: bool = False,
+        state: SyncState | None = None,
+        full: bool = False,
+        diff: bool = False,
+        python_version: str | None = None,
     ) -> None:
         self.printer = printer
         self.pre_commit_config_file_path = pre_commit_config_file_path
         self.locked_packages = locked_packages
         self.plugin_config = plugin_config
         self.dry_run = dry_run
+        self.state = state
+        self.full = full
+        self.diff = diff
+        self.python_version = python_version
+        """The Python version to evaluate the markers of additional dependencies for, None for the current one"""
+        self.synced_repos: dict[str, RepoVersions] = {}
+        """The packages each in-sync repo depends on, by repo digest, to be stored in the state"""
+        self.kept_dependencies: set[str] = set()
+        """Additional dependencies kept by the update policy, which pinning would have changed"""
+        self.avoided_rebuilds = 0
+        """Hooks whose environment is unchanged thanks to the update policy"""
+        self.refused_downgrades: list[str] = []
+        """Revs and additional dependencies kept by the downgrade policy"""
+        self.downgrade_notices = 0
+        """Downgrades refused or warned about by the downgrade policy"""
+        self.repo_packages: dict[PreCommitRepo, str | None] = {}
+        """The package of each repo, if mapped"""
 
     def execute(self) -> None:
         if self.plugin_config.disable_sync_from_lock:
             self.printer.debug("Sync pre-commit lock is disabled")
             return
 
+        if self.state is not None and not self.full:
+            try:
+                if self.state.is_up_to_date(self.pre_commit_config_file_path, self.inputs_digest):
+                    self.printer.info("Nothing changed since the last sync, pre-commit hooks are up to date.")
+                    return
+            except OSError:
+                pass  # Let the config loading report it
+
         try:
             pre_commit_config_data = PreCommitHookConfig.from_yaml_file(self.pre_commit_config_file_path)
         except FileNotFoundError:
@@ -56,112 +105,311 @@ class SyncPreCommitHooksVersion:
 
         # XXX We should have the list of packages mapped, but already up to date and print it
         to_fix, in_sync = self.analyze_repos(pre_commit_config_data.repos_normalized)
+        if self.avoided_rebuilds:
+            self.printer.info(
+                f"Kept {len(self.kept_dependencies)} additional dependencies already satisfied by the lockfile "
+                f"({self.dependency_update_policy} policy), avoiding {self.avoided_rebuilds} pre-commit environment rebuilds."
+            )
+
+        if self.refused_downgrades:
+            self.printer.warning(
+                f"Refused {len(self.refused_downgrades)} downgrades to the locked versions "
+                f"({self.downgrade_policy} policy): {', '.join(self.refused_downgrades)}"
+            )
 
         if len(to_fix) == 0 and len(in_sync) == 0:
             self.printer.info("No pre-commit hook detected that matches a locked package.")
+            self.record_state()
             return
         if len(to_fix) == 0:
             packages_str = ", ".join(
-                f"{self.mapping_reverse_by_url[pre_commit.repo]} ({pre_commit.rev})" for pre_commit in in_sync.values()
+                f"{self.get_repo_package(pre_commit)} ({pre_commit.rev})" for pre_commit in in_sync.values()
             )
             self.printer.info(f"All pre-commit hooks are already up to date with the lockfile: {packages_str}")
+            self.record_state()
             return
 
         self.printer.info("Detected pre-commit hooks that can be updated to match the lockfile:")
-        self.printer.list_updated_packages(
-            {self.mapping_reverse_by_url[repo.repo]: (repo, new_ver) for repo, new_ver in to_fix.items()}
-        )
+        environments = self.estimate_environments(to_fix, pre_commit_config_data)
+        packages = {self.get_repo_package(repo): (repo, new_ver) for repo, new_ver in to_fix.items()}
+        self.printer.list_updated_packages(packages, environments=environments)
+        if nb_hooks := sum(len(estimate.hooks) for estimate in environments.values()):
+            nb_cold = sum(len(estimate.cold) for estimate in environments.values())
+            self.printer.info(
+                f"This update invalidates {nb_hooks} pre-commit hook environments, "
+                f"{nb_cold} of which are not in the pre-commit store and will be built from scratch."
+            )
+        if self.diff:
+            name = self.pre_commit_config_file_path.name
+            plan = pre_commit_config_data.plan_pre_commit_repo_versions(to_fix)
+            self.printer.print_diff(list(plan.unified_diff(f"a/{name}", f"b/{name}")))
 
         if self.dry_run:
             self.printer.info("Dry run, skipping pre-commit hook update.")
             return
-        pre_commit_config_data.update_pre_commit_repo_versions(to_fix)
+        pre_commit_config_data.update_pre_commit_repo_versions(to_fix, fsync=self.plugin_config.fsync)
         self.printer.success(f"Pre-commit hooks have been updated in {self.pre_commit_config_file_path.name}!")
+        self.record_state()
+
+    def record_state(self) -> None:
+        """Remember the inputs of this sync, so the next one can be skipped if none changed."""
+        if self.state is not None:
+            self.state.record(
+                self.pre_commit_config_file_path, self.inputs_digest, self.settings_digest, self.synced_repos
+            )
+
+    @cached_property
+    def settings_digest(self) -> str:
+        return settings_digest(self.plugin_config, self.python_version or platform.python_version())
+
+    @cached_property
+    def inputs_digest(self) -> str:
+        return inputs_digest(self.locked_packages, self.settings_digest)
+
+    @cached_property
+    def previous_repos(self) -> dict[str, RepoVersions]:
+        """The repos in sync at the last sync, with the packages they depended on. Empty for a full sync."""
+        if self.state is None or self.full:
+            return {}
+        return self.state.previous_repos(self.settings_digest)
+
+    @cached_property
+    def pre_commit_store(self) -> PreCommitStore:
+        return PreCommitStore()
+
+    def estimate_environments(
+        self, to_fix: Mapping[PreCommitRepo, PreCommitRepo], pre_commit_config_data: PreCommitHookConfig
+    ) -> dict[str, EnvironmentEstimate]:
+        """Estimate the hook environments invalidated by the updates, by package."""
+        nodes = pre_commit_config_data.repo_nodes_normalized
+        return {
+            # The store records the URL as written in the config, not normalized
+            self.get_repo_package(repo): self.pre_commit_store.estimate(repo, new_repo, nodes[repo][0].repo.value)
+            for repo, new_repo in to_fix.items()
+        }
+
+    @cached_property
+    def dependency_update_policy(self) -> DependencyUpdatePolicy:
+        policy = self.plugin_config.dependency_update_policy
+        if policy not in DEPENDENCY_UPDATE_POLICIES:
+            self.printer.warning(
+                f"Unknown dependency update policy `{policy}`, expected one of: {', '.join(DEPENDENCY_UPDATE_POLICIES)}. "
+                "Using `pin`."
+            )
+            return "pin"
+        return policy
 
     @cached_property
-    def mapping(self) -> PackageRepoMapping:
-        return {**DEPENDENCY_MAPPING, **self.plugin_config.dependency_mapping}
+    def downgrade_policy(self) -> DowngradePolicy:
+        policy = self.plugin_config.downgrade_policy
+        if policy not in DOWNGRADE_POLICIES:
+            self.printer.warning(
+                f"Unknown downgrade policy `{policy}`, expected one of: {', '.join(DOWNGRADE_POLICIES)}. Using `allow`."
+            )
+            return "allow"
+        return policy
+
+    def accept_downgrade(self, name: str, current: Version | None, new: Version | None) -> bool:
+        """Whether an update of `name` from the `current` to the `new` version is allowed by the downgrade policy."""
+        if self.downgrade_policy == "allow" or current is None or new is None or new >= current:
+            return True
+        self.downgrade_notices += 1
+        if self.downgrade_policy == "warn":
+            self.printer.warning(f"Downgrading {name} from {current} to {new}, as in the lockfile.")
+            return True
+        self.printer.debug(lambda: f"Refusing to downgrade {name} from {current} to {new}.")
+        self.refused_downgrades.append(f"{name} ({current} -> {new})")
+        return False
+
+    def get_locked_versions(self, names: Iterable[str]) -> RepoVersions:
+        return {name: package.version if (package := self.locked_packages.get(name)) else None for name in names}
+
+    def get_pre_commit_repo_dependency_names(self, pre_commit_repo: PreCommitRepo) -> list[str]:
+        """The canonical names of the mapped package and additional dependencies of a repo."""
+        names = [self.get_repo_package(pre_commit_repo)]
+        for hook in pre_commit_repo.hooks:
+            for dependency in hook.additional_dependencies:
+                try:
+                    names.append(parse_requirement(dependency).canonical_name)
+                except InvalidRequirement:
+                    continue
+        return names
 
     @cached_property
-    def mapping_reverse_by_url(self) -> dict[str, str]:
-        """Merge the default mapping with the user-provided mapping. Also build a reverse mapping by URL."""
-        mapping_reverse_by_url = {repo["repo"]: lib_name for lib_name, repo in self.mapping.items()}
-        for canonical_name, aliases in REPOSITORY_ALIASES.items():
-            if canonical_name in mapping_reverse_by_url:
-                for alias in aliases:
-                    mapping_reverse_by_url[alias] = mapping_reverse_by_url[canonical_name]
-        # XXX Allow override / extend of aliases
-        return mapping_reverse_by_url
+    def mapping_index(self) -> MappingIndex:
+        index = mapping_index(self.plugin_config.dependency_mapping, self.plugin_config.repository_aliases)
+        for canonical_url in self.plugin_config.repository_aliases:
+            if normalize_git_url(canonical_url) not in index.package_by_url:
+                self.printer.warning(f"Repository aliases of `{canonical_url}` ignored: it is not a mapped repo.")
+        return index
+
+    @cached_property
+    def mapping(self) -> Mapping[str, RepoInfo]:
+        """The default mapping merged with the user-provided mapping."""
+        return self.mapping_index.packages
+
+    @cached_property
+    def mapping_reverse_by_url(self) -> Mapping[str, str]:
+        """The package of each normalized repo URL, including aliases."""
+        return self.mapping_index.package_by_url
 
     def get_pre_commit_repo_new_version(
         self,
         pre_commit_config_repo: PreCommitRepo,
     ) -> str | None:
-        dependency = self.mapping[self.mapping_reverse_by_url[pre_commit_config_repo.repo]]
-        dependency_name = self.mapping_reverse_by_url[pre_commit_config_repo.repo]
+        dependency_name = self.get_repo_package(pre_commit_config_repo)
+        dependency = self.mapping[dependency_name]
         locked_package = self.locked_packages.get(dependency_name)
 
         if not locked_package:
             self.printer.debug(
-                f"Pre-commit hook {pre_commit_config_repo.repo} has a mapping to Python package `{dependency_name}`, "
-                "but was not found in the lockfile"
+                lambda: (
+                    f"Pre-commit hook {pre_commit_config_repo.repo} has a mapping to Python package `{dependency_name}`, "
+                    "but was not found in the lockfile"
+                )
             )
             return None
 
         if "+" in locked_package.version:
             self.printer.debug(
-                f"Pre-commit hook {pre_commit_config_repo.repo} has a mapping to Python package `{dependency_name}`, "
-                f"but is skipped because the locked version `{locked_package.version}` contaims a `+`, "
-                "which is a local version identifier."
+                lambda: (
+                    f"Pre-commit hook {pre_commit_config_repo.repo} has a mapping to Python package `{dependency_name}`, "
+                    f"but is skipped because the locked version `{locked_package.version}` contaims a `+`, "
+                    "which is a local version identifier."
+                )
             )
             return None
         if locked_package.name in self.plugin_config.ignore:
-            self.printer.debug(f"Ignoring {locked_package.name} from configuration.")
+            self.printer.debug(lambda: f"Ignoring {locked_package.name} from configuration.")
             return None
 
         self.printer.debug(
-            f"Found mapping between pre-commit hook `{pre_commit_config_repo.repo}` and locked package `{locked_package.name}`."
+            lambda: (
+                f"Found mapping between pre-commit hook `{pre_commit_config_repo.repo}` and locked package `{locked_package.name}`."
+            )
         )
-        formatted_rev = dependency["rev"].replace("${rev}", str(locked_package.version))
-        if formatted_rev != pre_commit_config_repo.rev:
+        try:
+            template = compile_rev_template(dependency["rev"])
+        except ValueError as e:
+            self.printer.warning(f"Invalid rev template for `{dependency_name}`: {e}")
+            return None
+        formatted_rev = template.format(locked_package.version)
+        if formatted_rev != pre_commit_config_repo.rev and not self.is_same_version(
+            template, pre_commit_config_repo.rev, locked_package.version
+        ):
             self.printer.debug(
-                f"Pre-commit hook {pre_commit_config_repo.repo} and locked package {locked_package.name} have different versions:\n"
-                f" - Pre-commit hook ref: {pre_commit_config_repo.rev}\n"
-                f" - Locked package version: {locked_package.version}"
+                lambda: (
+                    f"Pre-commit hook {pre_commit_config_repo.repo} and locked package {locked_package.name} have different versions:\n"
+                    f" - Pre-commit hook ref: {pre_commit_config_repo.rev}\n"
+                    f" - Locked package version: {locked_package.version}"
+                )
             )
+            if not self.accept_downgrade(
+                pre_commit_config_repo.repo,
+                template.parse(pre_commit_config_repo.rev),
+                template.version(locked_package.version),
+            ):
+                return None
             return formatted_rev
 
         self.printer.debug(
-            f"Pre-commit hook {pre_commit_config_repo.repo} version already matches the version from the lockfile package."
+            lambda: (
+                f"Pre-commit hook {pre_commit_config_repo.repo} version already matches the version from the lockfile package."
+            )
         )
         return None
 
+    def is_same_version(self, template: RevTemplate, rev: str, version: str) -> bool:
+        """Whether a rev formatted with a rev template is the same version, e.g. `v1.0` and `1.0.0` for `v${rev}`."""
+        current = template.parse(rev)
+        if current is None or current != template.version(version):
+            return False
+        self.printer.debug(lambda: f"Pre-commit hook rev `{rev}` is the same version as the locked `{version}`.")
+        return True
+
     def get_pre_commit_repo_new_url(self, url: str) -> str:
-        return self.mapping[self.mapping_reverse_by_url[url]]["repo"]
+        """The canonical URL of a normalized repo URL, which may be an alias."""
+        return self.mapping_index.canonical_urls.get(url, url)
 
-    def get_pre_commit_repo_new_hooks(self, hooks: Sequence[PreCommitHook]) -> Sequence[PreCommitHook]:
-        return [self.get_pre_commit_repo_new_hook(hook) for hook in hooks]
+    def get_pre_commit_repo_new_hooks(
+        self, hooks: Sequence[PreCommitHook], new_dependencies: Mapping[str, str]
+    ) -> Sequence[PreCommitHook]:
+        return [self.get_pre_commit_repo_new_hook(hook, new_dependencies) for hook in hooks]
 
-    def get_pre_commit_repo_new_hook(self, hook: PreCommitHook) -> PreCommitHook:
-        return PreCommitHook(
-            hook.id, [self.get_pre_commit_repo_hook_new_dependency(dep) for dep in hook.additional_dependencies]
+    def get_pre_commit_repo_new_hook(self, hook: PreCommitHook, new_dependencies: Mapping[str, str]) -> PreCommitHook:
+        return PreCommitHook(hook.id, [new_dependencies[dep] for dep in hook.additional_dependencies])
+
+    def resolve_additional_dependencies(self, pre_commit_repos: Iterable[PreCommitRepo]) -> dict[str, str]:
+        """Resolve each distinct additional dependency of the repos once, as hooks often share them."""
+        dependencies = dict.fromkeys(
+            dependency
+            for pre_commit_repo in pre_commit_repos
+            for hook in pre_commit_repo.hooks
+            for dependency in hook.additional_dependencies
         )
+        return {dependency: self.get_pre_commit_repo_hook_new_dependency(dependency) for dependency in dependencies}
 
     def get_pre_commit_repo_hook_new_dependency(self, dependency: str) -> str:
         if "+" in dependency:
-            self.printer.debug(f"Additional dependency {dependency} is a local version. Ignoring.")
+            self.printer.debug(lambda: f"Additional dependency {dependency} is a local version. Ignoring.")
             return dependency
         try:
-            requirement = Requirement(dependency)
+            requirement = parse_requirement(dependency)
         except InvalidRequirement:
-            self.printer.debug(f"Invalid additional dependency {dependency}. Ignoring.")
+            self.printer.debug(lambda: f"Invalid additional dependency {dependency}. Ignoring.")
+            return dependency
+        if requirement.marker and not evaluate_marker(requirement.marker, self.python_version):
+            self.printer.debug(
+                lambda: f"Additional dependency {dependency} does not apply to this environment. Ignoring."
+            )
+            return dependency
+        if not (locked_version := self.locked_packages.get(requirement.canonical_name)):
+            self.printer.debug(lambda: f"Additional dependency {dependency} not found in the lockfile. Ignoring.")
             return dependency
-        normalized_name = canonicalize_name(requirement.name)
-        if not (locked_version := self.locked_packages.get(normalized_name)):
-            self.printer.debug(f"Additional dependency {dependency} not found in the lockfile. Ignoring.")
+        pinned = pin_requirement(dependency, locked_version.version)
+        if pinned == dependency:
+            return pinned
+        if not self.accept_downgrade(
+            requirement.name, specifier_floor(requirement.specifier), parse_version(locked_version.version)
+        ):
             return dependency
-        requirement.specifier = SpecifierSet(f"=={locked_version.version}")
-        return str(requirement)
+        if self.dependency_update_policy == "pin":
+            return pinned
+        if specifier_contains(requirement.specifier, locked_version.version):
+            self.printer.debug(
+                lambda: (
+                    f"Additional dependency {dependency} already admits the locked version {locked_version.version}."
+                )
+            )
+            self.kept_dependencies.add(dependency)
+            return dependency
+        if self.dependency_update_policy == "floor":
+            return pin_requirement(dependency, locked_version.version, ">=")
+        return pinned
+
+    def get_repo_package(self, pre_commit_repo: PreCommitRepo) -> str:
+        """The package of a mapped repo."""
+        if (package := self.find_repo_package(pre_commit_repo)) is None:
+            raise KeyError(pre_commit_repo.repo)
+        return package
+
+    def find_repo_package(self, pre_commit_repo: PreCommitRepo) -> str | None:
+        """The package of a repo: by URL, else by URL pattern, else by the ids of its hooks. None if not mapped."""
+        try:
+            return self.repo_packages[pre_commit_repo]
+        except KeyError:
+            pass
+        package = self.mapping_reverse_by_url.get(pre_commit_repo.repo)
+        if package is None:
+            package = self.mapping_index.package(
+                pre_commit_repo.repo, pre_commit_repo.rev, (hook.id for hook in pre_commit_repo.hooks)
+            )
+            if package is not None:
+                self.printer.debug(
+                    lambda: f"Pre-commit hook {pre_commit_repo.repo} mapped to `{package}` by URL pattern or hook id."
+                )
+        self.repo_packages[pre_commit_repo] = package
+        return package
 
     def analyze_repos(
         self,
@@ -169,19 +417,62 @@ class SyncPreCommitHooksVersion:
     ) -> tuple[dict[PreCommitRepo, PreCommitRepo], dict[PreCommitRepo, PreCommitRepo]]:
         to_fix: dict[PreCommitRepo, PreCommitRepo] = {}
         in_sync: dict[PreCommitRepo, PreCommitRepo] = {}
+        start = time.perf_counter()
+        to_analyze: list[PreCommitRepo] = []
         for pre_commit_repo in pre_commit_repos:
-            if pre_commit_repo.repo not in self.mapping_reverse_by_url:
-                self.printer.debug(f"Pre-commit hook {pre_commit_repo.repo} not found in the DB mapping")
+            # Lazy messages are built during the call, if at all: the late binding of the loop variable is fine
+            if self.find_repo_package(pre_commit_repo) is None:
+                self.printer.debug(lambda: f"Pre-commit hook {pre_commit_repo.repo} not found in the DB mapping")  # noqa: B023
                 continue
 
+            if self.state is not None:
+                key = repo_digest(pre_commit_repo)
+                previous = self.previous_repos.get(key)
+                if previous is not None and self.get_locked_versions(previous) == previous:
+                    self.printer.debug(
+                        lambda: (
+                            f"Pre-commit hook {pre_commit_repo.repo} and its locked packages did not change since the last sync."  # noqa: B023
+                        )
+                    )
+                    in_sync[pre_commit_repo] = pre_commit_repo
+                    self.synced_repos[key] = previous
+                    continue
+            to_analyze.append(pre_commit_repo)
+
+        selected = time.perf_counter()
+        new_dependencies = self.resolve_additional_dependencies(to_analyze)
+        resolved = time.perf_counter()
+
+        for pre_commit_repo in to_analyze:
+            downgrade_notices = self.downgrade_notices
             new_repo = PreCommitRepo(
                 repo=self.get_pre_commit_repo_new_url(pre_commit_repo.repo),
                 rev=self.get_pre_commit_repo_new_version(pre_commit_repo) or pre_commit_repo.rev,
-                hooks=self.get_pre_commit_repo_new_hooks(pre_commit_repo.hooks),
+                hooks=self.get_pre_commit_repo_new_hooks(pre_commit_repo.hooks, new_dependencies),
             )
+            if self.kept_dependencies and new_repo.rev == pre_commit_repo.rev:
+                self.avoided_rebuilds += sum(
+                    new_hook == hook and not self.kept_dependencies.isdisjoint(hook.additional_dependencies)
+                    for hook, new_hook in zip(pre_commit_repo.hooks, new_repo.hooks)
+                )
             if new_repo != pre_commit_repo:
                 to_fix[pre_commit_repo] = new_repo
-            else:
-                in_sync[pre_commit_repo] = pre_commit_repo
+                continue
+            in_sync[pre_commit_repo] = pre_commit_repo
+            # Keyed like the lookup above. A repo kept by the downgrade policy is evaluated again, to report it again
+            if self.state is not None and self.downgrade_notices == downgrade_notices:
+                self.synced_repos[repo_digest(pre_commit_repo)] = self.get_locked_versions(
+                    self.get_pre_commit_repo_dependency_names(pre_commit_repo)
+                )
 
+        done = time.perf_counter()
+        self.printer.debug(
+            lambda: (
+                f"Analyzed {len(to_analyze)} of {len(pre_commit_repos)} pre-commit repos in "
+                f"{(done - start) * 1000:.2f} ms:\n"
+                f" - Selecting repos: {(selected - start) * 1000:.2f} ms\n"
+                f" - Resolving {len(new_dependencies)} distinct additional dependencies: {(resolved - selected) * 1000:.2f} ms\n"
+                f" - Updating revs and hooks: {(done - resolved) * 1000:.2f} ms"
+            )
+        )
         return to_fix, in_sync
@@ -3,7 +3,7 @@ from __future__ import annotations
 import os
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, Callable, TypedDict
+from typing import TYPE_CHECKING, Any, Callable, Literal, TypedDict, get_args
 
 from ._compat import toml
 
@@ -12,6 +12,24 @@ if TYPE_CHECKING:
 
 ENV_PREFIX = "SYNC_PRE_COMMIT_LOCK"
 
+DependencyUpdatePolicy = Literal["pin", "keep-if-satisfied", "floor"]
+"""How to update an additional dependency to its locked version:
+
+- `pin`: always replace its version specifier by `==<locked>`
+- `keep-if-satisfied`: keep it if its specifier already admits the locked version, else pin it
+- `floor`: keep it if its specifier already admits the locked version, else replace it by `>=<locked>`
+"""
+DEPENDENCY_UPDATE_POLICIES: tuple[DependencyUpdatePolicy, ...] = get_args(DependencyUpdatePolicy)
+
+DowngradePolicy = Literal["allow", "warn", "refuse"]
+"""What to do when the lockfile has an older version than a hook `rev` or additional dependency:
+
+- `allow`: downgrade it
+- `warn`: downgrade it, with a warning
+- `refuse`: keep it, with a warning
+"""
+DOWNGRADE_POLICIES: tuple[DowngradePolicy, ...] = get_args(DowngradePolicy)
+
 
 def env_as_bool(value: str) -> bool:
     return (value or "False").lower() in ("true", "1")
@@ -21,6 +39,16 @@ def env_as_list(value: str) -> list[str]:
     return [v.strip() for v in (value or "").split(",")]
 
 
+def env_as_aliases(value: str) -> dict[str, list[str]]:
+    """Parse comma-separated `<canonical URL>=<alias URL>` pairs."""
+    aliases: dict[str, list[str]] = {}
+    for pair in env_as_list(value):
+        canonical, _, alias = pair.partition("=")
+        if canonical.strip() and alias.strip():
+            aliases.setdefault(canonical.strip(), []).append(alias.strip())
+    return aliases
+
+
 def from_toml(data: dict[str, Any]) -> SyncPreCommitLockConfig:
     if len(data) == 0:
         return SyncPreCommitLockConfig()
@@ -70,10 +98,30 @@ class SyncPreCommitLockConfig:
         default=".pre-commit-config.yaml",
         metadata=Metadata(toml="pre-commit-config-file", env="PRE_COMMIT_FILE"),
     )
+    fsync: bool = field(
+        default=False,
+        metadata=Metadata(toml="fsync", env="FSYNC", cast=env_as_bool),
+    )
+    dependency_groups: list[str] = field(
+        default_factory=list,
+        metadata=Metadata(toml="dependency-groups", env="DEPENDENCY_GROUPS", cast=env_as_list),
+    )
+    dependency_update_policy: DependencyUpdatePolicy = field(
+        default="pin",
+        metadata=Metadata(toml="dependency-update-policy", env="DEPENDENCY_UPDATE_POLICY"),
+    )
+    downgrade_policy: DowngradePolicy = field(
+        default="allow",
+        metadata=Metadata(toml="downgrade-policy", env="DOWNGRADE_POLICY"),
+    )
     dependency_mapping: PackageRepoMapping = field(
         default_factory=dict,
         metadata=Metadata(toml="dependency-mapping"),
     )
+    repository_aliases: dict[str, list[str]] = field(
+        default_factory=dict,
+        metadata=Metadata(toml="repository-aliases", env="REPOSITORY_ALIASES", cast=env_as_aliases),
+    )
 
 
 def load_config(path: Path | None = None) -> SyncPreCommitLockConfig:
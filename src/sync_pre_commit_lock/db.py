@@ -104,3 +104,47 @@ REPOSITORY_ALIASES: dict[str, tuple[str, ...]] = {
     "https://github.com/psf/black-pre-commit-mirror": ("https://github.com/psf/black",),
     "https://github.com/hhatto/autopep8": ("https://github.com/pre-commit/mirrors-autopep8",),
 }
+
+# The package of well-known hook ids, to map the repos whose URL is unknown (forks, mirrors...)
+HOOK_ID_MAPPING: dict[str, str] = {
+    "autopep8": "autopep8",
+    "bandit": "bandit",
+    "black": "black",
+    "black-jupyter": "black",
+    "check-dependabot": "check-jsonschema",
+    "check-github-actions": "check-jsonschema",
+    "check-github-workflows": "check-jsonschema",
+    "check-jsonschema": "check-jsonschema",
+    "check-metaschema": "check-jsonschema",
+    "check-readthedocs": "check-jsonschema",
+    "check-renovate": "check-jsonschema",
+    "codespell": "codespell",
+    "commitizen": "commitizen",
+    "commitizen-branch": "commitizen",
+    "djade": "djade",
+    "djcss": "djhtml",
+    "djhtml": "djhtml",
+    "djjs": "djhtml",
+    "docformatter": "docformatter",
+    "flake8": "flake8",
+    "flakeheaven": "flakeheaven",
+    "isort": "isort",
+    "mypy": "mypy",
+    "pdm-export": "pdm",
+    "pdm-lock-check": "pdm",
+    "pdm-sync": "pdm",
+    "poetry-check": "poetry",
+    "poetry-export": "poetry",
+    "poetry-install": "poetry",
+    "poetry-lock": "poetry",
+    "pycln": "pycln",
+    "pyroma": "pyroma",
+    "pyupgrade": "pyupgrade",
+    "ruff": "ruff",
+    "ruff-check": "ruff",
+    "ruff-format": "ruff",
+    "sync-pre-commit-pdm": "sync-pre-commit-lock",
+    "sync-pre-commit-poetry": "sync-pre-commit-lock",
+    "sync-pre-commit-uv": "sync-pre-commit-lock",
+    "yamllint": "yamllint",
+}
@@ -0,0 +1,101 @@
+"""
+Edit plans: the replacements of scalar spans in a file, computed before touching it.
+
+As every edit replaces a span within a single line, the changed lines are known without diffing the whole file,
+and a unified diff can be produced directly from them.
+"""
+
+from __future__ import annotations
+
+from functools import cached_property
+from typing import TYPE_CHECKING, NamedTuple
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Sequence
+
+    from sync_pre_commit_lock.scanner import Span
+
+
+class Edit(NamedTuple):
+    span: Span
+    value: str
+
+
+def split_lines(text: str) -> list[str]:
+    """Split the text on `\\n` only (as numbered by the spans), keeping the line endings."""
+    lines = [f"{line}\n" for line in text.split("\n")]
+    lines[-1] = lines[-1][:-1]
+    if not lines[-1]:
+        lines.pop()
+    return lines
+
+
+def _format_range(start: int, stop: int) -> str:
+    """Format a hunk range like `difflib.unified_diff`."""
+    length = stop - start
+    if length == 1:
+        return str(start + 1)
+    return f"{start + 1 if length else start},{length}"
+
+
+class EditPlan:
+    """Replacements of spans in the lines of a file."""
+
+    def __init__(self, lines: Sequence[str], edits: Iterable[Edit]) -> None:
+        self.lines = lines
+        self.edits = sorted(edits)
+
+    @cached_property
+    def changed_lines(self) -> dict[int, str]:
+        """The new contents of each changed line, by line index."""
+        changed: dict[int, str] = {}
+        # Right to left, so the columns of the remaining edits on a line are still valid
+        for span, value in reversed(self.edits):
+            line = changed.get(span.line, self.lines[span.line])
+            changed[span.line] = line[: span.column] + value + line[span.column + span.length :]
+        return {idx: line for idx, line in changed.items() if line != self.lines[idx]}
+
+    @property
+    def change_count(self) -> int:
+        """The number of changed lines."""
+        return len(self.changed_lines)
+
+    def apply(self) -> list[str]:
+        """Return the updated lines."""
+        lines = list(self.lines)
+        for idx, line in self.changed_lines.items():
+            lines[idx] = line
+        return lines
+
+    def unified_diff(self, fromfile: str = "", tofile: str = "", n: int = 3) -> Iterator[str]:
+        """Yield the lines of a unified diff of the plan, like `difflib.unified_diff` with `n` lines of context."""
+        changed = self.changed_lines
+        if not changed:
+            return
+        yield f"--- {fromfile}\n"
+        yield f"+++ {tofile}\n"
+
+        # Hunks are merged if at most 2n unchanged lines separate them
+        groups: list[list[int]] = []
+        for idx in sorted(changed):
+            if groups and idx - groups[-1][-1] <= 2 * n + 1:
+                groups[-1].append(idx)
+            else:
+                groups.append([idx])
+
+        for group in groups:
+            start, stop = max(group[0] - n, 0), min(group[-1] + n + 1, len(self.lines))
+            hunk_range = _format_range(start, stop)
+            yield f"@@ -{hunk_range} +{hunk_range} @@\n"
+            idx = start
+            while idx < stop:
+                if idx not in changed:
+                    yield f" {self.lines[idx]}"
+                    idx += 1
+                    continue
+                block_end = idx
+                while block_end in changed:
+                    block_end += 1
+                yield from (f"-{self.lines[line]}" for line in range(idx, block_end))
+                yield from (f"+{changed[line]}" for line in range(idx, block_end))
+                idx = block_end
@@ -0,0 +1,213 @@
+"""
+Packages reachable from dependency groups, to only sync hooks with e.g. the `dev` or `lint` packages of a monorepo.
+
+- uv: a traversal of the dependency graph (`dependencies`, extras, and the `dev-dependencies` of the groups) from the
+  project and workspace members, in linear time
+- PDM: the `groups` of each locked package, written with the `inherit_metadata` strategy (the default), or of each
+  candidate of a resolution
+
+The group `default` is the main dependencies of the project. Lockfiles are read by the streaming reader, which only
+extracts the keys of the dependency graph: the whole TOML document is only parsed for layouts it doesn't support.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import TYPE_CHECKING, Any
+
+from packaging.utils import canonicalize_name
+
+from sync_pre_commit_lock._compat import toml
+from sync_pre_commit_lock.lockfile import scan_lock_tables
+
+if TYPE_CHECKING:
+    import mmap
+    from collections.abc import Callable, Collection, Iterable, Mapping
+    from pathlib import Path
+
+    from sync_pre_commit_lock import Printer
+    from sync_pre_commit_lock.actions.sync_hooks import GenericLockedPackage
+
+DEFAULT_GROUP = "default"
+
+_STRING = re.compile(rb'"([^"\\\r\n]*)"')
+_DEPENDENCY = re.compile(rb'\{ name = "([^"\\\r\n]+)"([^\r\n]*)')
+_EXTRAS = re.compile(rb"extra = \[([^\]]*)\]")
+_ROOT_SOURCE = re.compile(rb'(?:editable|virtual) = "\."')
+
+_UV_TABLES: Mapping[str, Collection[str] | None] = {
+    "manifest": ("members",),
+    "package": ("name", "source", "dependencies"),
+    "package.optional-dependencies": None,
+    "package.dev-dependencies": None,
+}
+
+
+def _strings(value: bytes) -> list[str]:
+    return [string.decode() for string in _STRING.findall(value)]
+
+
+def _dependencies(value: bytes) -> list[dict[str, Any]]:
+    return [
+        {"name": name.decode(), "extra": [extra for extras in _EXTRAS.findall(rest) for extra in _strings(extras)]}
+        for name, rest in _DEPENDENCY.findall(value)
+    ]
+
+
+def _load_toml(path: Path) -> dict[str, Any] | None:
+    try:
+        return toml.loads(path.read_text())
+    except (OSError, UnicodeDecodeError, toml.TOMLDecodeError):
+        return None
+
+
+def _scan_uv_lock(path: Path, is_supported: Callable[[mmap.mmap], object]) -> dict[str, Any] | None:
+    """The parts of `uv.lock` the traversal needs, in the shape of the TOML document. None if not supported."""
+    tables = scan_lock_tables(path, is_supported, _UV_TABLES)
+    if tables is None:
+        return None
+    packages: list[dict[str, Any]] = []
+    lock: dict[str, Any] = {"package": packages}
+    for table, values in tables:
+        if table == "manifest":
+            lock["manifest"] = {"members": _strings(values.get("members", b""))}
+        elif table == "package":
+            if not (name := _strings(values.get("name", b""))):
+                return None
+            packages.append(
+                {
+                    "name": name[0],
+                    "source": {"editable": "."} if _ROOT_SOURCE.search(values.get("source", b"")) else {},
+                    "dependencies": _dependencies(values.get("dependencies", b"")),
+                }
+            )
+        elif packages:
+            packages[-1][table.split(".", 1)[1]] = {key: _dependencies(value) for key, value in values.items()}
+    return lock
+
+
+def uv_reachable_packages(
+    path: Path, groups: Collection[str], is_supported: Callable[[mmap.mmap], object]
+) -> frozenset[str] | None:
+    """The canonical names of the packages of `uv.lock` reachable from dependency groups and extras.
+
+    Returns:
+        None if the lockfile can't be read, or has no project.
+    """
+    try:
+        lock = _scan_uv_lock(path, is_supported)
+    except OSError:
+        return None
+    if lock is None and (lock := _load_toml(path)) is None:
+        return None
+    return _uv_reachable(lock, frozenset(groups))
+
+
+def _uv_reachable(lock: dict[str, Any], groups: frozenset[str]) -> frozenset[str] | None:
+    packages: dict[str, list[dict[str, Any]]] = {}
+    for package in lock.get("package", []):
+        packages.setdefault(canonicalize_name(package["name"]), []).append(package)
+    members = {canonicalize_name(name) for name in lock.get("manifest", {}).get("members", ())}
+    roots = [
+        package
+        for name, versions in packages.items()
+        for package in versions
+        if name in members
+        or "." in (package.get("source", {}).get("editable"), package.get("source", {}).get("virtual"))
+    ]
+    if not roots:
+        return None
+
+    queue: list[dict[str, Any]] = []
+    for root in roots:
+        for group in groups:
+            if group == DEFAULT_GROUP:
+                queue += root.get("dependencies", [])
+            queue += root.get("optional-dependencies", {}).get(group, [])
+            queue += root.get("dev-dependencies", {}).get(group, [])
+
+    # Each package, and each extra of a package, is expanded once
+    reachable: set[str] = set()
+    expanded_extras: set[tuple[str, str]] = set()
+    while queue:
+        dependency = queue.pop()
+        name = canonicalize_name(dependency["name"])
+        if name not in reachable:
+            reachable.add(name)
+            for package in packages.get(name, ()):
+                queue += package.get("dependencies", [])
+        for extra in dependency.get("extra", ()):
+            if (name, extra) not in expanded_extras:
+                expanded_extras.add((name, extra))
+                for package in packages.get(name, ()):
+                    queue += package.get("optional-dependencies", {}).get(extra, [])
+    return frozenset(reachable)
+
+
+def pdm_group_packages(
+    path: Path, groups: Collection[str], is_supported: Callable[[mmap.mmap], object]
+) -> frozenset[str] | None:
+    """The canonical names of the packages of `pdm.lock` in dependency groups.
+
+    Returns:
+        None if the lockfile can't be read, or was not locked with the `groups` of each package.
+    """
+    try:
+        tables = scan_lock_tables(path, is_supported, {"package": ("name", "groups")})
+    except OSError:
+        return None
+    packages: list[tuple[str, Collection[str] | None]] = []
+    if tables is not None:
+        for _, values in tables:
+            if not (name := _strings(values.get("name", b""))):
+                return None
+            packages.append((name[0], _strings(values["groups"]) if "groups" in values else None))
+    elif (lock := _load_toml(path)) is not None:
+        packages = [(package["name"], package.get("groups")) for package in lock.get("package", [])]
+    else:
+        return None
+    return _group_packages(packages, frozenset(groups))
+
+
+def resolution_group_packages(
+    candidates: Iterable[tuple[str, Collection[str]]], groups: Collection[str]
+) -> frozenset[str] | None:
+    """The canonical names of the packages of a PDM resolution in dependency groups, from their name and groups.
+
+    Returns:
+        None if some package was resolved without its groups.
+    """
+    return _group_packages(candidates, frozenset(groups))
+
+
+def _group_packages(
+    packages: Iterable[tuple[str, Collection[str] | None]], groups: frozenset[str]
+) -> frozenset[str] | None:
+    names: set[str] = set()
+    empty = True
+    for name, package_groups in packages:
+        if not package_groups:
+            return None
+        empty = False
+        if groups.intersection(package_groups):
+            names.add(canonicalize_name(name))
+    return None if empty else frozenset(names)
+
+
+def filter_locked_packages(
+    printer: Printer,
+    locked_packages: Mapping[str, GenericLockedPackage],
+    groups: Collection[str],
+    reachable: frozenset[str] | None,
+) -> dict[str, GenericLockedPackage]:
+    """Only keep the locked packages reachable from the dependency groups, or all of them if unknown."""
+    if reachable is None:
+        printer.warning(
+            f"Could not find the packages of the dependency groups {', '.join(groups)} in the lockfile, "
+            "syncing with all the locked packages."
+        )
+        return dict(locked_packages)
+    printer.debug(
+        lambda: f"Syncing with the {len(reachable)} locked packages of the dependency groups {', '.join(groups)}."
+    )
+    return {key: package for key, package in locked_packages.items() if canonicalize_name(package.name) in reachable}
@@ -0,0 +1,137 @@
+"""
+Streaming readers for lockfiles.
+
+uv, PDM and Poetry all write each locked package as a `[[package]]` table starting with its `name` and `version`.
+Instead of parsing the whole TOML document (hashes, files, dependency graph...), scan the memory-mapped file for
+those two keys only, and the `resolution-markers` uv writes right after them when the resolution forks (several
+versions of a package, e.g. one per Python version).
+
+`scan_lock_tables` reads more of the lockfile, for the dependency graph: the raw values of some top-level keys of
+some tables, e.g. the `dependencies` of each `[[package]]`, still without parsing the rest of the document.
+"""
+
+from __future__ import annotations
+
+import mmap
+import re
+from typing import TYPE_CHECKING, NamedTuple
+
+from packaging.utils import canonicalize_name
+
+from sync_pre_commit_lock.actions.sync_hooks import GenericLockedPackage
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Container, Mapping
+    from pathlib import Path
+
+# Only basic strings without escapes are supported, anything else makes the scan bail out.
+# Not anchored with `^`, so the regex engine can jump between occurrences of the literal header.
+_PACKAGE = re.compile(
+    rb'\[\[package\]\]\r?\n(?:name = "([^"\\\r\n]+)"\r?\n(?:version = "([^"\\\r\n]+)"\r?\n'
+    rb"(?:source = [^\r\n]*\r?\n)?"
+    # The markers of a fork, else a `resolution-markers` key in an unsupported layout
+    rb'(?:resolution-markers = \[\r?\n((?: *"[^"\\\r\n]*",\r?\n)*)\]\r?\n|(resolution-markers))?)?)?'
+)
+_MARKER = re.compile(rb'"([^"]*)"')
+_TABLE_HEADER = re.compile(rb"^\[[^\r\n]*", re.MULTILINE)
+_TABLE_NAME = re.compile(rb"\[(\[)?([A-Za-z0-9_.-]+)\](?(1)\])[ \t]*\r?")
+# A key at the start of a line, with a one-line value or an array closed at the start of a line
+_KEY_VALUE = re.compile(rb'^("?)([A-Za-z0-9_.-]+)\1 = (\[[ \t]*\r?\n.*?^\][^\r\n]*|[^\r\n]*)', re.MULTILINE | re.DOTALL)
+
+
+class LockedVersion(NamedTuple):
+    version: str
+    markers: tuple[str, ...] = ()
+    """The `resolution-markers` of the fork this version is locked for, empty if the resolution is not forked"""
+
+
+def scan_locked_packages(
+    path: Path, is_supported: Callable[[mmap.mmap], object], names: Container[str] | None = None
+) -> dict[str, GenericLockedPackage] | None:
+    """Read the name and version of locked packages, keyed by their canonical name.
+
+    The last version is kept if a package is locked several times: see `scan_locked_versions` for all of them.
+    """
+    versions = scan_locked_versions(path, is_supported, names)
+    if versions is None:
+        return None
+    return {name: GenericLockedPackage(name, locked[-1].version) for name, locked in versions.items()}
+
+
+def scan_locked_versions(
+    path: Path, is_supported: Callable[[mmap.mmap], object], names: Container[str] | None = None
+) -> dict[str, list[LockedVersion]] | None:
+    """Read the name, version and resolution markers of locked packages, keyed by their canonical name.
+
+    Args:
+        path: The lockfile path.
+        is_supported: Check the lockfile contents (format version...) can be read by scanning.
+        names: If provided, only keep the packages with these canonical names.
+
+    Returns:
+        The locked packages, or None if the lockfile layout is not supported and should be parsed as TOML.
+        Packages without a static version are skipped.
+    """
+    with path.open("rb") as file:
+        try:
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # Empty file
+            return None
+        with data:
+            if not is_supported(data):
+                return None
+            packages: dict[str, list[LockedVersion]] = {}
+            for match in _PACKAGE.finditer(data):
+                if match.start() and data[match.start() - 1] != ord("\n"):
+                    continue  # Not a table header
+                raw_name, raw_version, raw_markers, unsupported_markers = match.groups()
+                if raw_name is None or unsupported_markers is not None:
+                    return None
+                if raw_version is None:
+                    continue
+                name = canonicalize_name(raw_name.decode())
+                if names is None or name in names:
+                    markers = tuple(marker.decode() for marker in _MARKER.findall(raw_markers or b""))
+                    packages.setdefault(name, []).append(LockedVersion(raw_version.decode(), markers))
+    return packages
+
+
+def scan_lock_tables(
+    path: Path, is_supported: Callable[[mmap.mmap], object], tables: Mapping[str, Container[str] | None]
+) -> list[tuple[str, dict[str, bytes]]] | None:
+    """Read the raw values of the top-level keys of some tables, in the order of the lockfile.
+
+    Args:
+        path: The lockfile path.
+        is_supported: Check the lockfile contents (format version...) can be read by scanning.
+        tables: The keys to read by table name (e.g. `package` or `package.optional-dependencies`), None for all.
+
+    Returns:
+        The name and raw values of each table, or None if the lockfile layout is not supported and should be parsed
+        as TOML.
+    """
+    with path.open("rb") as file:
+        try:
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # Empty file
+            return None
+        with data:
+            if not is_supported(data):
+                return None
+            headers = list(_TABLE_HEADER.finditer(data))
+            scanned: list[tuple[str, dict[str, bytes]]] = []
+            for header, next_header in zip(headers, [*headers[1:], None]):
+                if (name_match := _TABLE_NAME.fullmatch(header.group())) is None:
+                    return None
+                name = name_match[2].decode()
+                if name not in tables:
+                    continue
+                keys = tables[name]
+                end = len(data) if next_header is None else next_header.start()
+                values: dict[str, bytes] = {}
+                for match in _KEY_VALUE.finditer(data, header.end(), end):
+                    key = match[2].decode()
+                    if keys is None or key in keys:
+                        values[key] = match[3]
+                scanned.append((name, values))
+    return scanned
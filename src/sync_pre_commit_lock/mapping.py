@@ -0,0 +1,196 @@
+"""
+Index of the repo mapping: the built-in DB merged with the user `dependency-mapping` and `repository-aliases`, with
+normalized URLs.
+
+The index only depends on the user configuration, so it is built once per process for each distinct configuration and
+shared by every sync (several projects, or several syncs in a long-running process).
+
+A repo is looked up by its exact URL, then by the URL patterns (with `*` and `?` wildcards) of the mapping and aliases,
+then by the ids of its hooks. The patterns are compiled into one regex per literal host at load time, and each URL
+is matched once. A repo matched by pattern or hook ids must also have a rev in the format of the package, so an
+unrelated repo (e.g. an internal repo of hooks, or a mirror with other tags) is not rewritten to a tag that doesn't exist.
+"""
+
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from types import MappingProxyType
+from typing import TYPE_CHECKING, NamedTuple
+
+from sync_pre_commit_lock.db import DEPENDENCY_MAPPING, HOOK_ID_MAPPING, REPOSITORY_ALIASES, RepoInfo
+from sync_pre_commit_lock.rev_template import compile_rev_template
+from sync_pre_commit_lock.utils import normalize_git_url
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping, Sequence
+
+
+def is_url_pattern(url: str) -> bool:
+    return "*" in url or "?" in url
+
+
+def _url_host(url: str) -> str | None:
+    if "://" not in url:
+        return None
+    return url.split("://", 1)[1].split("/", 1)[0]
+
+
+def normalize_url_pattern(pattern: str) -> str:
+    """Normalize the literal parts of a URL pattern like `normalize_git_url` normalizes URLs.
+
+    The scheme becomes https, the user and port are removed, the host is lowercased, and the `.git` suffix and trailing
+    slash are removed. Not parsed with `urlparse`, which would read the `?` wildcard as a query.
+    """
+    if "://" not in pattern:
+        return pattern
+    scheme, rest = pattern.split("://", 1)
+    netloc, slash, path = rest.partition("/")
+    host = netloc.rsplit("@", 1)[-1].split(":", 1)[0].lower()
+    if not host:
+        return pattern
+    scheme = scheme.lower()
+    if scheme in ("git", "git+ssh", "ssh"):
+        scheme = "https"
+    normalized = f"{scheme}://{host}{slash}{path.removesuffix('.git')}"
+    return normalized.removesuffix("/")
+
+
+def _translate(pattern: str) -> str:
+    """Translate a URL pattern to a regex: `*` matches any characters, `?` a single one."""
+    return "".join(".*" if char == "*" else "." if char == "?" else re.escape(char) for char in pattern)
+
+
+class UrlPatterns:
+    """Repo URL patterns, each mapped to a package. The first pattern matching a URL wins.
+
+    The patterns are compiled into a regex per literal host, and one for the patterns with a wildcard host: a lookup
+    only tries the patterns of its host, in a single regex match, and is memoized.
+    """
+
+    __slots__ = ("_any_host", "_by_host", "_matches", "_packages")
+
+    def __init__(self, patterns: Sequence[tuple[str, str]]) -> None:
+        patterns = [(normalize_url_pattern(pattern), package) for pattern, package in patterns]
+        self._packages = tuple(package for _, package in patterns)
+        buckets: dict[str | None, list[tuple[int, str]]] = {}
+        for index, (pattern, _) in enumerate(patterns):
+            host = _url_host(pattern)
+            buckets.setdefault(None if host is None or is_url_pattern(host) else host, []).append((index, pattern))
+        compiled = {
+            host: (re.compile("|".join(f"({_translate(pattern)})" for _, pattern in bucket)), [i for i, _ in bucket])
+            for host, bucket in buckets.items()
+        }
+        self._any_host = compiled.pop(None, None)
+        self._by_host = compiled
+        self._matches: dict[str, str | None] = {}
+
+    def __len__(self) -> int:
+        return len(self._packages)
+
+    def match(self, url: str) -> str | None:
+        """The package of the first pattern matching a normalized URL, None if none does."""
+        try:
+            return self._matches[url]
+        except KeyError:
+            pass
+        indices = []
+        for bucket in (self._by_host.get(_url_host(url) or ""), self._any_host):
+            if bucket is not None and (match := bucket[0].fullmatch(url)) and match.lastindex:
+                indices.append(bucket[1][match.lastindex - 1])
+        package = self._packages[min(indices)] if indices else None
+        self._matches[url] = package
+        return package
+
+
+class MappingIndex(NamedTuple):
+    packages: Mapping[str, RepoInfo]
+    """The repo URL and rev template of each package"""
+    package_by_url: Mapping[str, str]
+    """The package of each normalized repo URL, including aliases"""
+    canonical_urls: Mapping[str, str]
+    """The normalized canonical URL of each normalized alias URL"""
+    url_patterns: UrlPatterns
+    """The package of the repo URL patterns, including aliases"""
+    package_by_hook_id: Mapping[str, str]
+    """The package of well-known hook ids"""
+
+    def package(self, url: str, rev: str | None = None, hook_ids: Iterable[str] = ()) -> str | None:
+        """The package of a normalized repo URL, else of its URL pattern, else of the ids of its hooks.
+
+        The ids of the hooks must all be known and point to the same package. A match by pattern or hook ids also
+        requires the rev to be in the format of the package (e.g. `v1.2.3` for `v${rev}`).
+        """
+        if (package := self.package_by_url.get(url)) is not None:
+            return package
+        if rev is None:
+            return None
+        if (package := self.url_patterns.match(url)) is not None and self.matches_rev(package, rev):
+            return package
+        packages = {self.package_by_hook_id.get(hook_id) for hook_id in hook_ids}
+        if len(packages) == 1 and (package := packages.pop()) is not None and self.matches_rev(package, rev):
+            return package
+        return None
+
+    def matches_rev(self, package: str, rev: str) -> bool:
+        """Whether a rev is in the format of the rev template of a package."""
+        try:
+            return compile_rev_template(self.packages[package]["rev"]).parse(rev) is not None
+        except ValueError:
+            return False
+
+
+_MappingKey = tuple[tuple[str, str, str], ...]
+_AliasesKey = tuple[tuple[str, tuple[str, ...]], ...]
+
+
+def mapping_index(
+    dependency_mapping: Mapping[str, RepoInfo], repository_aliases: Mapping[str, Sequence[str]] | None = None
+) -> MappingIndex:
+    """The index of the built-in DB merged with a user mapping and aliases, memoized per user configuration."""
+    return _build_mapping_index(
+        tuple((name, repo["repo"], repo["rev"]) for name, repo in dependency_mapping.items()),
+        tuple((canonical, tuple(aliases)) for canonical, aliases in (repository_aliases or {}).items()),
+    )
+
+
+@lru_cache(maxsize=32)
+def _build_mapping_index(dependency_mapping: _MappingKey, repository_aliases: _AliasesKey = ()) -> MappingIndex:
+    packages: dict[str, RepoInfo] = {**DEPENDENCY_MAPPING}
+    packages.update({name: RepoInfo(repo=url, rev=rev) for name, url, rev in dependency_mapping})
+
+    package_by_url: dict[str, str] = {}
+    user_patterns = [(url, name) for name, url, _ in dependency_mapping if is_url_pattern(url)]
+    builtin_patterns = [
+        (repo["repo"], name)
+        for name, repo in DEPENDENCY_MAPPING.items()
+        if is_url_pattern(repo["repo"]) and packages[name] is repo
+    ]
+    for name, repo in packages.items():
+        if not is_url_pattern(repo["repo"]):
+            package_by_url[normalize_git_url(repo["repo"])] = name
+    canonical_urls: dict[str, str] = {}
+    # The user aliases come last, so they override the built-in ones
+    for patterns, all_aliases in ((builtin_patterns, REPOSITORY_ALIASES.items()), (user_patterns, repository_aliases)):
+        for canonical_url, aliases in all_aliases:
+            canonical_url = normalize_git_url(canonical_url)
+            if canonical_url not in package_by_url:
+                continue
+            for alias in aliases:
+                if is_url_pattern(alias):
+                    patterns.append((alias, package_by_url[canonical_url]))
+                    continue
+                alias = normalize_git_url(alias)
+                canonical_urls[alias] = canonical_url
+                package_by_url[alias] = package_by_url[canonical_url]
+
+    return MappingIndex(
+        packages=MappingProxyType(packages),
+        package_by_url=MappingProxyType(package_by_url),
+        canonical_urls=MappingProxyType(canonical_urls),
+        # The user patterns come first, so they take precedence over the built-in ones
+        url_patterns=UrlPatterns(user_patterns + builtin_patterns),
+        package_by_hook_id=MappingProxyType(
+            {hook_id: name for hook_id, name in HOOK_ID_MAPPING.items() if name in packages}
+        ),
+    )
@@ -1,28 +1,36 @@
 from __future__ import annotations
 
+import os
+import re
 from collections.abc import Iterable
+from pathlib import Path
 from typing import TYPE_CHECKING, Any, ClassVar, Union
 
-from packaging.requirements import Requirement
 from pdm import termui
 from pdm.__version__ import __version__ as pdm_version
 from pdm.cli.commands.base import BaseCommand
 from pdm.cli.options import dry_run_option
 from pdm.signals import post_install, post_lock
 from pdm.termui import Verbosity
+from rich.markup import escape
 
 from sync_pre_commit_lock import (
     Printer,
+    render,
 )
 from sync_pre_commit_lock.actions.install_hooks import SetupPreCommitHooks
 from sync_pre_commit_lock.actions.sync_hooks import GenericLockedPackage, SyncPreCommitHooksVersion
 from sync_pre_commit_lock.config import SyncPreCommitLockConfig, load_config
+from sync_pre_commit_lock.groups import filter_locked_packages, pdm_group_packages, resolution_group_packages
+from sync_pre_commit_lock.lockfile import scan_locked_packages
+from sync_pre_commit_lock.requirements import parse_requirement
+from sync_pre_commit_lock.state import SyncState
 from sync_pre_commit_lock.utils import url_diff
 
 if TYPE_CHECKING:
     import argparse
-    from collections.abc import Sequence
-    from pathlib import Path
+    import mmap
+    from collections.abc import Mapping, Sequence
 
     from pdm.core import Core
     from pdm.models.candidates import Candidate
@@ -30,7 +38,9 @@ if TYPE_CHECKING:
     from pdm.project import Project
     from pdm.termui import UI
 
+    from sync_pre_commit_lock import Level, Message
     from sync_pre_commit_lock.pre_commit_config import PreCommitHook, PreCommitRepo
+    from sync_pre_commit_lock.pre_commit_store import EnvironmentEstimate
 
 
 class PDMPrinter(Printer):
@@ -44,37 +54,58 @@ class PDMPrinter(Printer):
         lines = msg.split("\n")
         return "\n".join(f"{self.plugin_prefix}{line}" for line in lines)
 
-    def debug(self, msg: str) -> None:
-        self.ui.echo(self.prefix_lines("[debug]" + msg + "[/debug]"), verbosity=Verbosity.DEBUG)
+    def is_enabled(self, level: Level) -> bool:
+        return self.ui.verbosity >= (Verbosity.DEBUG if level == "debug" else Verbosity.NORMAL)
 
-    def info(self, msg: str) -> None:
-        self.ui.echo("[info]" + self.prefix_lines(msg) + "[/info]", verbosity=Verbosity.NORMAL)
+    def debug(self, msg: Message) -> None:
+        if self.is_enabled("debug"):
+            self.ui.echo(self.prefix_lines("[debug]" + render(msg) + "[/debug]"), verbosity=Verbosity.DEBUG)
 
-    def warning(self, msg: str) -> None:
-        self.ui.echo("[warning]" + self.prefix_lines(msg) + "[/warning]", verbosity=Verbosity.NORMAL)
+    def info(self, msg: Message) -> None:
+        self.ui.echo("[info]" + self.prefix_lines(render(msg)) + "[/info]", verbosity=Verbosity.NORMAL)
 
-    def error(self, msg: str) -> None:
-        self.ui.echo("[error]" + self.prefix_lines(msg) + "[/error]", verbosity=Verbosity.NORMAL)
+    def warning(self, msg: Message) -> None:
+        self.ui.echo("[warning]" + self.prefix_lines(render(msg)) + "[/warning]", verbosity=Verbosity.NORMAL)
 
-    def success(self, msg: str) -> None:
-        self.ui.echo("[success]" + self.prefix_lines(msg) + "[/success]", verbosity=Verbosity.NORMAL)
+    def error(self, msg: Message) -> None:
+        self.ui.echo("[error]" + self.prefix_lines(render(msg)) + "[/error]", verbosity=Verbosity.NORMAL)
+
+    def success(self, msg: Message) -> None:
+        self.ui.echo("[success]" + self.prefix_lines(render(msg)) + "[/success]", verbosity=Verbosity.NORMAL)
+
+    def print_diff(self, diff: Sequence[str]) -> None:
+        styles = {"---": "bold", "+++": "bold", "@@": "cyan", "-": "red", "+": "green"}
+        for line in diff:
+            text = escape(line.rstrip("\n"))
+            style = next((style for prefix, style in styles.items() if line.startswith(prefix)), None)
+            self.ui.echo(f"[{style}]{text}[/{style}]" if style else text, verbosity=Verbosity.NORMAL)
 
     def _format_repo_url(self, old_repo_url: str, new_repo_url: str, package_name: str) -> str:
         url = url_diff(old_repo_url, new_repo_url, "[cyan]{[/][red]", "[/red][cyan] -> [/][green]", "[/][cyan]}[/]")
         return url.replace(package_name, f"[cyan][bold]{package_name}[/bold][/cyan]")
 
-    def list_updated_packages(self, packages: dict[str, tuple[PreCommitRepo, PreCommitRepo]]) -> None:
+    def list_updated_packages(
+        self,
+        packages: dict[str, tuple[PreCommitRepo, PreCommitRepo]],
+        environments: Mapping[str, EnvironmentEstimate] | None = None,
+    ) -> None:
         """
         Args:
             packages: Dict of package name -> (repo, new_rev)
         """
         self.ui.display_columns(
-            [row for package, (old, new) in packages.items() for row in self._format_repo(package, old, new)]
+            [
+                row
+                for package, (old, new) in packages.items()
+                for row in self._format_repo(package, old, new, (environments or {}).get(package))
+            ]
         )
 
-    def _format_repo(self, package: str, old: PreCommitRepo, new: PreCommitRepo) -> Sequence[Sequence[str]]:
+    def _format_repo(
+        self, package: str, old: PreCommitRepo, new: PreCommitRepo, estimate: EnvironmentEstimate | None = None
+    ) -> Sequence[Sequence[str]]:
         new_version = new.rev != old.rev
-        repo = (
+        repo: tuple[str, ...] = (
             f"[info]{self.plugin_prefix}[/info] {self.success_list_token}",
             f"[info]{self._format_repo_url(old.repo, new.repo, package)}[/info]",
             " ",
@@ -82,6 +113,8 @@ class PDMPrinter(Printer):
             "[info]->[/info]" if new_version else "",
             f"[green]{new.rev}[/green]" if new_version else "",
         )
+        if estimate and estimate.hooks:
+            repo = (*repo, f"[warning]{estimate.describe()}[/warning]")
         nb_hooks = len(old.hooks)
         hooks = [
             row
@@ -112,15 +145,15 @@ class PDMPrinter(Printer):
         return (hook, *dependencies)
 
     def _format_additional_dependency(self, old: str, new: str, prefix: str, last: bool) -> Sequence[str]:
-        old_req = Requirement(old)
-        new_req = Requirement(new)
+        old_req = parse_requirement(old)
+        new_req = parse_requirement(new)
         return (
             f"[info]{self.plugin_prefix}[/info]",
             f"{prefix} {'└' if last else '├'} [cyan][bold]{old_req.name}[/bold][/cyan]",
             " ",
-            f"[error]{str(old_req.specifier).lstrip('==') or '*'}[/error]",
+            f"[error]{old_req.specifier.lstrip('==') or '*'}[/error]",
             "[info]->[/info]",
-            f"[green]{str(new_req.specifier).lstrip('==')}[/green]",
+            f"[green]{new_req.specifier.lstrip('==')}[/green]",
         )
 
 
@@ -171,28 +204,96 @@ def select_candidate(candidate: Union[Candidate, list[Candidate]]) -> Candidate
     return candidate
 
 
+PDM_LOCK_HEADER = re.compile(rb'^lock_version = "4\.', re.MULTILINE)
+"""The lock format version supported by the direct reader"""
+
+
+def _is_single_target_pdm_lock(data: mmap.mmap) -> bool:
+    # The metadata comes before the packages. With several targets, a package may be locked in several versions.
+    metadata_end = data.find(b"[[package]]")
+    metadata = data[:metadata_end] if metadata_end >= 0 else data[:]
+    return bool(PDM_LOCK_HEADER.search(metadata)) and metadata.count(b"[[metadata.targets]]") <= 1
+
+
+def load_pdm_lock(path: Path) -> dict[str, GenericLockedPackage] | None:
+    """Read the locked packages from `pdm.lock` without PDM's repository machinery.
+
+    Returns:
+        The locked packages, or None if the lockfile is missing, has an unknown format or uses multiple targets.
+    """
+    try:
+        return scan_locked_packages(path, _is_single_target_pdm_lock)
+    except OSError:
+        return None
+
+
+def get_lockfile_path(project: Project) -> Path | None:
+    """Find `pdm.lock` without loading it through `project.lockfile`, which parses the whole file."""
+    if env_lockfile := os.getenv("PDM_LOCKFILE"):
+        return Path(env_lockfile)
+    if project.config.get("lock.format") == "pylock":
+        return None
+    return project.root / "pdm.lock"
+
+
+def resolution_to_locked_packages(resolution: Resolution) -> dict[str, GenericLockedPackage]:
+    return {
+        k: GenericLockedPackage(c.name, c.version)
+        for k, v in resolution.items()
+        if (c := select_candidate(v)) and c.name and c.version
+    }
+
+
 @post_lock.connect
 def on_pdm_lock_check_pre_commit(
     project: Project, *, resolution: Resolution, dry_run: bool, with_prefix: bool = True, **_: Any
 ) -> None:
+    sync_pre_commit_versions(
+        project, resolution_to_locked_packages(resolution), dry_run, with_prefix, resolution=resolution
+    )
+
+
+def sync_pre_commit_versions(
+    project: Project,
+    locked_packages: dict[str, GenericLockedPackage],
+    dry_run: bool,
+    with_prefix: bool = True,
+    full: bool = False,
+    diff: bool = False,
+    resolution: Resolution | None = None,
+) -> None:
+    """Sync the pre-commit config with the locked packages.
+
+    Args:
+        resolution: The resolution the packages were locked from, if not read from `pdm.lock`. The lockfile on disk
+            may not have been written yet (e.g. `pdm lock --dry-run`), so the dependency groups are taken from it.
+    """
     project_root: Path = project.root
     plugin_config: SyncPreCommitLockConfig = load_config(project_root / project.PYPROJECT_FILENAME)
     printer = PDMPrinter(project.core.ui, with_prefix=with_prefix)
 
     file_path = project_root / plugin_config.pre_commit_config_file
-    resolved_packages: dict[str, GenericLockedPackage] = {
-        k: GenericLockedPackage(c.name, c.version)
-        for k, v in resolution.items()
-        if (c := select_candidate(v)) and c.name and c.version
-    }
+    if groups := plugin_config.dependency_groups:
+        if resolution is not None:
+            reachable = resolution_group_packages(
+                ((c.name, c.req.groups) for v in resolution.values() if (c := select_candidate(v)) and c.name), groups
+            )
+        elif lockfile_path := get_lockfile_path(project):
+            reachable = pdm_group_packages(lockfile_path, groups, _is_single_target_pdm_lock)
+        else:
+            reachable = None
+        locked_packages = filter_locked_packages(printer, locked_packages, groups, reachable)
     # Adds pdm itself has it won't be part of the resolved dependencies
-    resolved_packages["pdm"] = GenericLockedPackage("pdm", pdm_version)
+    resolved_packages = {**locked_packages, "pdm": GenericLockedPackage("pdm", pdm_version)}
     action = SyncPreCommitHooksVersion(
         printer=printer,
         pre_commit_config_file_path=file_path,
         locked_packages=resolved_packages,
         plugin_config=plugin_config,
         dry_run=dry_run,
+        state=SyncState.load(file_path),
+        full=full,
+        diff=diff,
     )
     action.execute()
 
@@ -204,11 +305,28 @@ class SyncPreCommitVersionsPDMCommand(BaseCommand):
 
     def add_arguments(self, parser: argparse.ArgumentParser) -> None:
         dry_run_option.add_to_parser(parser)
+        parser.add_argument(
+            "--full", action="store_true", help="Check every hook, even if nothing changed since the last sync"
+        )
+        parser.add_argument(
+            "--diff", action="store_true", help="Show the changes to the pre-commit config file as a unified diff"
+        )
 
     def handle(self, project: Project, options: argparse.Namespace) -> None:
-        candidates = self._get_locked_repository(project).all_candidates
-
-        on_pdm_lock_check_pre_commit(project, resolution=candidates, dry_run=options.dry_run, with_prefix=False)
+        lockfile_path = get_lockfile_path(project)
+        locked_packages = load_pdm_lock(lockfile_path) if lockfile_path else None
+        if locked_packages is None:
+            candidates = self._get_locked_repository(project).all_candidates
+            locked_packages = resolution_to_locked_packages(candidates)
+
+        sync_pre_commit_versions(
+            project,
+            locked_packages,
+            dry_run=options.dry_run,
+            with_prefix=False,
+            full=options.full,
+            diff=options.diff,
+        )
 
     def _get_locked_repository(self, project: Project) -> LockedRepository:
         # `locked_repository` was deprecated in PDM 2.17 favour of `get_locked_repository`, try to use it first to avoid warning
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import re
 from pathlib import Path
 from typing import TYPE_CHECKING, ClassVar
 
@@ -7,10 +8,10 @@ from cleo.commands.command import Command
 from cleo.events.console_events import TERMINATE
 from cleo.events.console_terminate_event import ConsoleTerminateEvent
 from cleo.exceptions import CleoValueError
+from cleo.formatters.formatter import Formatter
 from cleo.helpers import option
 from cleo.io.outputs.output import Verbosity
 from cleo.ui.table_style import TableStyle
-from packaging.requirements import Requirement
 from poetry.__version__ import __version__ as poetry_version
 from poetry.console.application import Application
 from poetry.console.commands.add import AddCommand
@@ -20,20 +21,26 @@ from poetry.console.commands.self.self_command import SelfCommand
 from poetry.console.commands.update import UpdateCommand
 from poetry.plugins.application_plugin import ApplicationPlugin
 
-from sync_pre_commit_lock import Printer
+from sync_pre_commit_lock import Printer, render
 from sync_pre_commit_lock.actions.install_hooks import SetupPreCommitHooks
 from sync_pre_commit_lock.actions.sync_hooks import GenericLockedPackage, SyncPreCommitHooksVersion
 from sync_pre_commit_lock.config import load_config
+from sync_pre_commit_lock.lockfile import scan_locked_packages
+from sync_pre_commit_lock.requirements import parse_requirement
+from sync_pre_commit_lock.state import SyncState
 from sync_pre_commit_lock.utils import url_diff
 
 if TYPE_CHECKING:
-    from collections.abc import Sequence
+    import mmap
+    from collections.abc import Mapping, Sequence
 
     from cleo.events.event import Event
     from cleo.events.event_dispatcher import EventDispatcher
     from cleo.io.io import IO
 
+    from sync_pre_commit_lock import Level, Message
     from sync_pre_commit_lock.pre_commit_config import PreCommitHook, PreCommitRepo
+    from sync_pre_commit_lock.pre_commit_store import EnvironmentEstimate
 
 
 very_compact_style = (
@@ -53,35 +60,49 @@ class PoetryPrinter(Printer):
         self.io = io
         self.plugin_prefix = "[sync-pre-commit-lock] " if with_prefix else ""
 
-    def debug(self, msg: str) -> None:
-        self.io.write_line(f"<info>{self.plugin_prefix}{msg}</info>", verbosity=Verbosity.DEBUG)
+    def is_enabled(self, level: Level) -> bool:
+        return self.io.is_debug() if level == "debug" else not self.io.output.is_quiet()
 
-    def info(self, msg: str) -> None:
-        self.io.write_line(f"<info>{self.plugin_prefix}{msg}</info>", verbosity=Verbosity.NORMAL)
+    def debug(self, msg: Message) -> None:
+        if self.is_enabled("debug"):
+            self.io.write_line(f"<info>{self.plugin_prefix}{render(msg)}</info>", verbosity=Verbosity.DEBUG)
 
-    def warning(self, msg: str) -> None:
-        return self.io.write_line(f"<warning>{self.plugin_prefix}{msg}</warning>", verbosity=Verbosity.NORMAL)
+    def info(self, msg: Message) -> None:
+        self.io.write_line(f"<info>{self.plugin_prefix}{render(msg)}</info>", verbosity=Verbosity.NORMAL)
 
-    def error(self, msg: str) -> None:
-        return self.io.write_error_line(f"<error>{self.plugin_prefix}{msg}</error>", verbosity=Verbosity.NORMAL)
+    def warning(self, msg: Message) -> None:
+        return self.io.write_line(f"<warning>{self.plugin_prefix}{render(msg)}</warning>", verbosity=Verbosity.NORMAL)
 
-    def success(self, msg: str) -> None:
-        return self.io.write_line(f"<success>{self.plugin_prefix} {msg}</success>", verbosity=Verbosity.NORMAL)
+    def error(self, msg: Message) -> None:
+        return self.io.write_error_line(f"<error>{self.plugin_prefix}{render(msg)}</error>", verbosity=Verbosity.NORMAL)
 
-    def list_updated_packages(self, packages: dict[str, tuple[PreCommitRepo, PreCommitRepo]]) -> None:
+    def success(self, msg: Message) -> None:
+        return self.io.write_line(f"<success>{self.plugin_prefix} {render(msg)}</success>", verbosity=Verbosity.NORMAL)
+
+    def list_updated_packages(
+        self,
+        packages: dict[str, tuple[PreCommitRepo, PreCommitRepo]],
+        environments: Mapping[str, EnvironmentEstimate] | None = None,
+    ) -> None:
         from cleo.ui.table import Table
 
         table = Table(self.io, style=very_compact_style)  # type: ignore[arg-type]
 
         table.set_rows(
-            [list(row) for package, (old, new) in packages.items() for row in self._format_repo(package, old, new)]
+            [
+                list(row)
+                for package, (old, new) in packages.items()
+                for row in self._format_repo(package, old, new, (environments or {}).get(package))
+            ]
         )
 
         table.render()
 
-    def _format_repo(self, package: str, old: PreCommitRepo, new: PreCommitRepo) -> Sequence[Sequence[str]]:
+    def _format_repo(
+        self, package: str, old: PreCommitRepo, new: PreCommitRepo, estimate: EnvironmentEstimate | None = None
+    ) -> Sequence[Sequence[str]]:
         new_version = new.rev != old.rev
-        repo = (
+        repo: tuple[str, ...] = (
             f"<info>{self.plugin_prefix} {self.success_list_token}",
             self._format_repo_url(old.repo, new.repo, package),
             " ",
@@ -89,6 +110,8 @@ class PoetryPrinter(Printer):
             "->" if new_version else "",
             f"<success>{new.rev}</></>" if new_version else "</>",
         )
+        if estimate and estimate.hooks:
+            repo = (*repo, f"<comment>{estimate.describe()}</>")
         nb_hooks = len(old.hooks)
         hooks = [
             row
@@ -97,6 +120,13 @@ class PoetryPrinter(Printer):
         ]
         return [repo, *hooks] if hooks else [repo]
 
+    def print_diff(self, diff: Sequence[str]) -> None:
+        styles = {"---": "options=bold", "+++": "options=bold", "@@": "c1", "-": "fg=red", "+": "fg=green"}
+        for line in diff:
+            text = Formatter.escape(line.rstrip("\n"))
+            style = next((style for prefix, style in styles.items() if line.startswith(prefix)), None)
+            self.io.write_line(f"<{style}>{text}</>" if style else text, verbosity=Verbosity.NORMAL)
+
     def _format_repo_url(self, old_repo_url: str, new_repo_url: str, package_name: str) -> str:
         url = url_diff(old_repo_url, new_repo_url, "<c1>{</><warning>", "</><c1> -> </><success>", "</><c1>}</>")
         return url.replace(package_name, f"<c1>{package_name}</>")
@@ -123,15 +153,15 @@ class PoetryPrinter(Printer):
         return (hook, *dependencies)
 
     def _format_additional_dependency(self, old: str, new: str, prefix: str, last: bool) -> Sequence[str]:
-        old_req = Requirement(old)
-        new_req = Requirement(new)
+        old_req = parse_requirement(old)
+        new_req = parse_requirement(new)
         return (
             f"<info>{self.plugin_prefix}</>",
             f"{prefix} {'└' if last else '├'} <c1>{old_req.name}</>",
             " ",
-            f"<warning>{str(old_req.specifier).lstrip('==') or '*'}</>",
+            f"<warning>{old_req.specifier.lstrip('==') or '*'}</>",
             "<info>-></>",
-            f"<success>{str(new_req.specifier).lstrip('==')}</>",
+            f"<success>{new_req.specifier.lstrip('==')}</>",
         )
 
 
@@ -140,9 +170,37 @@ class PoetrySetupPreCommitHooks(SetupPreCommitHooks):
     check_pre_commit_version_command: ClassVar[Sequence[str | bytes]] = ["poetry", "run", "pre-commit", "--version"]
 
 
-def run_sync_pre_commit_version(printer: PoetryPrinter, dry_run: bool, application: Application) -> None:
-    poetry_locked_packages = application.poetry.locker.locked_repository().packages
-    locked_packages = {str(p.name): GenericLockedPackage(p.name, str(p.version)) for p in poetry_locked_packages}
+POETRY_LOCK_VERSION = re.compile(rb'^lock-version = "[12]\.', re.MULTILINE)
+"""The lock format versions supported by the direct reader"""
+
+
+def _is_supported_poetry_lock(data: mmap.mmap) -> bool:
+    # Poetry writes the metadata table after the packages
+    metadata_start = data.rfind(b"\n[metadata]")
+    return metadata_start >= 0 and bool(POETRY_LOCK_VERSION.search(data, metadata_start))
+
+
+def load_poetry_lock(path: Path) -> dict[str, GenericLockedPackage] | None:
+    """Read the locked packages from `poetry.lock` without building Poetry's locked repository.
+
+    Returns:
+        The locked packages, or None if the lockfile is missing or has an unknown format.
+    """
+    try:
+        return scan_locked_packages(path, _is_supported_poetry_lock)
+    except OSError:
+        return None
+
+
+def run_sync_pre_commit_version(
+    printer: PoetryPrinter, dry_run: bool, application: Application, full: bool = False, diff: bool = False
+) -> None:
+    locker = application.poetry.locker
+    locked_packages = load_poetry_lock(locker.lock)
+    if locked_packages is None:
+        printer.debug("Unsupported poetry.lock format, loading the locked repository from Poetry.")
+        poetry_locked_packages = locker.locked_repository().packages
+        locked_packages = {str(p.name): GenericLockedPackage(p.name, str(p.version)) for p in poetry_locked_packages}
     plugin_config = load_config(application.poetry.pyproject_path)
     file_path = Path().cwd() / plugin_config.pre_commit_config_file
     # Add poetry itself as it won't be part of the resolved dependencies
@@ -154,6 +212,9 @@ def run_sync_pre_commit_version(printer: PoetryPrinter, dry_run: bool, applicati
         plugin_config=plugin_config,
         locked_packages=locked_packages,
         dry_run=dry_run,
+        state=SyncState.load(file_path),
+        full=full,
+        diff=diff,
     ).execute()
 
 
@@ -207,6 +268,16 @@ class SyncPreCommitPoetryCommand(Command):
             None,
             "Output the operations but do not update the pre-commit file.",
         ),
+        option(
+            "full",
+            None,
+            "Check every hook, even if nothing changed since the last sync.",
+        ),
+        option(
+            "diff",
+            None,
+            "Show the changes to the pre-commit config file as a unified diff.",
+        ),
     ]
 
     def handle(self) -> int:
@@ -215,7 +286,13 @@ class SyncPreCommitPoetryCommand(Command):
             msg = "self.application is None"
             raise RuntimeError(msg)
         assert isinstance(self.application, Application)
-        run_sync_pre_commit_version(PoetryPrinter(self.io, with_prefix=False), False, self.application)
+        run_sync_pre_commit_version(
+            PoetryPrinter(self.io, with_prefix=False),
+            False,
+            self.application,
+            full=bool(self.option("full")),
+            diff=bool(self.option("diff")),
+        )
         return 0
 
 
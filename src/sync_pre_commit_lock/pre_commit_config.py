@@ -1,18 +1,20 @@
 from __future__ import annotations
 
-import difflib
-from dataclasses import dataclass, field
+import sys
 from functools import cached_property
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, ClassVar
+from weakref import WeakValueDictionary
 
 import strictyaml as yaml
 from strictyaml import Any as AnyStrictYaml
 from strictyaml import MapCombined, Optional, Seq, Str
 
-from sync_pre_commit_lock.utils import normalize_git_url
+from sync_pre_commit_lock.edit_plan import Edit, EditPlan, split_lines
+from sync_pre_commit_lock.scanner import HookNode, RepoNode, ScalarNode, Span, UnsupportedSyntax, scan_repos
+from sync_pre_commit_lock.utils import normalize_git_url, write_if_changed
 
 if TYPE_CHECKING:
-    from collections.abc import Sequence
+    from collections.abc import Iterable, Sequence
     from pathlib import Path
 
 schema = MapCombined(
@@ -43,42 +45,104 @@ schema = MapCombined(
 )
 
 
-@dataclass(frozen=True)
 class PreCommitHook:
+    """A hook of a pre-commit repo, and its additional dependencies.
+
+    Immutable, with its hash computed once. Identical hooks are interned: constructing an equal hook returns the
+    existing instance, so large configurations share hooks and compare them by identity.
+    """
+
+    __slots__ = ("__weakref__", "_hash", "additional_dependencies", "id")
+
+    _interned: ClassVar[WeakValueDictionary[tuple[str, ...], PreCommitHook]] = WeakValueDictionary()
+
     id: str
-    additional_dependencies: Sequence[str] = field(default_factory=tuple)
+    additional_dependencies: tuple[str, ...]
+    _hash: int
+
+    def __new__(cls, id: str, additional_dependencies: Iterable[str] = ()) -> PreCommitHook:  # noqa: PYI034
+        key = (sys.intern(id), *(sys.intern(dep) for dep in additional_dependencies))
+        hook = cls._interned.get(key)
+        if hook is None:
+            hook = super().__new__(cls)
+            object.__setattr__(hook, "id", key[0])
+            object.__setattr__(hook, "additional_dependencies", key[1:])
+            object.__setattr__(hook, "_hash", hash(key))
+            cls._interned[key] = hook
+        return hook
+
+    def __setattr__(self, name: str, value: object) -> None:
+        raise AttributeError(f"cannot assign to field {name!r}")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"cannot delete field {name!r}")
 
     def __hash__(self) -> int:
-        return hash((self.id, *self.additional_dependencies))
+        return self._hash
 
     def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
+        if not isinstance(other, PreCommitHook):
+            return NotImplemented
         return (
-            isinstance(other, PreCommitHook)
-            and other.id == self.id
-            and all(
-                other_dep == self_dep
-                for other_dep, self_dep in zip(other.additional_dependencies, self.additional_dependencies)
-            )
+            self._hash == other._hash
+            and self.id == other.id
+            and self.additional_dependencies == other.additional_dependencies
         )
 
+    def __repr__(self) -> str:
+        return f"PreCommitHook(id={self.id!r}, additional_dependencies={self.additional_dependencies!r})"
+
+    def __reduce__(self) -> tuple[type[PreCommitHook], tuple[str, tuple[str, ...]]]:
+        return PreCommitHook, (self.id, self.additional_dependencies)
+
 
-@dataclass(frozen=True)
 class PreCommitRepo:
+    """A pre-commit repo, its revision and its hooks. Immutable, with its hash computed once."""
+
+    __slots__ = ("_hash", "hooks", "repo", "rev")
+
     repo: str
     rev: str  # Check if is not loaded as float/int/other yolo
-    hooks: Sequence[PreCommitHook] = field(default_factory=tuple)
+    hooks: tuple[PreCommitHook, ...]
+    _hash: int
+
+    def __init__(self, repo: str, rev: str, hooks: Iterable[PreCommitHook] = ()) -> None:
+        hooks = tuple(hooks)
+        object.__setattr__(self, "repo", repo)
+        object.__setattr__(self, "rev", rev)
+        object.__setattr__(self, "hooks", hooks)
+        object.__setattr__(self, "_hash", hash((repo, rev, hooks)))
+
+    def __setattr__(self, name: str, value: object) -> None:
+        raise AttributeError(f"cannot assign to field {name!r}")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"cannot delete field {name!r}")
 
     def __hash__(self) -> int:
-        return hash((self.repo, self.rev, *[hook.__hash__() for hook in self.hooks]))
+        return self._hash
 
     def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
+        if not isinstance(other, PreCommitRepo):
+            return NotImplemented
+        # Hooks are interned, so comparing the tuples mostly compares identities
         return (
-            isinstance(other, PreCommitRepo)
-            and other.repo == self.repo
-            and other.rev == self.rev
-            and all(other_hook == self_hook for other_hook, self_hook in zip(other.hooks, self.hooks))
+            self._hash == other._hash
+            and self.repo == other.repo
+            and self.rev == other.rev
+            and self.hooks == other.hooks
         )
 
+    def __repr__(self) -> str:
+        return f"PreCommitRepo(repo={self.repo!r}, rev={self.rev!r}, hooks={self.hooks!r})"
+
+    def __reduce__(self) -> tuple[type[PreCommitRepo], tuple[str, str, tuple[PreCommitHook, ...]]]:
+        return PreCommitRepo, (self.repo, self.rev, self.hooks)
+
 
 class PreCommitHookConfig:
     def __init__(
@@ -87,15 +151,64 @@ class PreCommitHookConfig:
         pre_commit_config_file_path: Path,
     ) -> None:
         self.raw_file_contents = raw_file_contents
-        self.yaml = yaml.dirty_load(
-            raw_file_contents, schema=schema, allow_flow_style=True, label=str(pre_commit_config_file_path)
+        self.pre_commit_config_file_path = pre_commit_config_file_path
+
+        self.repo_nodes: Sequence[RepoNode]
+        """The repos with the source spans of their scalars, in document order"""
+        try:
+            self.repo_nodes = scan_repos(raw_file_contents)
+        except UnsupportedSyntax:
+            # Let strictyaml handle (and validate) anything the fast scanner doesn't understand
+            self.yaml = self._load_yaml()
+            self.repo_nodes = self._repo_nodes_from_yaml()
+
+    def _load_yaml(self) -> Any:
+        return yaml.dirty_load(
+            self.raw_file_contents, schema=schema, allow_flow_style=True, label=str(self.pre_commit_config_file_path)
         )
 
-        self.pre_commit_config_file_path = pre_commit_config_file_path
+    @cached_property
+    def yaml(self) -> Any:
+        """The strictyaml document, only loaded when needed if the fast scanner succeeded."""
+        return self._load_yaml()
+
+    def _repo_nodes_from_yaml(self) -> tuple[RepoNode, ...]:
+        """Build the repo nodes from the strictyaml document."""
+        repo_nodes = []
+        for repo in self.yaml.get("repos", ()):
+            hook_nodes = []
+            for hook in repo.get("hooks", ()):
+                dependencies = hook.get("additional_dependencies", ())
+                hook_nodes.append(
+                    HookNode(
+                        self._yaml_scalar_node(hook, "id"),
+                        tuple(self._yaml_scalar_node(dependencies, idx) for idx in range(len(dependencies))),
+                    )
+                )
+            rev = self._yaml_scalar_node(repo, "rev") if "rev" in repo else None
+            repo_nodes.append(RepoNode(self._yaml_scalar_node(repo, "repo"), rev, tuple(hook_nodes)))
+        return tuple(repo_nodes)
+
+    def _yaml_scalar_node(self, parent: Any, key: str | int) -> ScalarNode:
+        """Locate a strictyaml scalar in the source, from the position ruamel recorded in its parent collection."""
+        value = str(parent[key])
+        # strictyaml's own `start_line` is the line of the parent entry, not of the value: use ruamel's positions
+        positions = parent.as_marked_up().lc
+        line, column = positions.value(key) if isinstance(key, str) else positions.item(key)
+        source = self.source_lines[line] if line < len(self.source_lines) else ""
+        if source.startswith(("'", '"'), column):
+            column += 1
+        # Scalars with escapes, or spanning several lines, can't be edited in place
+        return ScalarNode(value, Span(line, column, len(value)) if source.startswith(value, column) else None)
+
+    @cached_property
+    def source_lines(self) -> list[str]:
+        """The source lines, as numbered by the spans."""
+        return [line.removesuffix("\r") for line in self.raw_file_contents.split("\n")]
 
     @cached_property
     def original_file_lines(self) -> list[str]:
-        return self.raw_file_contents.splitlines(keepends=True)
+        return split_lines(self.raw_file_contents)
 
     @property
     def data(self) -> Any:
@@ -113,92 +226,61 @@ class PreCommitHookConfig:
         """Return the repos, excluding local repos."""
         return [
             PreCommitRepo(
-                repo=repo["repo"],
-                rev=repo["rev"],
+                repo=node.repo.value,
+                rev=node.rev.value,
                 hooks=tuple(
-                    PreCommitHook(hook["id"], hook.get("additional_dependencies", tuple()))
-                    for hook in repo.get("hooks", tuple())
+                    PreCommitHook(hook.id.value, tuple(dep.value for dep in hook.additional_dependencies))
+                    for hook in node.hooks
                 ),
             )
-            for repo in (self.data["repos"] or [])
-            if "rev" in repo
+            for node in self.repo_nodes
+            if node.rev is not None
         ]
 
     @cached_property
-    def repos_normalized(self) -> set[PreCommitRepo]:
-        return {
-            PreCommitRepo(
-                repo=normalize_git_url(repo.repo),
-                rev=repo.rev,
-                hooks=repo.hooks,
-            )
-            for repo in self.repos
-        }
+    def repo_nodes_normalized(self) -> dict[PreCommitRepo, list[RepoNode]]:
+        """The nodes of each repo (excluding local repos), by normalized repo."""
+        nodes: dict[PreCommitRepo, list[RepoNode]] = {}
+        for node, repo in zip((node for node in self.repo_nodes if node.rev is not None), self.repos):
+            normalized = PreCommitRepo(repo=normalize_git_url(repo.repo), rev=repo.rev, hooks=repo.hooks)
+            nodes.setdefault(normalized, []).append(node)
+        return nodes
 
     @cached_property
-    def document_start_offset(self) -> int:
-        """Return the line number where the YAML document starts."""
-        lines = self.raw_file_contents.split("\n")
-        for i, line in enumerate(lines):
-            # Trim leading/trailing whitespaces
-            line = line.rstrip()
-            # Skip if line is a comment or empty/whitespace
-            if line.startswith("#") or line == "":
-                continue
-            # If line is '---', return line number + 1
-            if line == "---":
-                return i + 1
-        return 0
-
-    def update_pre_commit_repo_versions(self, new_versions: dict[PreCommitRepo, PreCommitRepo]) -> None:
-        """Fix the pre-commit hooks to match the lockfile. Preserve comments and formatting as much as possible."""
-        if len(new_versions) == 0:
-            return
-
-        original_lines = self.original_file_lines
-        updated_lines = original_lines[:]
-
-        for repo_rev in self.yaml["repos"]:
-            if "rev" not in repo_rev:
-                continue
+    def repos_normalized(self) -> set[PreCommitRepo]:
+        return set(self.repo_nodes_normalized)
 
-            repo, rev, hooks = repo_rev["repo"], repo_rev["rev"], repo_rev.get("hooks", tuple())
-            normalized_repo = PreCommitRepo(
-                normalize_git_url(str(repo)),
-                str(rev),
-                tuple(
-                    PreCommitHook(str(hook["id"]), [str(dep) for dep in hook.get("additional_dependencies", tuple())])
-                    for hook in hooks
-                ),
-            )
-            if not (updated_repo := new_versions.get(normalized_repo)):
-                continue
-
-            rev_line_number: int = rev.end_line + self.document_start_offset
-            rev_line_idx: int = rev_line_number - 1
-            original_rev_line: str = updated_lines[rev_line_idx]
-            updated_lines[rev_line_idx] = original_rev_line.replace(str(rev), updated_repo.rev)
-
-            for src_hook, old_hook, new_hook in zip(hooks, normalized_repo.hooks, updated_repo.hooks):
-                if new_hook == old_hook:
-                    continue
-                for src_dep, old_dep, new_dep in zip(
-                    src_hook.get("additional_dependencies", []),
-                    old_hook.additional_dependencies,
-                    new_hook.additional_dependencies,
-                ):
-                    if old_dep == new_dep:
+    def plan_pre_commit_repo_versions(self, new_versions: dict[PreCommitRepo, PreCommitRepo]) -> EditPlan:
+        """Plan the edits of the rev and additional dependencies of the repos to update."""
+        edits: list[Edit] = []
+        for old_repo, new_repo in new_versions.items():
+            for node in self.repo_nodes_normalized.get(old_repo, ()):
+                if node.rev is not None and node.rev.span is not None and new_repo.rev != old_repo.rev:
+                    edits.append(Edit(node.rev.span, new_repo.rev))
+                for hook_node, old_hook, new_hook in zip(node.hooks, old_repo.hooks, new_repo.hooks):
+                    if new_hook == old_hook:
                         continue
-                    dep_line_number: int = src_dep.end_line + self.document_start_offset
-                    dep_line_idx: int = dep_line_number - 1
-                    original_dep_line: str = updated_lines[dep_line_idx]
-                    updated_lines[dep_line_idx] = original_dep_line.replace(str(src_dep), new_dep)
+                    for dep_node, old_dep, new_dep in zip(
+                        hook_node.additional_dependencies,
+                        old_hook.additional_dependencies,
+                        new_hook.additional_dependencies,
+                    ):
+                        if old_dep != new_dep and dep_node.span is not None:
+                            edits.append(Edit(dep_node.span, new_dep))
+        return EditPlan(self.original_file_lines, edits)
+
+    def update_pre_commit_repo_versions(
+        self, new_versions: dict[PreCommitRepo, PreCommitRepo], fsync: bool = False
+    ) -> None:
+        """Fix the pre-commit hooks to match the lockfile. Preserve comments and formatting as much as possible.
 
-        changes = difflib.ndiff(original_lines, updated_lines)
-        change_count = sum(1 for change in changes if change[0] in ["+", "-"])
+        The file is replaced atomically, and not touched if its contents would not change.
+        """
+        if len(new_versions) == 0:
+            return
 
-        if change_count == 0:
+        plan = self.plan_pre_commit_repo_versions(new_versions)
+        if plan.change_count == 0:
             msg = "No changes to write, this should not happen"
             raise RuntimeError(msg)
-        with self.pre_commit_config_file_path.open("w") as stream:
-            stream.writelines(updated_lines)
+        write_if_changed(self.pre_commit_config_file_path, "".join(plan.apply()), fsync=fsync)
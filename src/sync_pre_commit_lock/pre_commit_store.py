@@ -0,0 +1,90 @@
+"""
+Read-only access to pre-commit's local store, to estimate the cost of a sync before applying it.
+
+pre-commit clones a repo once per `rev` and set of `additional_dependencies`, records the clones in the `repos` table
+of `db.db`, and installs the hook environments inside them. A hook whose `rev` or `additional_dependencies` change
+needs a new environment: it is only cheap if a matching one is already in the store (e.g. from another project).
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+from contextlib import closing
+from functools import cached_property
+from pathlib import Path
+from typing import TYPE_CHECKING, NamedTuple
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from sync_pre_commit_lock.pre_commit_config import PreCommitRepo
+
+
+def store_dir() -> Path:
+    """The pre-commit store directory, resolved like pre-commit does."""
+    return Path(
+        os.getenv("PRE_COMMIT_HOME") or Path(os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache") / "pre-commit"
+    )
+
+
+def db_repo_name(repo: str, additional_dependencies: Sequence[str]) -> str:
+    """The name of a clone in the store database, as written by pre-commit."""
+    if additional_dependencies:
+        return f"{repo}:{','.join(additional_dependencies)}"
+    return repo
+
+
+class EnvironmentEstimate(NamedTuple):
+    hooks: tuple[str, ...]
+    """The hooks that will need a new environment"""
+    cold: tuple[str, ...]
+    """Among them, the hooks without a matching environment in the store, which will be built from scratch"""
+
+    def describe(self) -> str:
+        if not self.hooks:
+            return ""
+        return f"({len(self.hooks)} new hook environments, {len(self.cold)} to build)"
+
+
+class PreCommitStore:
+    """The clones recorded in pre-commit's store. A missing or unreadable store is empty."""
+
+    def __init__(self, path: Path | None = None) -> None:
+        self.path = path or store_dir()
+
+    @cached_property
+    def clones(self) -> dict[tuple[str, str], str]:
+        """The path of each clone, by (repo name, ref)."""
+        db_path = self.path / "db.db"
+        if not db_path.is_file():
+            return {}
+        try:
+            with closing(sqlite3.connect(f"{db_path.as_uri()}?mode=ro", uri=True)) as db:
+                return {(repo, ref): path for repo, ref, path in db.execute("SELECT repo, ref, path FROM repos")}
+        except sqlite3.Error:
+            return {}
+
+    def has_environment(self, repo: str, rev: str, additional_dependencies: Sequence[str]) -> bool:
+        """Whether a hook environment is installed for this repo, rev and additional dependencies."""
+        clone = self.clones.get((db_repo_name(repo, additional_dependencies), rev))
+        return clone is not None and any(Path(clone).glob("*/.install_state_v*"))
+
+    def estimate(self, old: PreCommitRepo, new: PreCommitRepo, repo: str | None = None) -> EnvironmentEstimate:
+        """Estimate the hook environments invalidated by updating a repo.
+
+        Args:
+            old: The repo as in the config.
+            new: The updated repo.
+            repo: The repo URL as written in the config, which pre-commit records as is. Defaults to `new.repo`.
+        """
+        repo = repo or new.repo
+        hooks = [
+            new_hook for old_hook, new_hook in zip(old.hooks, new.hooks) if new.rev != old.rev or new_hook != old_hook
+        ]
+        return EnvironmentEstimate(
+            hooks=tuple(hook.id for hook in hooks),
+            cold=tuple(
+                hook.id for hook in hooks if not self.has_environment(repo, new.rev, hook.additional_dependencies)
+            ),
+        )
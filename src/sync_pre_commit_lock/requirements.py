@@ -0,0 +1,165 @@
+"""
+Memoized parsing of the `additional_dependencies` requirements.
+
+Parsing a requirement is one of the most expensive steps of a sync, and the same strings are parsed by the analyzer
+and again by the printers, on every run. The results are immutable and cached, bounded, for the whole process.
+Use `parse_requirement.cache_info()` and `pin_requirement.cache_info()` for the hit/miss counters.
+
+Most requirements are plain `name==1.2.3` or `name[extra]>=1.2`: those are parsed with a regex, and anything else
+(markers, URLs, pre-releases, wildcards...) falls back to the full `packaging` grammar. Both give the same results.
+
+Pinning only rewrites the span of the version specifier: the name, extras, whitespace and markers are kept as written,
+so a pinned requirement only changes when its version does (pre-commit keys hook environments by these strings).
+"""
+
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import NamedTuple
+
+from packaging.markers import InvalidMarker, Marker, UndefinedEnvironmentName
+from packaging.requirements import Requirement
+from packaging.specifiers import SpecifierSet
+from packaging.utils import canonicalize_name
+from packaging.version import InvalidVersion, Version
+
+REQUIREMENT_CACHE_SIZE = 4096
+
+_NAME = r"[A-Za-z0-9](?:[A-Za-z0-9._-]*[A-Za-z0-9])?"
+_CLAUSE = r"(==|!=|>=|<=|~=|<|>)[ \t]*([0-9]+(?:\.[0-9]+)*)"
+_SIMPLE_REQUIREMENT = re.compile(
+    rf"[ \t]*(?P<name>{_NAME})[ \t]*"
+    rf"(?:\[(?P<extras>[ \t]*{_NAME}(?:[ \t]*,[ \t]*{_NAME})*)[ \t]*\][ \t]*)?"
+    rf"(?P<specifier>{_CLAUSE}(?:[ \t]*,[ \t]*{_CLAUSE})*)?[ \t]*"
+)
+_SIMPLE_CLAUSE = re.compile(_CLAUSE)
+# A trailing `.0` or a leading zero: versions written differently can be equal (e.g. `1`, `1.0` and `01.0`)
+_NON_CANONICAL_RELEASE = re.compile(r"\.0$|(?:^|\.)0[0-9]")
+_SIMPLE_VERSION = re.compile(r"[0-9]+(?:\.[0-9]+)*(?:(?:a|b|rc)[0-9]+)?(?:\.post[0-9]+)?(?:\.dev[0-9]+)?")
+_SPECIFIER_SPAN = re.compile(
+    rf"(?P<head>[ \t]*{_NAME}(?:[ \t]*\[[^\]]*\])?)(?P<space>[ \t]*)"
+    r"(?:\((?P<parenthesized>[^)]*)\)|(?P<specifier>[^;@]*?))(?P<tail>[ \t]*(?:;.*)?)",
+    re.DOTALL,
+)
+
+
+class ParsedRequirement(NamedTuple):
+    name: str
+    """The name, as written"""
+    canonical_name: str
+    specifier: str
+    """The version specifier, normalized by `packaging` (e.g. `==1.0,>=0.9`), empty if none"""
+    marker: str = ""
+    """The environment marker, normalized by `packaging`, empty if none"""
+
+
+def _parse_simple_requirement(requirement: str) -> tuple[str, str, str] | None:
+    """Parse the common requirement forms to their name, extras and specifier, formatted like `packaging`.
+
+    Returns:
+        None if the requirement is not in a common form, and must be parsed by `packaging`.
+    """
+    match = _SIMPLE_REQUIREMENT.fullmatch(requirement)
+    if match is None:
+        return None
+    clauses = _SIMPLE_CLAUSE.findall(match["specifier"] or "")
+    if any(operator == "~=" and "." not in version for operator, version in clauses):
+        return None  # Invalid, let `packaging` report it
+    if len(clauses) > 1 and (
+        len({operator for operator, _ in clauses}) < len(clauses)
+        or any(_NON_CANONICAL_RELEASE.search(version) for _, version in clauses)
+    ):
+        return None  # `packaging` dedupes the clauses by meaning, not by text
+    extras = sorted({extra.strip() for extra in match["extras"].split(",")}) if match["extras"] else ()
+    specifier = ",".join(sorted(operator + version for operator, version in clauses))
+    return match["name"], f"[{','.join(extras)}]" if extras else "", specifier
+
+
+@lru_cache(maxsize=REQUIREMENT_CACHE_SIZE)
+def parse_requirement(requirement: str) -> ParsedRequirement:
+    """Parse a requirement.
+
+    Raises:
+        InvalidRequirement: If the requirement is invalid. Not cached.
+    """
+    if simple := _parse_simple_requirement(requirement):
+        name, _, specifier = simple
+        return ParsedRequirement(name, canonicalize_name(name), specifier)
+    parsed = Requirement(requirement)
+    return ParsedRequirement(
+        parsed.name, canonicalize_name(parsed.name), str(parsed.specifier), str(parsed.marker or "")
+    )
+
+
+@lru_cache(maxsize=REQUIREMENT_CACHE_SIZE)
+def pin_requirement(requirement: str, version: str, operator: str = "==") -> str:
+    """Replace the version specifier of a requirement by `<operator><version>`, keeping the rest as written.
+
+    A direct reference (`name @ url`) has no version to pin, and is returned as is.
+
+    Raises:
+        InvalidRequirement: If the requirement is invalid. Not cached.
+        InvalidSpecifier: If the version is invalid for the operator.
+    """
+    parse_requirement(requirement)
+    if not _SIMPLE_VERSION.fullmatch(version):
+        SpecifierSet(f"{operator}{version}")
+    match = _SPECIFIER_SPAN.fullmatch(requirement)
+    if match is None:
+        return requirement  # A direct reference
+    if match["parenthesized"] is not None:
+        return f"{match['head']}{match['space']}({operator}{version}){match['tail']}"
+    if match["specifier"]:
+        return f"{match['head']}{match['space']}{operator}{version}{match['tail']}"
+    return f"{match['head']}{operator}{version}{match['space']}{match['tail']}"
+
+
+@lru_cache(maxsize=REQUIREMENT_CACHE_SIZE)
+def specifier_contains(specifier: str, version: str) -> bool:
+    """Whether a version specifier (e.g. `ParsedRequirement.specifier`) admits a version, pre-releases included."""
+    try:
+        return SpecifierSet(specifier).contains(version, prereleases=True)
+    except InvalidVersion:
+        return False
+
+
+@lru_cache(maxsize=REQUIREMENT_CACHE_SIZE)
+def parse_version(version: str) -> Version | None:
+    """Parse a version, None if it is invalid."""
+    try:
+        return Version(version)
+    except InvalidVersion:
+        return None
+
+
+@lru_cache(maxsize=1024)
+def evaluate_marker(marker: str, python_version: str | None = None) -> bool:
+    """Evaluate a marker for a Python version (e.g. `3.12` or `3.12.4`), or the current interpreter. Memoized.
+
+    Invalid markers are false. Markers on variables undefined in this environment (e.g. `dependency_groups`) are true,
+    so they don't make a sync skip a dependency.
+    """
+    environment = None
+    if python_version:
+        environment = {
+            "python_full_version": python_version,
+            "python_version": ".".join(python_version.split(".")[:2]),
+        }
+    try:
+        return Marker(marker).evaluate(environment)
+    except InvalidMarker:
+        return False
+    except UndefinedEnvironmentName:
+        return True
+
+
+@lru_cache(maxsize=REQUIREMENT_CACHE_SIZE)
+def specifier_floor(specifier: str) -> Version | None:
+    """The highest version a version specifier requires at least (`==`, `===`, `>=`, `>` and `~=`), None if none."""
+    floors = [
+        parse_version(spec.version)
+        for spec in SpecifierSet(specifier)
+        if spec.operator in ("==", "===", ">=", ">", "~=") and not spec.version.endswith("*")
+    ]
+    return max((floor for floor in floors if floor is not None), default=None)
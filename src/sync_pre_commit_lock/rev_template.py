@@ -0,0 +1,118 @@
+"""
+Compiled `rev` templates of the repo mapping.
+
+A template is a literal prefix and suffix around a `${rev}` placeholder, e.g. `v${rev}` or `${rev}-mirror`. The
+placeholder takes optional transforms applied to the locked version, in order:
+
+- `${rev|normalize}`: the PEP 440 normalized version, e.g. `1.0.0-rc.1` -> `1.0.0rc1`
+- `${rev|truncate:2}`: the first components of the release, e.g. `1.2.3` -> `1.2`
+
+Templates are compiled once per process, and parse the version back from an existing rev, to compare revs by version.
+"""
+
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+from sync_pre_commit_lock.requirements import parse_version
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from packaging.version import Version
+
+_PLACEHOLDER = re.compile(r"\$\{rev(?P<transforms>(?:\|[^|}]*)*)\}")
+
+
+def _normalize(version: str) -> str:
+    parsed = parse_version(version)
+    return version if parsed is None else str(parsed)
+
+
+def _truncate(components: int) -> Callable[[str], str]:
+    def truncate(version: str) -> str:
+        parsed = parse_version(version)
+        release = version.split(".") if parsed is None else [str(part) for part in parsed.release]
+        return ".".join(release[:components])
+
+    return truncate
+
+
+def _compile_transform(transform: str) -> Callable[[str], str]:
+    name, _, argument = transform.partition(":")
+    if name == "normalize" and not argument:
+        return _normalize
+    if name == "truncate" and argument.isdigit() and int(argument) > 0:
+        return _truncate(int(argument))
+    raise ValueError(f"Unknown rev template transform `{transform}`, expected `normalize` or `truncate:<n>`")
+
+
+class RevTemplate:
+    """A compiled `rev` template."""
+
+    __slots__ = ("prefix", "suffix", "template", "transforms")
+
+    def __init__(self, template: str) -> None:
+        self.template = template
+        self.transforms: tuple[Callable[[str], str], ...] = ()
+        match = _PLACEHOLDER.search(template)
+        if match is None:
+            # A fixed rev (e.g. a branch): no version to format or parse
+            self.prefix: str = template
+            self.suffix: str | None = None
+            return
+        self.prefix = template[: match.start()]
+        self.suffix = template[match.end() :]
+        self.transforms = tuple(
+            _compile_transform(transform) for transform in match["transforms"].split("|")[1:] if transform
+        )
+
+    def __repr__(self) -> str:
+        return f"RevTemplate({self.template!r})"
+
+    def transform(self, version: str) -> str:
+        """Apply the transforms of the template to a version."""
+        for transform in self.transforms:
+            version = transform(version)
+        return version
+
+    def format(self, version: str) -> str:
+        """The rev of a version."""
+        if self.suffix is None:
+            return self.prefix
+        return f"{self.prefix}{self.transform(version)}{self.suffix}"
+
+    def version(self, version: str) -> Version | None:
+        """The version of the rev of a version, once transformed, None if invalid."""
+        return parse_version(self.transform(version))
+
+    def parse(self, rev: str) -> Version | None:
+        """The version of a rev, e.g. `1.2` for `v1.2` and `v${rev}`.
+
+        Returns:
+            None if the rev does not have the prefix and suffix of the template, or is not a version.
+        """
+        if (
+            self.suffix is None
+            or len(rev) <= len(self.prefix) + len(self.suffix)
+            or not rev.startswith(self.prefix)
+            or not rev.endswith(self.suffix)
+        ):
+            return None
+        version = rev[len(self.prefix) : len(rev) - len(self.suffix)]
+        # `packaging` tolerates a leading `v` and spaces, which the template must spell out
+        if not version[0].isdigit() or version != version.strip():
+            return None
+        return parse_version(version)
+
+
+@lru_cache(maxsize=256)
+def compile_rev_template(template: str) -> RevTemplate:
+    """Compile a `rev` template, memoized.
+
+    Raises:
+        ValueError: If a transform is unknown. Not cached.
+    """
+    return RevTemplate(template)
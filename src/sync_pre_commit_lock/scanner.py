@@ -0,0 +1,326 @@
+"""
+Fast, line-oriented scanner for `.pre-commit-config.yaml` files.
+
+strictyaml is pure Python and by far the slowest step of a sync. Most configuration files use the same
+block-style layout, so this scanner only extracts what the sync needs (`repo`, `rev`, hook `id` and
+`additional_dependencies`) along with their source spans, and skips everything else by indentation.
+
+Whenever it meets something it does not fully understand (anchors, tags, multi-line flow collections,
+escaped strings...), it raises `UnsupportedSyntax` so the caller can fall back to strictyaml.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import TYPE_CHECKING, NamedTuple, TypeVar
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+T = TypeVar("T")
+
+
+class UnsupportedSyntax(Exception):
+    """The document uses YAML features the scanner does not handle."""
+
+    def __init__(self, line: int, reason: str) -> None:
+        super().__init__(f"line {line + 1}: {reason}")
+        self.line = line
+        self.reason = reason
+
+
+class Span(NamedTuple):
+    """Location of a scalar in the source. `line` is 0-based, `column` and `length` exclude the quotes."""
+
+    line: int
+    column: int
+    length: int
+
+
+class ScalarNode(NamedTuple):
+    value: str
+    span: Span | None
+    """None if the scalar can't be edited in place"""
+
+
+class HookNode(NamedTuple):
+    id: ScalarNode
+    additional_dependencies: tuple[ScalarNode, ...]
+
+
+class RepoNode(NamedTuple):
+    repo: ScalarNode
+    rev: ScalarNode | None
+    hooks: tuple[HookNode, ...]
+
+
+_KEY = re.compile(r"([A-Za-z_][\w.-]*)[ ]*:(?:[ ]+|$)")
+# Anchors, aliases and tags at the start of a node
+_NODE_PROPERTY = re.compile(r"(?:^|[\s\[{,])[&*!]")
+_PLAIN_FORBIDDEN_START = frozenset("[]{}&*!|>'\"%@`#,?:-")
+_FLOW_PLAIN_FORBIDDEN = frozenset("[]{}")
+
+
+class _Scanner:
+    """Recursive descent over lines. Each value parser leaves `pos` on the next line holding content."""
+
+    def __init__(self, text: str) -> None:
+        self.lines = [line.removesuffix("\r") for line in text.split("\n")]
+        # Indentation of each line, or -1 for blank and comment-only lines
+        self.indents: list[int] = []
+        for idx, line in enumerate(self.lines):
+            stripped = line.lstrip(" ")
+            if stripped.startswith("\t"):
+                raise UnsupportedSyntax(idx, "tab indentation")
+            self.indents.append(-1 if not stripped or stripped[0] == "#" else len(line) - len(stripped))
+        self.pos = 0
+
+    def next_content_line(self, idx: int) -> int:
+        indents = self.indents
+        while idx < len(indents) and indents[idx] < 0:
+            idx += 1
+        return idx
+
+    def scan(self) -> tuple[RepoNode, ...]:
+        start = self.next_content_line(0)
+        if start < len(self.lines) and self.lines[start] == "---":
+            start = self.next_content_line(start + 1)
+        for idx in range(start, len(self.lines)):
+            if self.lines[idx].startswith(("---", "...", "%")):
+                raise UnsupportedSyntax(idx, "directive or document marker")
+        if start >= len(self.lines):
+            return ()
+        if self.indents[start] != 0:
+            raise UnsupportedSyntax(start, "indented root mapping")
+
+        repos: tuple[RepoNode, ...] = ()
+        for key, line, column in self.mapping(start, 0):
+            if key == "repos":
+                repos = self.sequence(line, column, 0, self.repo)
+            else:
+                self.skip_value(line, column, 0)
+        return repos
+
+    def mapping(self, line: int, column: int) -> Iterator[tuple[str, int, int]]:
+        """Yield `(key, line, value_column)` for each key of the block mapping starting at `line`, `column`.
+
+        The consumer must parse or skip each value before asking for the next key.
+        """
+        seen: set[str] = set()
+        while True:
+            match = _KEY.match(self.lines[line], column)
+            if not match:
+                raise UnsupportedSyntax(line, "unsupported mapping key")
+            key = match.group(1)
+            if key in seen:
+                raise UnsupportedSyntax(line, f"duplicate key `{key}`")
+            seen.add(key)
+            yield key, line, match.end()
+            line = self.pos
+            if line >= len(self.lines) or self.indents[line] < column:
+                return
+            if self.indents[line] > column:
+                raise UnsupportedSyntax(line, "unexpected indentation")
+
+    def sequence(self, line: int, column: int, parent_column: int, item: Callable[[int, int], T]) -> tuple[T, ...]:
+        """Parse a block sequence value (or an empty flow sequence) of the key on `line`."""
+        inline = _strip_comment(self.lines[line][column:], line)
+        self.pos = idx = self.next_content_line(line + 1)
+        if inline == "[]":
+            return ()
+        if inline:
+            raise UnsupportedSyntax(line, "expected a block sequence")
+        if idx >= len(self.lines) or self.indents[idx] < parent_column:
+            raise UnsupportedSyntax(line, "null value")
+        indent = self.indents[idx]
+        items = []
+        while idx < len(self.lines) and self.indents[idx] == indent and _is_sequence_entry(self.lines[idx], indent):
+            text = self.lines[idx]
+            item_column = indent + 1
+            while item_column < len(text) and text[item_column] == " ":
+                item_column += 1
+            if item_column >= len(text) or text[item_column] == "#":
+                raise UnsupportedSyntax(idx, "empty sequence entry")
+            items.append(item(idx, item_column))
+            idx = self.pos
+        if not items:
+            raise UnsupportedSyntax(idx, "expected a sequence entry")
+        if idx < len(self.lines) and self.indents[idx] >= indent and indent != parent_column:
+            raise UnsupportedSyntax(idx, "unexpected content in sequence")
+        return tuple(items)
+
+    def repo(self, line: int, column: int) -> RepoNode:
+        repo: ScalarNode | None = None
+        rev: ScalarNode | None = None
+        hooks: tuple[HookNode, ...] = ()
+        for key, key_line, value_column in self.mapping(line, column):
+            if key == "repo":
+                repo = self.scalar(key_line, value_column, column)
+            elif key == "rev":
+                rev = self.scalar(key_line, value_column, column)
+            elif key == "hooks":
+                hooks = self.sequence(key_line, value_column, column, self.hook)
+            else:
+                self.skip_value(key_line, value_column, column)
+        if repo is None:
+            raise UnsupportedSyntax(line, "repository without `repo` key")
+        return RepoNode(repo, rev, hooks)
+
+    def hook(self, line: int, column: int) -> HookNode:
+        hook_id: ScalarNode | None = None
+        dependencies: tuple[ScalarNode, ...] = ()
+        for key, key_line, value_column in self.mapping(line, column):
+            if key == "id":
+                hook_id = self.scalar(key_line, value_column, column)
+            elif key == "additional_dependencies":
+                if self.lines[key_line].startswith("[", value_column):
+                    dependencies = self.flow_sequence(key_line, value_column, column)
+                else:
+                    dependencies = self.sequence(key_line, value_column, column, self.sequence_scalar)
+            else:
+                self.skip_value(key_line, value_column, column)
+        if hook_id is None:
+            raise UnsupportedSyntax(line, "hook without `id` key")
+        return HookNode(hook_id, dependencies)
+
+    def sequence_scalar(self, line: int, column: int) -> ScalarNode:
+        return self.scalar(line, column, self.indents[line])
+
+    def scalar(self, line: int, column: int, parent_column: int) -> ScalarNode:
+        """Parse a scalar starting at `column`, and check it does not continue on the next lines."""
+        text = self.lines[line]
+        value, start, end = _parse_scalar(text, column, line)
+        if _strip_comment(text[end:], line):
+            raise UnsupportedSyntax(line, "unexpected content after scalar")
+        self.pos = self.next_content_line(line + 1)
+        if self.pos < len(self.lines) and self.indents[self.pos] > parent_column:
+            raise UnsupportedSyntax(self.pos, "multi-line scalar")
+        return ScalarNode(value, Span(line, start, len(value)))
+
+    def flow_sequence(self, line: int, column: int, parent_column: int) -> tuple[ScalarNode, ...]:
+        """Parse a single-line flow sequence of scalars, like `[types-PyYAML, "types-requests"]`."""
+        text = self.lines[line]
+        nodes = []
+        pos = column + 1
+        while True:
+            while text.startswith(" ", pos):
+                pos += 1
+            if pos >= len(text):
+                raise UnsupportedSyntax(line, "multi-line flow sequence")
+            if text[pos] == "]":
+                pos += 1
+                break
+            if text[pos] in "\"'":
+                value, start, pos = _parse_quoted(text, pos, line)
+            else:
+                start = pos
+                while pos < len(text) and text[pos] not in ",]":
+                    if text[pos] in _FLOW_PLAIN_FORBIDDEN or text.startswith(" #", pos):
+                        raise UnsupportedSyntax(line, "unsupported flow sequence")
+                    pos += 1
+                value = text[start:pos].rstrip(" ")
+                if not value or value[0] in _PLAIN_FORBIDDEN_START or ": " in value or value.endswith(":"):
+                    raise UnsupportedSyntax(line, "unsupported flow scalar")
+            nodes.append(ScalarNode(value, Span(line, start, len(value))))
+            while text.startswith(" ", pos):
+                pos += 1
+            if text.startswith(",", pos):
+                pos += 1
+            elif not text.startswith("]", pos):
+                raise UnsupportedSyntax(line, "unsupported flow sequence")
+        if _strip_comment(text[pos:], line):
+            raise UnsupportedSyntax(line, "unexpected content after flow sequence")
+        self.pos = self.next_content_line(line + 1)
+        if self.pos < len(self.lines) and self.indents[self.pos] > parent_column:
+            raise UnsupportedSyntax(self.pos, "unexpected indentation")
+        return tuple(nodes)
+
+    def skip_value(self, line: int, column: int, parent_column: int) -> None:
+        """Skip the value of a key the sync doesn't care about, relying on indentation only."""
+        text = self.lines[line]
+        block_scalar = text.startswith(("|", ">"), column)
+        inline = text[column:] if block_scalar else _strip_comment(text[column:], line)
+        if _NODE_PROPERTY.search(inline):
+            raise UnsupportedSyntax(line, "anchor, alias or tag")
+        if inline.startswith(("[", "{", '"', "'")) and not _is_closed(inline):
+            raise UnsupportedSyntax(line, "multi-line flow collection or quoted scalar")
+        idx = line + 1
+        while idx < len(self.lines):
+            indent = self.indents[idx]
+            if indent > parent_column or (
+                # A block sequence at the same indentation as its parent key
+                indent == parent_column and not inline and _is_sequence_entry(self.lines[idx], indent)
+            ):
+                if not block_scalar and _NODE_PROPERTY.search(self.lines[idx], indent):
+                    raise UnsupportedSyntax(idx, "anchor, alias or tag")
+            elif indent >= 0:
+                break
+            idx += 1
+        self.pos = idx
+
+
+def _is_sequence_entry(text: str, indent: int) -> bool:
+    return text.startswith("-", indent) and (len(text) == indent + 1 or text[indent + 1] == " ")
+
+
+def _strip_comment(text: str, line: int) -> str:
+    """Strip surrounding whitespace and a trailing comment from an inline value."""
+    text = text.strip(" ")
+    if text.startswith("#"):
+        return ""
+    if text.startswith(("'", '"')) and _is_closed(text):
+        end = text.find(text[0], 1) + 1
+        rest = text[end:].lstrip(" ")
+        return text[:end] if not rest or rest.startswith("#") else text
+    idx = text.find(" #")
+    return text[:idx].rstrip(" ") if idx >= 0 else text
+
+
+def _parse_quoted(text: str, start: int, line: int) -> tuple[str, int, int]:
+    """Parse a quoted scalar. Return its value, the start of its content and the position after the quote."""
+    quote = text[start]
+    end = text.find(quote, start + 1)
+    if end < 0:
+        raise UnsupportedSyntax(line, "multi-line quoted scalar")
+    value = text[start + 1 : end]
+    if (quote == '"' and "\\" in value) or (quote == "'" and text.startswith("'", end + 1)):
+        raise UnsupportedSyntax(line, "escaped quoted scalar")
+    return value, start + 1, end + 1
+
+
+def _parse_scalar(text: str, start: int, line: int) -> tuple[str, int, int]:
+    """Parse a block scalar. Return its value, the start of its content and the end of the node."""
+    if start >= len(text) or text[start] == "#":
+        raise UnsupportedSyntax(line, "null value")
+    if text[start] in "\"'":
+        return _parse_quoted(text, start, line)
+    value = _strip_comment(text[start:], line)
+    if value[0] in _PLAIN_FORBIDDEN_START or ": " in value or value.endswith(":"):
+        raise UnsupportedSyntax(line, "unsupported plain scalar")
+    return value, start, start + len(value)
+
+
+def _is_closed(inline: str) -> bool:
+    """Check that an inline flow collection or quoted scalar ends on the same line."""
+    depth = 0
+    quote = ""
+    for char in inline:
+        if quote:
+            if char == quote:
+                quote = ""
+        elif char in "\"'":
+            quote = char
+        elif char in "[{":
+            depth += 1
+        elif char in "]}":
+            depth -= 1
+    return depth == 0 and not quote
+
+
+def scan_repos(text: str) -> tuple[RepoNode, ...]:
+    """Extract the `repos` of a pre-commit configuration file, with the spans of their scalars.
+
+    Raises:
+        UnsupportedSyntax: If the document uses YAML features the scanner does not handle.
+    """
+    return _Scanner(text).scan()
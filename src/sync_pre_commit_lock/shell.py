@@ -9,15 +9,16 @@ import sys
 from enum import IntEnum, auto
 from typing import TYPE_CHECKING, TextIO
 
-from packaging.requirements import Requirement
-
-from sync_pre_commit_lock import Printer
+from sync_pre_commit_lock import Printer, render
+from sync_pre_commit_lock.requirements import parse_requirement
 from sync_pre_commit_lock.utils import url_diff
 
 if TYPE_CHECKING:
-    from collections.abc import Callable, Sequence
+    from collections.abc import Callable, Mapping, Sequence
 
+    from sync_pre_commit_lock import Level, Message
     from sync_pre_commit_lock.pre_commit_config import PreCommitHook, PreCommitRepo
+    from sync_pre_commit_lock.pre_commit_store import EnvironmentEstimate
 
 
 def use_color() -> bool:
@@ -63,6 +64,10 @@ class Verbosity(IntEnum):
     DEBUG = auto()
 
 
+LEVEL_VERBOSITY: dict[Level, Verbosity] = {"debug": Verbosity.DEBUG, "error": Verbosity.QUIET}
+"""The verbosity from which each level is printed, NORMAL if not listed"""
+
+
 def style(*colors: str) -> Callable[[str], str]:
     prefix = "".join(colors)
 
@@ -102,29 +107,53 @@ class ShellPrinter(Printer):
             # Bind late due to https://github.com/pytest-dev/pytest/issues/5997
             (out or sys.stdout).write(f"{msg}\n")
 
-    def debug(self, msg: str) -> None:
-        self.print(debug(self.with_prefix(msg)), Verbosity.DEBUG)
+    def is_enabled(self, level: Level) -> bool:
+        return self.verbosity >= LEVEL_VERBOSITY.get(level, Verbosity.NORMAL)
 
-    def info(self, msg: str) -> None:
-        self.print(info(self.with_prefix(msg)))
+    def debug(self, msg: Message) -> None:
+        if self.is_enabled("debug"):
+            self.print(debug(self.with_prefix(render(msg))), Verbosity.DEBUG)
 
-    def success(self, msg: str) -> None:
-        self.print(success(self.with_prefix(msg)))
+    def info(self, msg: Message) -> None:
+        if self.is_enabled("info"):
+            self.print(info(self.with_prefix(render(msg))))
 
-    def warning(self, msg: str) -> None:
-        self.print(warning(self.with_prefix(msg)))
+    def success(self, msg: Message) -> None:
+        if self.is_enabled("success"):
+            self.print(success(self.with_prefix(render(msg))))
 
-    def error(self, msg: str) -> None:
-        self.print(error(self.with_prefix(msg)), Verbosity.QUIET, out=sys.stderr)
+    def warning(self, msg: Message) -> None:
+        if self.is_enabled("warning"):
+            self.print(warning(self.with_prefix(render(msg))))
 
-    def list_updated_packages(self, packages: dict[str, tuple[PreCommitRepo, PreCommitRepo]]) -> None:
+    def error(self, msg: Message) -> None:
+        self.print(error(self.with_prefix(render(msg))), Verbosity.QUIET, out=sys.stderr)
+
+    def list_updated_packages(
+        self,
+        packages: dict[str, tuple[PreCommitRepo, PreCommitRepo]],
+        environments: Mapping[str, EnvironmentEstimate] | None = None,
+    ) -> None:
         for package, (old, new) in packages.items():
-            for row in self._format_repo(package, old, new):
+            for row in self._format_repo(package, old, new, (environments or {}).get(package)):
                 line = " ".join(row).rstrip()
                 if self.plugin_prefix:
                     line = f"{info(self.plugin_prefix)} {line}"
                 self.print(line)
 
+    def print_diff(self, diff: Sequence[str]) -> None:
+        for line in diff:
+            line = line.rstrip("\n")
+            if line.startswith(("---", "+++")):
+                line = bold(line)
+            elif line.startswith("@@"):
+                line = cyan(line)
+            elif line.startswith("-"):
+                line = error(line)
+            elif line.startswith("+"):
+                line = success(line)
+            self.print(line)
+
     def _format_repo_url(self, old_repo_url: str, new_repo_url: str, package_name: str) -> str:
         url = url_diff(
             old_repo_url,
@@ -135,9 +164,11 @@ class ShellPrinter(Printer):
         )
         return url.replace(package_name, cyan(bold(package_name)))
 
-    def _format_repo(self, package: str, old: PreCommitRepo, new: PreCommitRepo) -> Sequence[Sequence[str]]:
+    def _format_repo(
+        self, package: str, old: PreCommitRepo, new: PreCommitRepo, estimate: EnvironmentEstimate | None = None
+    ) -> Sequence[Sequence[str]]:
         new_version = new.rev != old.rev
-        repo = (
+        repo: tuple[str, ...] = (
             self.success_list_token,
             self._format_repo_url(old.repo, new.repo, package),
             "\t",
@@ -145,6 +176,8 @@ class ShellPrinter(Printer):
             info("->") if new_version else "",
             success(new.rev) if new_version else "",
         )
+        if estimate and estimate.hooks:
+            repo = (*repo, warning(estimate.describe()))
         nb_hooks = len(old.hooks)
         hooks = [
             row
@@ -175,12 +208,12 @@ class ShellPrinter(Printer):
         return (hook, *dependencies)
 
     def _format_additional_dependency(self, old: str, new: str, prefix: str, last: bool) -> Sequence[str]:
-        old_req = Requirement(old)
-        new_req = Requirement(new)
+        old_req = parse_requirement(old)
+        new_req = parse_requirement(new)
         return (
             f"  {prefix} {'└' if last else '├'} {cyan(bold(old_req.name))}",
             "\t",
-            error(str(old_req.specifier).lstrip("==") or "*"),
+            error(old_req.specifier.lstrip("==") or "*"),
             info("->"),
-            success(str(new_req.specifier).lstrip("==")),
+            success(new_req.specifier.lstrip("==")),
         )
@@ -0,0 +1,166 @@
+"""
+Persisted state of the last successful sync.
+
+A sync only depends on the pre-commit config file, the locked packages, the plugin configuration, the mapping DB and
+the plugin version. When none of them changed since the last successful sync, there is nothing to do.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from dataclasses import asdict
+from functools import cache
+from importlib import metadata
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, TypeAlias
+
+from sync_pre_commit_lock.db import DEPENDENCY_MAPPING, HOOK_ID_MAPPING, REPOSITORY_ALIASES
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    from sync_pre_commit_lock.actions.sync_hooks import GenericLockedPackage
+    from sync_pre_commit_lock.config import SyncPreCommitLockConfig
+    from sync_pre_commit_lock.pre_commit_config import PreCommitRepo
+
+STATE_VERSION = 1
+"""Bump to invalidate all the stored states when their layout or meaning changes"""
+
+RACY_WINDOW_NS = 2_000_000_000
+"""A file modified this recently may be modified again without its stat data changing (coarse mtime resolution)"""
+
+
+def cache_dir() -> Path:
+    return Path(os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache") / "sync-pre-commit-lock"
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+@cache
+def db_digest() -> str:
+    """Digest of the built-in mapping DB, which only changes with the installed plugin."""
+    return _digest(json.dumps([DEPENDENCY_MAPPING, REPOSITORY_ALIASES, HOOK_ID_MAPPING], sort_keys=True).encode())
+
+
+@cache
+def plugin_version() -> str:
+    """The installed plugin version, as a new version may sync differently. Empty if not installed."""
+    try:
+        return metadata.version("sync-pre-commit-lock")
+    except metadata.PackageNotFoundError:
+        return ""
+
+
+def locked_packages_digest(locked_packages: Mapping[str, GenericLockedPackage]) -> str:
+    digest = hashlib.sha256()
+    for name in sorted(locked_packages):
+        digest.update(f"{name}=={locked_packages[name].version}\n".encode())
+    return digest.hexdigest()
+
+
+def settings_digest(plugin_config: SyncPreCommitLockConfig, python_version: str | None = None) -> str:
+    """Digest of what decides how repos are synced: the plugin version, configuration and DB, and the Python version."""
+    return _digest(
+        json.dumps(
+            [STATE_VERSION, plugin_version(), db_digest(), asdict(plugin_config), python_version],
+            sort_keys=True,
+            default=str,
+        ).encode()
+    )
+
+
+def inputs_digest(locked_packages: Mapping[str, GenericLockedPackage], settings: str) -> str:
+    """Digest of every input of a sync, except the pre-commit config file."""
+    return _digest(f"{settings}:{locked_packages_digest(locked_packages)}".encode())
+
+
+def repo_digest(repo: PreCommitRepo) -> str:
+    return _digest(
+        json.dumps([repo.repo, repo.rev, [[hook.id, *hook.additional_dependencies] for hook in repo.hooks]]).encode()
+    )
+
+
+RepoVersions: TypeAlias = dict[str, str | None]
+"""The locked version (if any) of each package a repo depends on, by canonical name"""
+
+
+class SyncState:
+    """The inputs of the last successful sync of a pre-commit config file, stored in the user cache directory."""
+
+    def __init__(self, path: Path, data: dict[str, Any] | None = None) -> None:
+        self.path = path
+        self.data = data or {}
+
+    @classmethod
+    def load(cls, pre_commit_config_file_path: Path) -> SyncState:
+        path = cache_dir() / f"{_digest(str(pre_commit_config_file_path.resolve()).encode())[:32]}.json"
+        try:
+            data = json.loads(path.read_bytes())
+        except (OSError, ValueError):
+            data = None
+        if not isinstance(data, dict) or data.get("version") != STATE_VERSION:
+            data = None
+        return cls(path, data)
+
+    def previous_repos(self, settings: str) -> dict[str, RepoVersions]:
+        """The packages each in-sync repo depended on at the last sync, by repo digest, if the settings didn't change."""
+        if self.data.get("settings") != settings:
+            return {}
+        return dict(self.data.get("repos", {}))
+
+    def file_digest(self, path: Path) -> str:
+        """Digest of the file contents, reusing the stored digest without reading the file if its stat data matches."""
+        stat = path.stat()
+        stored = self.data.get("file")
+        if stored and stored.get("stat") == [stat.st_size, stat.st_mtime_ns, stat.st_ino]:
+            return str(stored["digest"])
+        return _digest(path.read_bytes())
+
+    def is_up_to_date(self, pre_commit_config_file_path: Path, inputs: str) -> bool:
+        """Whether the last successful sync had the same inputs.
+
+        Raises:
+            OSError: If the pre-commit config file can't be read.
+        """
+        if self.data.get("inputs") != inputs:
+            return False
+        if self.file_digest(pre_commit_config_file_path) != self.data["file"]["digest"]:
+            return False
+        if self.data["file"]["stat"] is None:
+            # Store the stat data now the file is no longer racily clean
+            self.record(pre_commit_config_file_path, inputs, self.data.get("settings", ""), self.data.get("repos", {}))
+        return True
+
+    def record(
+        self, pre_commit_config_file_path: Path, inputs: str, settings: str, repos: Mapping[str, RepoVersions]
+    ) -> None:
+        """Store the inputs of a successful sync. The state is a cache: failing to write it is not an error.
+
+        Args:
+            pre_commit_config_file_path: The synced pre-commit config file.
+            inputs: The digest of the other inputs of the sync.
+            settings: The digest of the plugin configuration and mapping DB.
+            repos: The packages each in-sync repo depends on, by repo digest.
+        """
+        try:
+            stat = pre_commit_config_file_path.stat()
+            file: dict[str, Any] = {"digest": self.file_digest(pre_commit_config_file_path), "stat": None}
+            # Don't trust the stat data of a racily clean file, it will be hashed again on the next run
+            if time.time_ns() - stat.st_mtime_ns > RACY_WINDOW_NS:
+                file["stat"] = [stat.st_size, stat.st_mtime_ns, stat.st_ino]
+            self.data = {
+                "version": STATE_VERSION,
+                "inputs": inputs,
+                "file": file,
+                "settings": settings,
+                "repos": dict(repos),
+            }
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text(json.dumps(self.data))
+        except OSError:
+            pass
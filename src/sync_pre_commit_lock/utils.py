@@ -1,4 +1,10 @@
+from __future__ import annotations
+
+import os
+import stat
+import tempfile
 from os.path import commonprefix
+from pathlib import Path
 from urllib.parse import urlparse, urlunparse
 
 
@@ -50,3 +56,56 @@ def url_diff(old: str, new: str, diff_open: str = "{", diff_separator: str = " -
     suffix = commonprefix((old[::-1], new[::-1]))[::-1]
     old, new = old.removesuffix(suffix), new.removesuffix(suffix)
     return f"{prefix}{diff_open}{old}{diff_separator}{new}{diff_close}{suffix}"
+
+
+def _new_file_mode() -> int:
+    """The mode of a file created by `open`, as temporary files are only readable by their owner."""
+    # The umask can only be read by setting it
+    umask = os.umask(0o022)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+def write_if_changed(path: Path, contents: str, fsync: bool = False) -> bool:
+    """Replace the contents of a text file atomically, unless they are already the same.
+
+    The contents are written to a temporary file next to the target, then renamed over it, so readers never see a
+    partially written file. The file mode is preserved (a new file gets the default mode), and symlinks are followed.
+
+    Args:
+        path: The file to write.
+        contents: The new contents of the file.
+        fsync: Flush the file and its directory to disk before returning.
+
+    Returns:
+        Whether the file was written.
+    """
+    path = path.resolve()
+    try:
+        if path.read_text() == contents:
+            return False
+        mode = stat.S_IMODE(path.stat().st_mode)
+    except FileNotFoundError:
+        mode = _new_file_mode()
+
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    tmp_path = Path(tmp_name)
+    try:
+        with os.fdopen(fd, "w") as stream:
+            stream.write(contents)
+            if fsync:
+                stream.flush()
+                os.fsync(stream.fileno())
+        tmp_path.chmod(mode)
+        tmp_path.replace(path)
+    except BaseException:
+        tmp_path.unlink()
+        raise
+
+    if fsync and os.name == "posix":
+        dir_fd = os.open(path.parent, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+    return True
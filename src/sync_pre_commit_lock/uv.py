@@ -1,29 +1,92 @@
 from __future__ import annotations
 
 import argparse
+import re
 import sys
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 from ._compat import toml
 from .actions.sync_hooks import GenericLockedPackage, SyncPreCommitHooksVersion
 from .config import load_config
+from .groups import filter_locked_packages, uv_reachable_packages
+from .lockfile import LockedVersion, scan_locked_versions
+from .requirements import evaluate_marker, parse_version
 from .shell import ShellPrinter, Verbosity, cyan
+from .state import SyncState
 
+if TYPE_CHECKING:
+    from collections.abc import Container
 
-def load_lock(path: Path | None = None) -> dict[str, GenericLockedPackage]:
+UV_LOCK_HEADER = re.compile(rb"\Aversion = 1\r?\n")
+"""The lock format version supported by the streaming reader"""
+
+
+def load_lock(
+    path: Path | None = None, names: Container[str] | None = None, python_version: str | None = None
+) -> dict[str, GenericLockedPackage]:
+    """Load the locked packages from `uv.lock`, optionally only keeping the given canonical names.
+
+    A package locked in several versions (forked resolution) is selected for a Python version, see `select_version`.
+    """
+    return select_locked_packages(load_lock_versions(path, names), python_version)
+
+
+def load_lock_versions(path: Path | None = None, names: Container[str] | None = None) -> dict[str, list[LockedVersion]]:
+    """Load every locked version of the packages from `uv.lock`, with their resolution markers."""
     path = path or Path("uv.lock")
+    versions = scan_locked_versions(path, UV_LOCK_HEADER.match, names)
+    if versions is None:
+        versions = _load_lock_versions_toml(path, names)
+    return versions
+
+
+def _load_lock_toml(
+    path: Path, names: Container[str] | None = None, python_version: str | None = None
+) -> dict[str, GenericLockedPackage]:
+    return select_locked_packages(_load_lock_versions_toml(path, names), python_version)
+
+
+def _load_lock_versions_toml(path: Path, names: Container[str] | None = None) -> dict[str, list[LockedVersion]]:
     with path.open("rb") as file:
         lock = toml.load(file)
 
-    packages: dict[str, GenericLockedPackage] = {}
+    versions: dict[str, list[LockedVersion]] = {}
 
     for package in lock.get("package", []):
         name = package.get("name")
         version = package.get("version")
-        if name and version:
-            packages[name] = GenericLockedPackage(name=name, version=version)
+        if name and version and (names is None or name in names):
+            versions.setdefault(name, []).append(LockedVersion(version, tuple(package.get("resolution-markers", ()))))
 
-    return packages
+    return versions
+
+
+def select_version(versions: list[LockedVersion], python_version: str | None = None) -> str:
+    """Select the version of a package to sync with.
+
+    The first version whose resolution markers match the Python version (or the current interpreter), else the
+    highest version, so the selection never depends on the order of the lockfile.
+    """
+    if len(versions) == 1:
+        return versions[0].version
+    for locked in versions:
+        if not locked.markers or any(evaluate_marker(marker, python_version) for marker in locked.markers):
+            return locked.version
+    parsed = [(version, locked) for locked in versions if (version := parse_version(locked.version)) is not None]
+    if parsed:
+        return max(parsed, key=lambda item: item[0])[1].version
+    return max(locked.version for locked in versions)
+
+
+def select_locked_packages(
+    versions: dict[str, list[LockedVersion]], python_version: str | None = None
+) -> dict[str, GenericLockedPackage]:
+    """The locked package of each name, selected for a Python version (or the current interpreter)."""
+    return {
+        name: GenericLockedPackage(name=name, version=select_version(locked, python_version))
+        for name, locked in versions.items()
+    }
 
 
 def sync_pre_commit() -> None:
@@ -31,15 +94,31 @@ def sync_pre_commit() -> None:
         description=f"Sync {cyan('.pre-commit-config.yaml')} hooks versions with {cyan('uv.lock')}"
     )
     parser.add_argument("--dry-run", action="store_true", help="Show the difference only and don't perform any action")
+    parser.add_argument(
+        "--full", action="store_true", help="Check every hook, even if nothing changed since the last sync"
+    )
+    parser.add_argument(
+        "--diff", action="store_true", help="Show the changes to the pre-commit config file as a unified diff"
+    )
+    parser.add_argument(
+        "--python",
+        metavar="VERSION",
+        help="Python version to select the locked packages for, when uv.lock has several versions of a package, "
+        "and to evaluate the markers of the additional dependencies (default: the current interpreter)",
+    )
     parser.add_argument("-v", "--verbose", action="store_true", help="Show detailed output")
     parser.add_argument("-q", "--quiet", action="store_true", help="Hide all output except errors")
 
     args = parser.parse_args(sys.argv[1:])
 
-    lock_data = load_lock()
+    lock_data = load_lock(python_version=args.python)
     verbosity = Verbosity.DEBUG if args.verbose else Verbosity.QUIET if args.quiet else Verbosity.NORMAL
     printer = ShellPrinter(with_prefix=False, verbosity=verbosity)
     config = load_config()
+    if groups := config.dependency_groups:
+        lock_data = filter_locked_packages(
+            printer, lock_data, groups, uv_reachable_packages(Path("uv.lock"), groups, UV_LOCK_HEADER.match)
+        )
     file_path = Path().cwd() / config.pre_commit_config_file
     SyncPreCommitHooksVersion(
         printer=printer,
@@ -47,4 +126,8 @@ def sync_pre_commit() -> None:
         locked_packages=lock_data,
         plugin_config=config,
         dry_run=args.dry_run,
+        state=SyncState.load(file_path),
+        full=args.full,
+        diff=args.diff,
+        python_version=args.python,
     ).execute()
@@ -15,3 +15,11 @@ else:
 @pytest.fixture
 def fixtures() -> Path:
     return Path(__file__).parent.joinpath("fixtures")
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> Path:
+    """Don't share the sync state between tests, nor with the user cache."""
+    cache = tmp_path / "cache"
+    monkeypatch.setenv("XDG_CACHE_HOME", str(cache))
+    return cache
@@ -1,16 +1,21 @@
+import sqlite3
+from collections.abc import Mapping
+from contextlib import closing
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import pytest
 
-from sync_pre_commit_lock import Printer
+from sync_pre_commit_lock import Message, Printer, render
 from sync_pre_commit_lock.actions.sync_hooks import (
     GenericLockedPackage,
     SyncPreCommitHooksVersion,
 )
 from sync_pre_commit_lock.config import SyncPreCommitLockConfig
 from sync_pre_commit_lock.db import RepoInfo
+from sync_pre_commit_lock.mapping import _build_mapping_index
 from sync_pre_commit_lock.pre_commit_config import PreCommitHook, PreCommitHookConfig, PreCommitRepo
+from sync_pre_commit_lock.pre_commit_store import EnvironmentEstimate
 
 
 def test_execute_returns_early_when_disabled() -> None:
@@ -54,7 +59,7 @@ def test_execute_returns_early_during_dry_run(mock_analyze_repos: MagicMock, moc
     pre_commit_config = MagicMock(spec=PreCommitHookConfig)
     mock_from_yaml_file.return_value = pre_commit_config
     syncer.mapping_reverse_by_url = {"repo1": "somepkg"}
-    mock_analyze_repos.return_value = {PreCommitRepo("repo1", "rev1"): "rev2"}, {}
+    mock_analyze_repos.return_value = {PreCommitRepo("repo1", "rev1"): PreCommitRepo("repo1", "rev2")}, {}
 
     syncer.execute()
 
@@ -129,13 +134,15 @@ def test_execute_synchronizes_hooks(mock_analyze_repos: MagicMock, mock_from_yam
     pre_commit_config = MagicMock(spec=PreCommitHookConfig)
     mock_from_yaml_file.return_value = pre_commit_config
     syncer.mapping_reverse_by_url = {"repo1": "somepkg"}
-    mock_analyze_repos.return_value = {PreCommitRepo("repo1", "rev1"): "rev2"}, {}
+    mock_analyze_repos.return_value = {PreCommitRepo("repo1", "rev1"): PreCommitRepo("repo1", "rev2")}, {}
 
     syncer.execute()
 
     # Assertions
     mock_analyze_repos.assert_called_once()
-    pre_commit_config.update_pre_commit_repo_versions.assert_called_once_with({PreCommitRepo("repo1", "rev1"): "rev2"})
+    pre_commit_config.update_pre_commit_repo_versions.assert_called_once_with(
+        {PreCommitRepo("repo1", "rev1"): PreCommitRepo("repo1", "rev2")}, fsync=plugin_config.fsync
+    )
     printer.success.assert_called_with("Pre-commit hooks have been updated in .pre-commit-config.yaml!")
 
 
@@ -156,7 +163,8 @@ def test_execute_synchronizes_hooks_no_match(mock_analyze_repos: MagicMock, mock
         plugin_config=plugin_config,
         dry_run=dry_run,
     )
-    syncer.mapping = {}
+    plugin_config.dependency_mapping = {}
+    plugin_config.repository_aliases = {}
 
     # Mocks
     pre_commit_config = MagicMock(spec=PreCommitHookConfig)
@@ -184,13 +192,43 @@ def test_get_pre_commit_repo_new_version() -> None:
         plugin_config=plugin_config,
     )
     pre_commit_config_repo = PreCommitRepo("repo_url", "1.2.3")
-    syncer.mapping = {"lib-name": {"repo": "repo_url", "rev": "${rev}"}}
+    plugin_config.dependency_mapping = {"lib-name": {"repo": "repo_url", "rev": "${rev}"}}
+    plugin_config.repository_aliases = {}
 
     new_version = syncer.get_pre_commit_repo_new_version(pre_commit_config_repo)
 
     assert new_version == "2.0.0"
 
 
+@pytest.mark.parametrize(
+    "template,rev,locked,expected",
+    [
+        ("v${rev}", "v1.0", "1.0.0", None),
+        ("${rev}", "1.0.0rc1", "1.0.0-rc.1", None),
+        ("v${rev}", "v1.0", "1.0.1", "v1.0.1"),
+        ("${rev}", "v1.0.0", "1.0.0", "1.0.0"),
+        ("v${rev|truncate:2}", "v1.2", "1.2.5", None),
+        ("v${rev|truncate:2}", "v1.2", "1.3.0", "v1.3"),
+        ("${rev|unknown}", "1.0.0", "1.1.0", None),
+    ],
+)
+def test_get_pre_commit_repo_new_version_semantic_match(
+    template: str, rev: str, locked: str, expected: str | None
+) -> None:
+    plugin_config = MagicMock(spec=SyncPreCommitLockConfig)
+    plugin_config.ignore = []
+    plugin_config.dependency_mapping = {"lib-name": {"repo": "repo_url", "rev": template}}
+    plugin_config.repository_aliases = {}
+    syncer = SyncPreCommitHooksVersion(
+        printer=MagicMock(spec=Printer),
+        pre_commit_config_file_path=MagicMock(spec=Path),
+        locked_packages={"lib-name": GenericLockedPackage("lib-name", locked)},
+        plugin_config=plugin_config,
+    )
+
+    assert syncer.get_pre_commit_repo_new_version(PreCommitRepo("repo_url", rev)) == expected
+
+
 @patch.object(SyncPreCommitHooksVersion, "get_pre_commit_repo_new_version")
 def test_analyze_repos(mock_get_pre_commit_repo_new_version: MagicMock) -> None:
     printer = MagicMock(spec=Printer)
@@ -206,7 +244,8 @@ def test_analyze_repos(mock_get_pre_commit_repo_new_version: MagicMock) -> None:
     )
     mock_get_pre_commit_repo_new_version.return_value = "2.0.0"
     pre_commit_repos = {PreCommitRepo("https://repo_url", "1.2.3")}
-    syncer.mapping = {"lib-name": {"repo": "https://repo_url", "rev": "${rev}"}}
+    plugin_config.dependency_mapping = {"lib-name": {"repo": "https://repo_url", "rev": "${rev}"}}
+    plugin_config.repository_aliases = {}
     syncer.mapping_reverse_by_url = {"https://repo_url": "lib-name"}
 
     to_fix, _ = syncer.analyze_repos(pre_commit_repos)
@@ -227,6 +266,7 @@ def test_build_mapping() -> None:
         plugin_config=plugin_config,
     )
     plugin_config.dependency_mapping = {"new_lib": {"repo": "new_repo_url", "rev": "${rev}"}}
+    plugin_config.repository_aliases = {}
 
     assert "new_lib" in syncer.mapping
     assert syncer.mapping["new_lib"]["repo"] == "new_repo_url"
@@ -247,7 +287,8 @@ def test_get_pre_commit_repo_new_version_ignored() -> None:
         locked_packages=locked_packages,
         plugin_config=plugin_config,
     )
-    syncer.mapping = {"lib-name": RepoInfo(repo="repo_url", rev="${rev}")}
+    plugin_config.dependency_mapping = {"lib-name": RepoInfo(repo="repo_url", rev="${rev}")}
+    plugin_config.repository_aliases = {}
 
     pre_commit_config_repo = PreCommitRepo("repo_url", "1.2.3")
 
@@ -271,7 +312,8 @@ def test_get_pre_commit_repo_new_version_version_match() -> None:
     )
 
     pre_commit_config_repo = PreCommitRepo("repo_url", "1.2.3")
-    syncer.mapping = {"lib-name": RepoInfo(repo="repo_url", rev="${rev}")}
+    plugin_config.dependency_mapping = {"lib-name": RepoInfo(repo="repo_url", rev="${rev}")}
+    plugin_config.repository_aliases = {}
 
     new_version = syncer.get_pre_commit_repo_new_version(pre_commit_config_repo)
 
@@ -320,7 +362,8 @@ def test_analyze_repos_repo_not_in_mapping() -> None:
     )
 
     pre_commit_repos = {PreCommitRepo("repo_url", "1.2.3")}
-    syncer.mapping = {}
+    plugin_config.dependency_mapping = {}
+    plugin_config.repository_aliases = {}
 
     result, _ = syncer.analyze_repos(pre_commit_repos)
 
@@ -341,7 +384,8 @@ def test_analyze_repos_dependency_not_locked() -> None:
     )
 
     pre_commit_repos = {PreCommitRepo("repo_url", "1.2.3")}
-    syncer.mapping = {"lib-name": {"repo": "repo_url", "rev": "${rev}"}}
+    plugin_config.dependency_mapping = {"lib-name": {"repo": "repo_url", "rev": "${rev}"}}
+    plugin_config.repository_aliases = {}
 
     result, _ = syncer.analyze_repos(pre_commit_repos)
 
@@ -363,7 +407,8 @@ def test_analyze_repos_no_new_version() -> None:
     )
 
     pre_commit_repos = {PreCommitRepo("repo_url", "1.2.3")}
-    syncer.mapping = {"lib-name": RepoInfo(repo="repo_url", rev="${rev}")}
+    plugin_config.dependency_mapping = {"lib-name": RepoInfo(repo="repo_url", rev="${rev}")}
+    plugin_config.repository_aliases = {}
 
     result, _ = syncer.analyze_repos(pre_commit_repos)
 
@@ -385,7 +430,8 @@ def test_analyze_repos_local() -> None:
     )
 
     pre_commit_repos = {PreCommitRepo("repo_url", "1.2.3")}
-    syncer.mapping = {"lib-name": RepoInfo(repo="repo_url", rev="${rev}")}
+    plugin_config.dependency_mapping = {"lib-name": RepoInfo(repo="repo_url", rev="${rev}")}
+    plugin_config.repository_aliases = {}
 
     result, _ = syncer.analyze_repos(pre_commit_repos)
 
@@ -406,7 +452,8 @@ def test_analyze_repos_additional_dependencies() -> None:
     )
     pre_commit_repo = PreCommitRepo("https://repo_url", "1.2.3", [PreCommitHook("hook", ["lib-name==1.2.2"])])
     pre_commit_repos = {pre_commit_repo}
-    syncer.mapping = {"lib-name": {"repo": "https://repo_url", "rev": "${rev}"}}
+    plugin_config.dependency_mapping = {"lib-name": {"repo": "https://repo_url", "rev": "${rev}"}}
+    plugin_config.repository_aliases = {}
 
     to_fix, _ = syncer.analyze_repos(pre_commit_repos)
 
@@ -431,13 +478,14 @@ def test_analyze_repos_additional_dependencies_preserve_extras() -> None:
         "https://repo_url", "1.2.3", [PreCommitHook("hook", ["lib-name[with,extras]==1.2.2"])]
     )
     pre_commit_repos = {pre_commit_repo}
-    syncer.mapping = {"lib-name": {"repo": "https://repo_url", "rev": "${rev}"}}
+    plugin_config.dependency_mapping = {"lib-name": {"repo": "https://repo_url", "rev": "${rev}"}}
+    plugin_config.repository_aliases = {}
 
     to_fix, _ = syncer.analyze_repos(pre_commit_repos)
 
     assert to_fix == {
         pre_commit_repo: PreCommitRepo(
-            "https://repo_url", "2.0.0", [PreCommitHook("hook", ["lib-name[extras,with]==2.0.0"])]
+            "https://repo_url", "2.0.0", [PreCommitHook("hook", ["lib-name[with,extras]==2.0.0"])]
         )
     }
 
@@ -456,7 +504,8 @@ def test_analyze_repos_not_in_lock_but_additional_dependencies() -> None:
     )
     pre_commit_repo = PreCommitRepo("https://repo_url", "1.2.3", [PreCommitHook("hook", ["lib-name==1.2.2"])])
     pre_commit_repos = {pre_commit_repo}
-    syncer.mapping = {"not_lib": {"repo": "https://repo_url", "rev": "${rev}"}}
+    plugin_config.dependency_mapping = {"not_lib": {"repo": "https://repo_url", "rev": "${rev}"}}
+    plugin_config.repository_aliases = {}
 
     to_fix, _ = syncer.analyze_repos(pre_commit_repos)
 
@@ -482,7 +531,8 @@ def test_analyze_repos_local_but_additional_dependencies() -> None:
     )
     pre_commit_repo = PreCommitRepo("https://repo_url", "1.2.3", [PreCommitHook("hook", ["lib-name==1.2.2"])])
     pre_commit_repos = {pre_commit_repo}
-    syncer.mapping = {"local_lib": {"repo": "https://repo_url", "rev": "${rev}"}}
+    plugin_config.dependency_mapping = {"local_lib": {"repo": "https://repo_url", "rev": "${rev}"}}
+    plugin_config.repository_aliases = {}
 
     to_fix, _ = syncer.analyze_repos(pre_commit_repos)
 
@@ -495,8 +545,18 @@ MOCK_DEP_MAPPING = {"dep": {"repo": "https://some.place", "rev": "${dev}"}}
 MOCK_REPO_ALIASES = {"https://some.place": ("https://some.old.place",)}
 
 
-@patch("sync_pre_commit_lock.actions.sync_hooks.DEPENDENCY_MAPPING", MOCK_DEP_MAPPING)
-@patch("sync_pre_commit_lock.actions.sync_hooks.REPOSITORY_ALIASES", MOCK_REPO_ALIASES)
+@pytest.fixture
+def mock_db():
+    with (
+        patch("sync_pre_commit_lock.mapping.DEPENDENCY_MAPPING", MOCK_DEP_MAPPING),
+        patch("sync_pre_commit_lock.mapping.REPOSITORY_ALIASES", MOCK_REPO_ALIASES),
+    ):
+        _build_mapping_index.cache_clear()
+        yield
+    _build_mapping_index.cache_clear()
+
+
+@pytest.mark.usefixtures("mock_db")
 def test_analyze_repos_renamed() -> None:
     printer = MagicMock(spec=Printer)
     pre_commit_config_file_path = MagicMock(spec=Path)
@@ -517,8 +577,7 @@ def test_analyze_repos_renamed() -> None:
     assert to_fix == {pre_commit_repo: PreCommitRepo("https://some.place", "1.2.3")}
 
 
-@patch("sync_pre_commit_lock.actions.sync_hooks.DEPENDENCY_MAPPING", MOCK_DEP_MAPPING)
-@patch("sync_pre_commit_lock.actions.sync_hooks.REPOSITORY_ALIASES", MOCK_REPO_ALIASES)
+@pytest.mark.usefixtures("mock_db")
 def test_analyze_repos_already_last_url() -> None:
     printer = MagicMock(spec=Printer)
     pre_commit_config_file_path = MagicMock(spec=Path)
@@ -537,3 +596,265 @@ def test_analyze_repos_already_last_url() -> None:
     to_fix, _ = syncer.analyze_repos(pre_commit_repos)
 
     assert to_fix == {}
+
+
+def test_analyze_repos_resolves_shared_dependencies_once() -> None:
+    printer = MagicMock(spec=Printer)
+    locked_packages = {
+        "mypy": GenericLockedPackage("mypy", "1.0.0"),
+        "types-requests": GenericLockedPackage("types-requests", "2.0.0"),
+    }
+    syncer = SyncPreCommitHooksVersion(printer, MagicMock(spec=Path), locked_packages, SyncPreCommitLockConfig())
+    mypy = PreCommitRepo(
+        "https://github.com/pre-commit/mirrors-mypy",
+        "v1.0.0",
+        [PreCommitHook("mypy", ["types-requests==1.0.0"]), PreCommitHook("mypy-strict", ["types-requests==1.0.0"])],
+    )
+    pyright = PreCommitRepo("https://github.com/example/pyright", "v1.0.0", [PreCommitHook("pyright")])
+
+    with patch.object(
+        syncer, "get_pre_commit_repo_hook_new_dependency", wraps=syncer.get_pre_commit_repo_hook_new_dependency
+    ) as resolve:
+        to_fix, _ = syncer.analyze_repos({mypy, pyright})
+
+    resolve.assert_called_once_with("types-requests==1.0.0")
+    assert to_fix == {
+        mypy: PreCommitRepo(
+            "https://github.com/pre-commit/mirrors-mypy",
+            "v1.0.0",
+            [PreCommitHook("mypy", ["types-requests==2.0.0"]), PreCommitHook("mypy-strict", ["types-requests==2.0.0"])],
+        )
+    }
+    timing = printer.debug.call_args_list[-1].args[0]()
+    assert timing.startswith("Analyzed 1 of 2 pre-commit repos in ")
+    assert "Resolving 1 distinct additional dependencies" in timing
+
+
+@pytest.mark.parametrize(
+    ("policy", "dependency", "expected"),
+    [
+        ("pin", "lib-name>=1.0", "lib-name==2.0.0"),
+        ("pin", "lib-name==1.0", "lib-name==2.0.0"),
+        ("keep-if-satisfied", "lib-name>=1.0", "lib-name>=1.0"),
+        ("keep-if-satisfied", "lib-name", "lib-name"),
+        ("keep-if-satisfied", "lib-name==1.0", "lib-name==2.0.0"),
+        ("keep-if-satisfied", "lib-name[extra]<2", "lib-name[extra]==2.0.0"),
+        ("floor", "lib-name>=1.0,<3", "lib-name>=1.0,<3"),
+        ("floor", "lib-name==1.0", "lib-name>=2.0.0"),
+        ("floor", "lib-name<2 ; python_version >= '3'", "lib-name>=2.0.0 ; python_version >= '3'"),
+        ("unknown", "lib-name>=1.0", "lib-name==2.0.0"),
+    ],
+)
+def test_get_pre_commit_repo_hook_new_dependency_policy(policy: str, dependency: str, expected: str) -> None:
+    syncer = SyncPreCommitHooksVersion(
+        printer=MagicMock(spec=Printer),
+        pre_commit_config_file_path=MagicMock(spec=Path),
+        locked_packages={"lib-name": GenericLockedPackage("lib-name", "2.0.0")},
+        plugin_config=SyncPreCommitLockConfig(dependency_update_policy=policy),  # type: ignore[arg-type]
+    )
+
+    assert syncer.get_pre_commit_repo_hook_new_dependency(dependency) == expected
+
+
+@pytest.mark.parametrize(
+    ("python_version", "expected"),
+    [
+        ("3.9", "lib-name[b,a]  ==2.0.0; python_version < '3.11'"),
+        ("3.12.1", "lib-name[b,a]  ==1.0; python_version < '3.11'"),
+    ],
+)
+def test_get_pre_commit_repo_hook_new_dependency_markers(python_version: str, expected: str) -> None:
+    printer = MagicMock(spec=Printer)
+    syncer = SyncPreCommitHooksVersion(
+        printer=printer,
+        pre_commit_config_file_path=MagicMock(spec=Path),
+        locked_packages={"lib-name": GenericLockedPackage("lib-name", "2.0.0")},
+        plugin_config=SyncPreCommitLockConfig(),
+        python_version=python_version,
+    )
+
+    assert syncer.get_pre_commit_repo_hook_new_dependency("lib-name[b,a]  ==1.0; python_version < '3.11'") == expected
+    assert syncer.get_pre_commit_repo_hook_new_dependency("lib-name==1.0; dependency_groups == 'x'") == (
+        "lib-name==2.0.0; dependency_groups == 'x'"
+    )
+
+
+def test_settings_digest_depends_on_the_python_version() -> None:
+    syncers = [
+        SyncPreCommitHooksVersion(
+            printer=MagicMock(spec=Printer),
+            pre_commit_config_file_path=MagicMock(spec=Path),
+            locked_packages={},
+            plugin_config=SyncPreCommitLockConfig(),
+            python_version=python_version,
+        )
+        for python_version in ("3.9", "3.12", None)
+    ]
+
+    assert len({syncer.settings_digest for syncer in syncers}) == 3
+
+
+def test_analyze_repos_counts_avoided_rebuilds() -> None:
+    printer = MagicMock(spec=Printer)
+    locked_packages = {
+        "mypy": GenericLockedPackage("mypy", "1.0.0"),
+        "types-requests": GenericLockedPackage("types-requests", "2.0.0"),
+        "types-pyyaml": GenericLockedPackage("types-pyyaml", "6.0.0"),
+    }
+    syncer = SyncPreCommitHooksVersion(
+        printer,
+        MagicMock(spec=Path),
+        locked_packages,
+        SyncPreCommitLockConfig(dependency_update_policy="keep-if-satisfied"),
+    )
+    mypy = PreCommitRepo(
+        "https://github.com/pre-commit/mirrors-mypy",
+        "v1.0.0",
+        [
+            PreCommitHook("mypy", ["types-requests>=2"]),
+            PreCommitHook("mypy-strict", ["types-requests>=2", "types-pyyaml==5.0"]),
+        ],
+    )
+
+    to_fix, _ = syncer.analyze_repos({mypy})
+
+    assert to_fix[mypy].hooks == (
+        PreCommitHook("mypy", ["types-requests>=2"]),
+        PreCommitHook("mypy-strict", ["types-requests>=2", "types-pyyaml==6.0.0"]),
+    )
+    assert syncer.kept_dependencies == {"types-requests>=2"}
+    assert syncer.avoided_rebuilds == 1
+
+
+@pytest.mark.parametrize(
+    ("policy", "dependency", "expected"),
+    [
+        ("allow", "lib-name==3.0", "lib-name==2.0.0"),
+        ("warn", "lib-name==3.0", "lib-name==2.0.0"),
+        ("refuse", "lib-name==3.0", "lib-name==3.0"),
+        ("refuse", "lib-name>=2.1,<3", "lib-name>=2.1,<3"),
+        ("refuse", "lib-name==1.0", "lib-name==2.0.0"),
+        ("refuse", "lib-name<3", "lib-name==2.0.0"),
+        ("refuse", "lib-name==2.0", "lib-name==2.0.0"),
+    ],
+)
+def test_get_pre_commit_repo_hook_new_dependency_downgrade(policy: str, dependency: str, expected: str) -> None:
+    printer = MagicMock(spec=Printer)
+    syncer = SyncPreCommitHooksVersion(
+        printer=printer,
+        pre_commit_config_file_path=MagicMock(spec=Path),
+        locked_packages={"lib-name": GenericLockedPackage("lib-name", "2.0.0")},
+        plugin_config=SyncPreCommitLockConfig(downgrade_policy=policy),  # type: ignore[arg-type]
+    )
+
+    assert syncer.get_pre_commit_repo_hook_new_dependency(dependency) == expected
+    assert printer.warning.called == (policy == "warn")
+    assert bool(syncer.refused_downgrades) == (policy == "refuse" and dependency == expected)
+
+
+@pytest.mark.parametrize(("policy", "expected"), [("allow", "v1.0.0"), ("warn", "v1.0.0"), ("refuse", None)])
+def test_get_pre_commit_repo_new_version_downgrade(policy: str, expected: str | None) -> None:
+    printer = MagicMock(spec=Printer)
+    syncer = SyncPreCommitHooksVersion(
+        printer=printer,
+        pre_commit_config_file_path=MagicMock(spec=Path),
+        locked_packages={"lib-name": GenericLockedPackage("lib-name", "1.0.0")},
+        plugin_config=SyncPreCommitLockConfig(
+            downgrade_policy=policy,  # type: ignore[arg-type]
+            dependency_mapping={"lib-name": {"repo": "repo_url", "rev": "v${rev}"}},
+        ),
+    )
+
+    assert syncer.get_pre_commit_repo_new_version(PreCommitRepo("repo_url", "v1.2.0")) == expected
+    assert printer.warning.called == (policy == "warn")
+    assert syncer.refused_downgrades == (["repo_url (1.2.0 -> 1.0.0)"] if policy == "refuse" else [])
+
+
+def test_execute_reports_refused_downgrades(tmp_path: Path) -> None:
+    config_file = tmp_path / ".pre-commit-config.yaml"
+    content = "repos:\n  - repo: https://github.com/astral-sh/ruff-pre-commit\n    rev: v0.5.0\n"
+    config_file.write_text(content)
+    printer = MagicMock(spec=Printer)
+
+    SyncPreCommitHooksVersion(
+        printer,
+        config_file,
+        {"ruff": GenericLockedPackage("ruff", "0.4.0")},
+        SyncPreCommitLockConfig(downgrade_policy="refuse"),
+    ).execute()
+
+    assert config_file.read_text() == content
+    printer.warning.assert_called_once_with(
+        "Refused 1 downgrades to the locked versions (refuse policy): "
+        "https://github.com/astral-sh/ruff-pre-commit (0.5.0 -> 0.4.0)"
+    )
+
+
+class MinimalPrinter(Printer):
+    """A printer only implementing the abstract methods, without `print_diff`."""
+
+    def __init__(self) -> None:
+        self.lines: list[str] = []
+
+    def debug(self, msg: Message) -> None:
+        self.lines.append(render(msg))
+
+    info = warning = error = success = debug
+
+    def list_updated_packages(
+        self,
+        packages: dict[str, tuple[PreCommitRepo, PreCommitRepo]],
+        environments: Mapping[str, EnvironmentEstimate] | None = None,
+    ) -> None:
+        self.lines.extend(
+            f"{package}: {old.rev} -> {new.rev} {(environments or {})[package].describe()}"
+            for package, (old, new) in packages.items()
+        )
+
+
+def test_execute_with_minimal_printer(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("PRE_COMMIT_HOME", str(tmp_path / "store"))
+    config_file = tmp_path / ".pre-commit-config.yaml"
+    config_file.write_text(
+        "repos:\n  - repo: https://github.com/psf/black-pre-commit-mirror\n    rev: 23.1.0\n    hooks:\n      - id: black\n"
+    )
+    printer = MinimalPrinter()
+
+    SyncPreCommitHooksVersion(
+        printer,
+        config_file,
+        {"black": GenericLockedPackage("black", "24.1.0")},
+        SyncPreCommitLockConfig(),
+        dry_run=True,
+        diff=True,
+    ).execute()
+
+    assert "black: 23.1.0 -> 24.1.0 (1 new hook environments, 1 to build)" in printer.lines
+    assert "+    rev: 24.1.0" in printer.lines
+    assert not any(line.startswith("<function") for line in printer.lines)
+
+
+def test_execute_estimates_environments_with_the_repo_as_written(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    repo = "https://github.com/psf/black-pre-commit-mirror.git"
+    store = tmp_path / "store"
+    (store / "repoabc" / "py_env-python3").mkdir(parents=True)
+    (store / "repoabc" / "py_env-python3" / ".install_state_v1").write_text("{}")
+    with closing(sqlite3.connect(store / "db.db")) as db, db:
+        db.execute("CREATE TABLE repos (repo TEXT NOT NULL, ref TEXT NOT NULL, path TEXT NOT NULL)")
+        db.execute("INSERT INTO repos VALUES (?, ?, ?)", (repo, "24.1.0", str(store / "repoabc")))
+    monkeypatch.setenv("PRE_COMMIT_HOME", str(store))
+    config_file = tmp_path / ".pre-commit-config.yaml"
+    config_file.write_text(f"repos:\n  - repo: {repo}\n    rev: 23.1.0\n    hooks:\n      - id: black\n")
+    printer = MinimalPrinter()
+
+    SyncPreCommitHooksVersion(
+        printer,
+        config_file,
+        {"black": GenericLockedPackage("black", "24.1.0")},
+        SyncPreCommitLockConfig(),
+        dry_run=True,
+    ).execute()
+
+    assert "black: 23.1.0 -> 24.1.0 (1 new hook environments, 0 to build)" in printer.lines
@@ -12,12 +12,14 @@ def test_from_toml() -> None:
         "ignore": ["a", "b"],
         "pre-commit-config-file": ".test-config.yaml",
         "dependency-mapping": {"pytest": {"repo": "pytest", "rev": "${ver}"}},
+        "repository-aliases": {"https://github.com/pytest-dev/pytest": ["https://git.internal/pytest"]},
     }
     expected_config = SyncPreCommitLockConfig(
         disable_sync_from_lock=True,
         ignore=["a", "b"],
         pre_commit_config_file=".test-config.yaml",
         dependency_mapping={"pytest": RepoInfo(repo="pytest", rev="${ver}")},
+        repository_aliases={"https://github.com/pytest-dev/pytest": ["https://git.internal/pytest"]},
     )
 
     actual_config = from_toml(data)
@@ -30,12 +32,25 @@ def test_update_from_env(monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.setenv("SYNC_PRE_COMMIT_LOCK_INSTALL", "false")
     monkeypatch.setenv("SYNC_PRE_COMMIT_LOCK_IGNORE", "a, b")
     monkeypatch.setenv("SYNC_PRE_COMMIT_LOCK_PRE_COMMIT_FILE", ".test-config.yaml")
+    monkeypatch.setenv("SYNC_PRE_COMMIT_LOCK_FSYNC", "true")
+    monkeypatch.setenv("SYNC_PRE_COMMIT_LOCK_DEPENDENCY_GROUPS", "dev, lint")
+    monkeypatch.setenv("SYNC_PRE_COMMIT_LOCK_DEPENDENCY_UPDATE_POLICY", "floor")
+    monkeypatch.setenv("SYNC_PRE_COMMIT_LOCK_DOWNGRADE_POLICY", "refuse")
+    monkeypatch.setenv(
+        "SYNC_PRE_COMMIT_LOCK_REPOSITORY_ALIASES",
+        "https://github.com/a/a=https://git.internal/a, https://github.com/a/a=https://git.internal/b,invalid",
+    )
     expected_config = SyncPreCommitLockConfig(
         automatically_install_hooks=False,
         disable_sync_from_lock=True,
         ignore=["a", "b"],
         pre_commit_config_file=".test-config.yaml",
+        fsync=True,
+        dependency_groups=["dev", "lint"],
+        dependency_update_policy="floor",
+        downgrade_policy="refuse",
         dependency_mapping={},
+        repository_aliases={"https://github.com/a/a": ["https://git.internal/a", "https://git.internal/b"]},
     )
 
     actual_config = update_from_env(SyncPreCommitLockConfig())
@@ -0,0 +1,62 @@
+import difflib
+
+import pytest
+
+from sync_pre_commit_lock.edit_plan import Edit, EditPlan, split_lines
+from sync_pre_commit_lock.scanner import Span
+
+LINES = [f"line {idx} value {idx}\n" for idx in range(30)]
+
+
+def edit(line: int, value: str) -> Edit:
+    """Replace the value at the end of a line of `LINES`"""
+    column = LINES[line].index("value ") + len("value ")
+    return Edit(Span(line, column, len(str(line))), value)
+
+
+@pytest.mark.parametrize(
+    "edits",
+    [
+        pytest.param([edit(0, "new")], id="first-line"),
+        pytest.param([edit(29, "new")], id="last-line"),
+        pytest.param([edit(10, "new")], id="middle"),
+        pytest.param([edit(10, "new"), edit(11, "new"), edit(12, "new")], id="consecutive"),
+        pytest.param([edit(10, "new"), edit(16, "new")], id="merged-hunks"),
+        pytest.param([edit(10, "new"), edit(17, "new")], id="split-hunks"),
+        pytest.param([edit(2, "a"), edit(15, "b"), edit(27, "c")], id="several-hunks"),
+    ],
+)
+@pytest.mark.parametrize("n", [0, 1, 3])
+def test_unified_diff_matches_difflib(edits: list[Edit], n: int) -> None:
+    plan = EditPlan(LINES, edits)
+
+    assert list(plan.unified_diff("a/file", "b/file", n=n)) == list(
+        difflib.unified_diff(LINES, plan.apply(), "a/file", "b/file", n=n)
+    )
+    assert plan.change_count == len(edits)
+
+
+def test_edits_on_the_same_line() -> None:
+    plan = EditPlan(["deps: [a==1, b==2]\n"], [Edit(Span(0, 13, 4), "b==3"), Edit(Span(0, 7, 4), "a==10")])
+
+    assert plan.apply() == ["deps: [a==10, b==3]\n"]
+    assert plan.change_count == 1
+
+
+def test_no_op_edits() -> None:
+    plan = EditPlan(LINES, [edit(3, "3")])
+
+    assert plan.change_count == 0
+    assert plan.apply() == LINES
+    assert list(plan.unified_diff()) == []
+
+
+@pytest.mark.parametrize(
+    "text",
+    ["", "a\n", "a", "a\nb", "a\r\nb\r\n", "a\x0cb\n\n"],
+)
+def test_split_lines(text: str) -> None:
+    lines = split_lines(text)
+
+    assert "".join(lines) == text
+    assert len(lines) == len(text.split("\n")) - (text.endswith("\n") or not text)
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import re
+from typing import TYPE_CHECKING
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from sync_pre_commit_lock import Printer
+from sync_pre_commit_lock.actions.sync_hooks import GenericLockedPackage
+from sync_pre_commit_lock.groups import (
+    filter_locked_packages,
+    pdm_group_packages,
+    resolution_group_packages,
+    uv_reachable_packages,
+)
+from sync_pre_commit_lock.uv import UV_LOCK_HEADER
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+PDM_LOCK = """\
+[metadata]
+groups = ["default", "lint"]
+strategy = ["inherit_metadata"]
+lock_version = "4.5.0"
+
+[[package]]
+name = "PyYAML"
+version = "6.0.1"
+groups = ["default"]
+
+[[package]]
+name = "ruff"
+version = "0.6.7"
+groups = ["lint"]
+"""
+PDM_LOCK_HEADER = re.compile(rb'^lock_version = "4\.', re.MULTILINE).search
+
+
+@pytest.fixture
+def uv_lock(fixtures: Path) -> Path:
+    return fixtures / "uv_project" / "uv.lock"
+
+
+def test_uv_reachable_packages_dev(uv_lock: Path) -> None:
+    reachable = uv_reachable_packages(uv_lock, ["dev"], UV_LOCK_HEADER.match)
+
+    assert reachable is not None
+    assert {"ruff", "mypy", "pytest", "pluggy", "mypy-extensions"} <= reachable
+    assert "pdm" not in reachable
+    assert "strictyaml" not in reachable
+
+
+def test_uv_reachable_packages_groups(uv_lock: Path) -> None:
+    default = uv_reachable_packages(uv_lock, ["default"], UV_LOCK_HEADER.match)
+    pdm = uv_reachable_packages(uv_lock, ["pdm"], UV_LOCK_HEADER.match)
+
+    assert default is not None
+    assert {"packaging", "strictyaml", "python-dateutil"} <= default
+    assert "ruff" not in default
+    assert pdm is not None
+    assert {"pdm", "httpx", "socksio"} <= pdm  # `socksio` is only required by the `socks` extra of `httpx`
+    assert uv_reachable_packages(uv_lock, ["unknown"], UV_LOCK_HEADER.match) == frozenset()
+
+
+@pytest.mark.parametrize("groups", [["default"], ["dev"], ["pdm", "testtox"]])
+def test_uv_reachable_packages_scan_matches_toml(uv_lock: Path, groups: list[str]) -> None:
+    scanned = uv_reachable_packages(uv_lock, groups, UV_LOCK_HEADER.match)
+
+    with patch("sync_pre_commit_lock.groups.scan_lock_tables", return_value=None) as scan:
+        assert uv_reachable_packages(uv_lock, groups, UV_LOCK_HEADER.match) == scanned
+    scan.assert_called_once()
+
+
+def test_uv_reachable_packages_does_not_parse_toml(uv_lock: Path) -> None:
+    with patch("sync_pre_commit_lock.groups.toml.loads") as loads:
+        assert uv_reachable_packages(uv_lock, ["dev"], UV_LOCK_HEADER.match)
+    loads.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "content",
+    ["not toml [", 'version = 1\n\n[[package]]\nname = "ruff"\nversion = "0.6.7"\n'],
+    ids=["invalid", "no-project"],
+)
+def test_uv_reachable_packages_unknown(tmp_path: Path, content: str) -> None:
+    lock = tmp_path / "uv.lock"
+    lock.write_text(content)
+
+    assert uv_reachable_packages(lock, ["dev"], UV_LOCK_HEADER.match) is None
+    assert uv_reachable_packages(tmp_path / "missing.lock", ["dev"], UV_LOCK_HEADER.match) is None
+
+
+def test_pdm_group_packages(tmp_path: Path) -> None:
+    lock = tmp_path / "pdm.lock"
+    lock.write_text(PDM_LOCK)
+
+    assert pdm_group_packages(lock, ["lint"], PDM_LOCK_HEADER) == {"ruff"}
+    assert pdm_group_packages(lock, ["default", "lint"], PDM_LOCK_HEADER) == {"pyyaml", "ruff"}
+    # Unsupported by the streaming reader, parsed as TOML
+    lock.write_text(PDM_LOCK.replace('lock_version = "4.5.0"', 'lock_version = "5.0"'))
+    assert pdm_group_packages(lock, ["lint"], PDM_LOCK_HEADER) == {"ruff"}
+
+    lock.write_text(PDM_LOCK.replace('groups = ["lint"]\n', ""))
+    assert pdm_group_packages(lock, ["lint"], PDM_LOCK_HEADER) is None
+    assert pdm_group_packages(tmp_path / "missing.lock", ["lint"], PDM_LOCK_HEADER) is None
+
+
+def test_resolution_group_packages() -> None:
+    candidates = [("PyYAML", ["default"]), ("ruff", ["default", "lint"])]
+
+    assert resolution_group_packages(candidates, ["lint"]) == {"ruff"}
+    assert resolution_group_packages([*candidates, ("mypy", [])], ["lint"]) is None
+    assert resolution_group_packages([], ["lint"]) is None
+
+
+def test_filter_locked_packages() -> None:
+    printer = MagicMock(spec=Printer)
+    locked = {"ruff": GenericLockedPackage("ruff", "0.6.7"), "pyyaml": GenericLockedPackage("PyYAML", "6.0.1")}
+
+    assert filter_locked_packages(printer, locked, ["lint"], frozenset({"ruff"})) == {"ruff": locked["ruff"]}
+    printer.warning.assert_not_called()
+
+    assert filter_locked_packages(printer, locked, ["lint"], None) == locked
+    printer.warning.assert_called_once()
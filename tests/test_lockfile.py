@@ -0,0 +1,150 @@
+import re
+from pathlib import Path
+
+import pytest
+
+from sync_pre_commit_lock.actions.sync_hooks import GenericLockedPackage
+from sync_pre_commit_lock.lockfile import LockedVersion, scan_lock_tables, scan_locked_packages, scan_locked_versions
+
+HEADER = re.compile(rb"^lock_version = \"4", re.MULTILINE)
+
+
+@pytest.fixture
+def lockfile(tmp_path: Path) -> Path:
+    return tmp_path / "test.lock"
+
+
+def test_scan_locked_packages(lockfile: Path) -> None:
+    lockfile.write_text(
+        """\
+[metadata]
+lock_version = "4.5.0"
+
+[[package]]
+name = "PyYAML"
+version = "6.0.1"
+summary = "[[package]]"
+files = [
+    {file = "pyyaml.tar.gz", hash = "sha256:bfdf460b1736c775f2ba9f6a92bca30bc2095067b8a9d77876d1fad6cc3b4a43"},
+]
+
+[[package]]
+name = "dynamic"
+source = { editable = "." }
+"""
+    )
+
+    assert scan_locked_packages(lockfile, HEADER.search) == {"pyyaml": GenericLockedPackage("pyyaml", "6.0.1")}
+    assert scan_locked_packages(lockfile, HEADER.search, names={"ruff"}) == {}
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        pytest.param("", id="empty"),
+        pytest.param('lock_version = "3.0"\n\n[[package]]\nname = "ruff"\nversion = "1.0"\n', id="unknown-version"),
+        pytest.param('lock_version = "4.0"\n\n[[package]]\nversion = "1.0"\nname = "ruff"\n', id="unordered-keys"),
+        pytest.param('lock_version = "4.0"\n\n[[package]]\nname = "r\\u0075ff"\nversion = "1.0"\n', id="escapes"),
+        pytest.param(
+            'lock_version = "4.0"\n\n[[package]]\nname = "ruff"\nversion = "1.0"\nresolution-markers = ["a"]\n',
+            id="inline-markers",
+        ),
+    ],
+)
+def test_scan_locked_packages_unsupported(lockfile: Path, content: str) -> None:
+    lockfile.write_text(content)
+
+    assert scan_locked_packages(lockfile, HEADER.search) is None
+
+
+def test_scan_locked_versions(lockfile: Path) -> None:
+    lockfile.write_text(
+        """\
+lock_version = "4.0"
+
+[[package]]
+name = "Rapidfuzz"
+version = "3.13.0"
+source = { registry = "https://pypi.org/simple" }
+resolution-markers = [
+    "python_full_version < '3.10'",
+    "sys_platform == 'win32'",
+]
+
+[[package]]
+name = "rapidfuzz"
+version = "3.14.1"
+source = { registry = "https://pypi.org/simple" }
+resolution-markers = [
+    "python_full_version >= '3.10'",
+]
+
+[[package]]
+name = "ruff"
+version = "0.13.2"
+source = { registry = "https://pypi.org/simple" }
+dependencies = [
+    { name = "rapidfuzz" },
+]
+"""
+    )
+
+    assert scan_locked_versions(lockfile, HEADER.search) == {
+        "rapidfuzz": [
+            LockedVersion("3.13.0", ("python_full_version < '3.10'", "sys_platform == 'win32'")),
+            LockedVersion("3.14.1", ("python_full_version >= '3.10'",)),
+        ],
+        "ruff": [LockedVersion("0.13.2")],
+    }
+    assert scan_locked_packages(lockfile, HEADER.search) == {
+        "rapidfuzz": GenericLockedPackage("rapidfuzz", "3.14.1"),
+        "ruff": GenericLockedPackage("ruff", "0.13.2"),
+    }
+
+
+def test_scan_lock_tables(lockfile: Path) -> None:
+    lockfile.write_text(
+        """\
+lock_version = "4.5.0"
+
+[[package]]
+name = "app"
+source = { editable = "." }
+dependencies = [
+    { name = "httpx", extra = ["socks"] },
+]
+sdist = { url = "https://example.com/app.tar.gz" }
+
+[package.optional-dependencies]
+cli = [
+    { name = "click" },
+]
+"my.group" = []
+
+[[package]]
+name = "click"
+version = "8.1.7"
+"""
+    )
+
+    assert scan_lock_tables(
+        lockfile, HEADER.search, {"package": ("name", "dependencies"), "package.optional-dependencies": None}
+    ) == [
+        ("package", {"name": b'"app"', "dependencies": b'[\n    { name = "httpx", extra = ["socks"] },\n]'}),
+        ("package.optional-dependencies", {"cli": b'[\n    { name = "click" },\n]', "my.group": b"[]"}),
+        ("package", {"name": b'"click"'}),
+    ]
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        pytest.param("", id="empty"),
+        pytest.param('lock_version = "3.0"\n\n[[package]]\nname = "ruff"\n', id="unknown-version"),
+        pytest.param('lock_version = "4.0"\n\n[tool."quoted"]\nname = "ruff"\n', id="quoted-table"),
+    ],
+)
+def test_scan_lock_tables_unsupported(lockfile: Path, content: str) -> None:
+    lockfile.write_text(content)
+
+    assert scan_lock_tables(lockfile, HEADER.search, {"package": None}) is None
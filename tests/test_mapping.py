@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from unittest.mock import MagicMock
+
+import pytest
+
+from sync_pre_commit_lock import Printer
+from sync_pre_commit_lock.actions.sync_hooks import GenericLockedPackage, SyncPreCommitHooksVersion
+from sync_pre_commit_lock.config import SyncPreCommitLockConfig
+from sync_pre_commit_lock.mapping import UrlPatterns, mapping_index, normalize_url_pattern
+from sync_pre_commit_lock.utils import normalize_git_url
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def test_mapping_index_merges_user_mapping() -> None:
+    index = mapping_index({"new-lib": {"repo": "https://GitHub.com/example/new-lib.git", "rev": "v${rev}"}})
+
+    assert index.packages["new-lib"] == {"repo": "https://GitHub.com/example/new-lib.git", "rev": "v${rev}"}
+    assert index.package_by_url["https://github.com/example/new-lib"] == "new-lib"
+    assert index.package_by_url["https://github.com/astral-sh/ruff-pre-commit"] == "ruff"
+
+
+def test_mapping_index_user_mapping_overrides_db() -> None:
+    index = mapping_index({"ruff": {"repo": "https://github.com/example/ruff-mirror", "rev": "${rev}"}})
+
+    assert index.packages["ruff"]["repo"] == "https://github.com/example/ruff-mirror"
+    assert index.package_by_url["https://github.com/example/ruff-mirror"] == "ruff"
+
+
+def test_mapping_index_aliases() -> None:
+    index = mapping_index({})
+
+    assert index.package_by_url["https://github.com/charliermarsh/ruff-pre-commit"] == "ruff"
+    assert (
+        index.canonical_urls["https://github.com/charliermarsh/ruff-pre-commit"]
+        == "https://github.com/astral-sh/ruff-pre-commit"
+    )
+
+
+def test_mapping_index_user_aliases() -> None:
+    index = mapping_index(
+        {"new-lib": {"repo": "https://github.com/example/new-lib", "rev": "${rev}"}},
+        {
+            "https://github.com/astral-sh/ruff-pre-commit": ["https://Git.Internal/mirrors/ruff-pre-commit.git"],
+            "https://github.com/example/new-lib": [
+                "https://git.internal/mirrors/new-lib",
+                "https://git.internal/*/lib",
+            ],
+            "https://github.com/example/unknown": ["https://git.internal/mirrors/unknown"],
+        },
+    )
+
+    assert index.package_by_url["https://git.internal/mirrors/ruff-pre-commit"] == "ruff"
+    assert (
+        index.canonical_urls["https://git.internal/mirrors/ruff-pre-commit"]
+        == "https://github.com/astral-sh/ruff-pre-commit"
+    )
+    assert index.package_by_url["https://git.internal/mirrors/new-lib"] == "new-lib"
+    assert index.package("https://git.internal/forks/lib", "1.0.0") == "new-lib"
+    assert "https://git.internal/mirrors/unknown" not in index.package_by_url
+    # The built-in aliases are kept
+    assert index.package_by_url["https://github.com/charliermarsh/ruff-pre-commit"] == "ruff"
+
+
+def test_sync_warns_about_unknown_alias_target(tmp_path: Path) -> None:
+    printer = MagicMock(spec=Printer)
+    plugin_config = SyncPreCommitLockConfig(
+        repository_aliases={"https://github.com/example/unknown": ["https://git.internal/unknown"]}
+    )
+
+    index = SyncPreCommitHooksVersion(printer, tmp_path / ".pre-commit-config.yaml", {}, plugin_config).mapping_index
+
+    assert "https://git.internal/unknown" not in index.package_by_url
+
+    printer.warning.assert_called_once_with(
+        "Repository aliases of `https://github.com/example/unknown` ignored: it is not a mapped repo."
+    )
+
+
+def test_mapping_index_is_shared_and_frozen() -> None:
+    index = mapping_index({"new-lib": {"repo": "https://github.com/example/new-lib", "rev": "${rev}"}})
+
+    assert mapping_index({"new-lib": {"repo": "https://github.com/example/new-lib", "rev": "${rev}"}}) is index
+    assert mapping_index({}) is not index
+    with pytest.raises(TypeError):
+        index.package_by_url["https://github.com/example/other"] = "other"  # type: ignore[index]
+
+
+@pytest.mark.parametrize(
+    ("pattern", "expected"),
+    [
+        ("ssh://git@git.internal/org/*", "https://git.internal/org/*"),
+        ("git+ssh://git@Git.Internal:2222/org/ruff-*.git", "https://git.internal/org/ruff-*"),
+        ("https://GIT.internal/*/ruff-pre-commit/", "https://git.internal/*/ruff-pre-commit"),
+        ("https://git.internal/mirrors/ruff-?.git", "https://git.internal/mirrors/ruff-?"),
+        ("https://*.internal/mirrors/*", "https://*.internal/mirrors/*"),
+        ("local-*", "local-*"),
+    ],
+)
+def test_normalize_url_pattern(pattern: str, expected: str) -> None:
+    assert normalize_url_pattern(pattern) == expected
+
+
+@pytest.mark.parametrize(
+    "pattern",
+    [
+        "ssh://git@git.internal/org/*",
+        "https://Git.Internal/org/*",
+        "https://git.internal/org/ruff-pre-commit.git",
+        "https://git.internal/org/ruff-*/",
+    ],
+)
+def test_url_patterns_match_normalized_urls(pattern: str) -> None:
+    patterns = UrlPatterns([(pattern, "ruff")])
+
+    assert patterns.match(normalize_git_url("ssh://git@git.internal/org/ruff-pre-commit.git")) == "ruff"
+
+
+def test_url_patterns() -> None:
+    patterns = UrlPatterns(
+        [
+            ("https://git.internal/*/ruff-pre-commit", "ruff"),
+            ("https://git.internal/mirrors/*", "mirrored"),
+            ("https://*.example.com/psf/black?", "black"),
+            ("https://*/*/mypy", "mypy"),
+        ]
+    )
+
+    assert len(patterns) == 4
+    assert patterns.match("https://git.internal/mirrors/ruff-pre-commit") == "ruff"
+    assert patterns.match("https://git.internal/mirrors/other") == "mirrored"
+    assert patterns.match("https://git.example.com/psf/black2") == "black"
+    assert patterns.match("https://git.example.com/psf/black") is None
+    assert patterns.match("https://git.internal/mirrors/mypy") == "mirrored"
+    assert patterns.match("https://gitlab.com/team/mypy") == "mypy"
+    assert patterns.match("https://git.internal.evil/mirrors/ruff-pre-commit") is None
+    assert patterns.match("local") is None
+    assert UrlPatterns([]).match("https://github.com/example/repo") is None
+
+
+def test_mapping_index_package() -> None:
+    index = mapping_index(
+        {
+            "new-lib": {"repo": "https://git.internal/*/new-lib", "rev": "${rev}"},
+            "ruff": {"repo": "https://git.internal/mirrors/ruff-*", "rev": "v${rev}"},
+        }
+    )
+
+    assert index.package("https://git.internal/tools/new-lib", "1.0") == "new-lib"
+    assert index.package("https://git.internal/mirrors/ruff-pre-commit", "v0.1.0") == "ruff"
+    assert index.package("https://git.internal/tools/new-lib") is None
+    assert "https://git.internal/*/new-lib" not in index.package_by_url
+    assert index.package("https://github.com/pre-commit/mirrors-mypy") == "mypy"
+    assert index.package("https://git.internal/mypy-fork", "v1.0.0", ["mypy"]) == "mypy"
+    assert index.package("https://git.internal/black-fork", "24.1.0", ["black", "black-jupyter"]) == "black"
+    assert index.package("https://git.internal/black-fork", "24.1.0", ["black", "black-jupyter", "unknown"]) is None
+    assert index.package("https://git.internal/hooks", "v1.0.0", ["black", "mypy"]) is None
+    assert index.package("https://git.internal/hooks", "v1.0.0", ["unknown"]) is None
+    assert index.package("https://git.internal/hooks", "v1.0.0", ["mypy", "check-yaml"]) is None
+
+
+@pytest.mark.parametrize(
+    ("url", "rev", "hook_ids"),
+    [
+        ("https://git.internal/mirrors/ruff-pre-commit", "0.1.0", ()),
+        ("https://git.internal/mirrors/ruff-pre-commit", "main", ()),
+        ("https://git.internal/mypy-fork", "1.0.0", ["mypy"]),
+        ("https://git.internal/black-fork", "main", ["black"]),
+    ],
+)
+def test_mapping_index_package_requires_the_rev_format(url: str, rev: str, hook_ids: list[str]) -> None:
+    index = mapping_index({"ruff": {"repo": "https://git.internal/mirrors/ruff-*", "rev": "v${rev}"}})
+
+    assert index.package(url, rev, hook_ids) is None
+
+
+def test_sync_user_mapping_with_unnormalized_url(tmp_path: Path) -> None:
+    config_file = tmp_path / ".pre-commit-config.yaml"
+    config_file.write_text("repos:\n  - repo: https://github.com/example/new-lib\n    rev: v1.0.0\n")
+    plugin_config = SyncPreCommitLockConfig(
+        dependency_mapping={"new-lib": {"repo": "https://GitHub.com/example/new-lib.git", "rev": "v${rev}"}}
+    )
+
+    SyncPreCommitHooksVersion(
+        MagicMock(spec=Printer), config_file, {"new-lib": GenericLockedPackage("new-lib", "1.1.0")}, plugin_config
+    ).execute()
+
+    assert config_file.read_text() == "repos:\n  - repo: https://github.com/example/new-lib\n    rev: v1.1.0\n"
+
+
+def test_sync_by_hook_id(tmp_path: Path) -> None:
+    config_file = tmp_path / ".pre-commit-config.yaml"
+    config_file.write_text(
+        "repos:\n  - repo: https://git.internal/mirrors/ruff-pre-commit\n    rev: v0.1.0\n    hooks:\n"
+        "      - id: ruff\n      - id: ruff-format\n"
+    )
+
+    SyncPreCommitHooksVersion(
+        MagicMock(spec=Printer), config_file, {"ruff": GenericLockedPackage("ruff", "0.2.0")}, SyncPreCommitLockConfig()
+    ).execute()
+
+    assert "rev: v0.2.0\n" in config_file.read_text()
+
+
+@pytest.mark.parametrize(
+    "repo",
+    [
+        "  - repo: https://github.com/myorg/hooks\n    rev: v1.0.0\n    hooks:\n      - id: mypy\n      - id: check-yaml\n",
+        "  - repo: https://github.com/pre-commit/mirrors-isort\n    rev: v5.10.1\n    hooks:\n      - id: isort\n",
+    ],
+)
+def test_sync_by_hook_id_skips_unrelated_repos(tmp_path: Path, repo: str) -> None:
+    config_file = tmp_path / ".pre-commit-config.yaml"
+    config_file.write_text(f"repos:\n{repo}")
+    locked_packages = {"mypy": GenericLockedPackage("mypy", "1.10.0"), "isort": GenericLockedPackage("isort", "5.13.2")}
+
+    SyncPreCommitHooksVersion(
+        MagicMock(spec=Printer), config_file, locked_packages, SyncPreCommitLockConfig()
+    ).execute()
+
+    assert config_file.read_text() == f"repos:\n{repo}"
+
+
+def test_mapping_index_normalizes_patterns() -> None:
+    index = mapping_index(
+        {"new-lib": {"repo": "ssh://git@Git.Internal/*/new-lib.git", "rev": "${rev}"}},
+        {"https://github.com/astral-sh/ruff-pre-commit": ["ssh://git@git.internal/mirrors/ruff-*/"]},
+    )
+
+    assert index.package(normalize_git_url("ssh://git@git.internal/tools/new-lib.git"), "1.0") == "new-lib"
+    assert index.package(normalize_git_url("https://GIT.internal/mirrors/ruff-pre-commit/"), "v0.1.0") == "ruff"
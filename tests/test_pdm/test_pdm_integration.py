@@ -67,3 +67,31 @@ def test_pdm_lock_new_format(pdm: PDMCallable, project: Project) -> None:
 
     assert "rev: v" in pre_commit_config
     assert "rev: v0.1.0" not in pre_commit_config
+
+
+def test_pdm_sync_pre_commit_reads_lockfile(pdm: PDMCallable, project: Project, fixtures: Path):
+    from packaging.utils import canonicalize_name
+
+    from sync_pre_commit_lock.pdm_plugin import (
+        SyncPreCommitVersionsPDMCommand,
+        load_pdm_lock,
+        resolution_to_locked_packages,
+    )
+
+    project.pyproject.settings["dev-dependencies"] = {"lint": ["ruff"]}
+    project.pyproject.write()
+    pdm("lock", obj=project, strict=True)
+    shutil.copy(fixtures / "pdm_project" / PRE_COMMIT_CONFIG_FILENAME, project.root)
+
+    locked_packages = load_pdm_lock(project.root / "pdm.lock")
+    assert locked_packages is not None
+    candidates = SyncPreCommitVersionsPDMCommand()._get_locked_repository(project).all_candidates
+    assert {(name, package.version) for name, package in locked_packages.items()} == {
+        (canonicalize_name(candidate.name), candidate.version)
+        for candidate in resolution_to_locked_packages(candidates).values()
+    }
+
+    pdm("sync-pre-commit", obj=project, strict=True)
+
+    pre_commit_config = (project.root / PRE_COMMIT_CONFIG_FILENAME).read_text()
+    assert f"rev: v{locked_packages['ruff'].version}" in pre_commit_config
@@ -10,7 +10,7 @@ pdm_module = pytest.importorskip("pdm")
 # ruff: noqa: E402
 from pdm.core import Core
 from pdm.project import Project
-from pdm.termui import UI
+from pdm.termui import UI, Verbosity
 
 from sync_pre_commit_lock.config import SyncPreCommitLockConfig
 from sync_pre_commit_lock.pdm_plugin import (
@@ -28,6 +28,7 @@ def project() -> Project:
     x.root = mock.MagicMock(spec=Path)
     x.core = mock.MagicMock(spec=Core)
     x.core.ui = mock.MagicMock(spec=UI)
+    x.core.ui.verbosity = Verbosity.DEBUG
     return x
 
 
@@ -179,3 +180,18 @@ def test_pdm_printer_list_success_renamed_repository(capsys: pytest.CaptureFixtu
     captured = capsys.readouterr()
 
     assert_output(captured.out, "[sync-pre-commit-lock]  ✔ https://{old -> new}.repo.local/test   rev1 -> rev2")
+
+
+@pytest.mark.parametrize(
+    ("verbosity", "debug_enabled", "info_enabled"),
+    [(Verbosity.QUIET, False, False), (Verbosity.NORMAL, False, True), (Verbosity.DEBUG, True, True)],
+)
+def test_pdm_printer_is_enabled(verbosity: Verbosity, debug_enabled: bool, info_enabled: bool) -> None:
+    printer = PDMPrinter(UI(verbosity=verbosity))
+    build = mock.MagicMock(return_value="message")
+
+    printer.debug(build)
+
+    assert printer.is_enabled("debug") is debug_enabled
+    assert printer.is_enabled("info") is info_enabled
+    assert build.called is debug_enabled
@@ -14,7 +14,7 @@ from pdm.core import Core
 from pdm.models.candidates import Candidate
 from pdm.models.requirements import NamedRequirement
 from pdm.project import Project
-from pdm.termui import UI
+from pdm.termui import UI, Verbosity
 
 from sync_pre_commit_lock import (
     Printer,
@@ -32,6 +32,7 @@ def project() -> Project:
     x.root = MagicMock(spec=Path)
     x.core = MagicMock(spec=Core)
     x.core.ui = MagicMock(spec=UI)
+    x.core.ui.verbosity = Verbosity.DEBUG
     return x
 
 
@@ -66,3 +67,89 @@ def test_on_pdm_lock_check_pre_commit(mock_load_config: MagicMock, project: Magi
     mock_load_config.return_value = SyncPreCommitLockConfig(disable_sync_from_lock=True)
     on_pdm_lock_check_pre_commit(project, dry_run=False, resolution=resolution)
     mock_load_config.assert_called_once()
+
+
+PDM_LOCK = """\
+[metadata]
+groups = ["default"]
+strategy = ["inherit_metadata"]
+lock_version = "4.5.0"
+content_hash = "sha256:0000"
+
+[[metadata.targets]]
+requires_python = ">=3.10"
+{extra_target}
+[[package]]
+name = "Ruff"
+version = "0.6.7"
+requires_python = ">=3.7"
+groups = ["default"]
+"""
+
+
+def test_load_pdm_lock(tmp_path: Path) -> None:
+    from sync_pre_commit_lock.actions.sync_hooks import GenericLockedPackage
+    from sync_pre_commit_lock.pdm_plugin import load_pdm_lock
+
+    lockfile = tmp_path / "pdm.lock"
+    lockfile.write_text(PDM_LOCK.format(extra_target=""))
+
+    assert load_pdm_lock(lockfile) == {"ruff": GenericLockedPackage("ruff", "0.6.7")}
+
+
+def test_load_pdm_lock_unsupported(tmp_path: Path) -> None:
+    from sync_pre_commit_lock.pdm_plugin import load_pdm_lock
+
+    lockfile = tmp_path / "pdm.lock"
+    assert load_pdm_lock(lockfile) is None
+
+    lockfile.write_text(PDM_LOCK.format(extra_target='[[metadata.targets]]\nrequires_python = ">=3.8,<3.10"\n'))
+    assert load_pdm_lock(lockfile) is None
+
+
+@patch("sync_pre_commit_lock.pdm_plugin.SyncPreCommitHooksVersion")
+@patch("sync_pre_commit_lock.pdm_plugin.load_config")
+def test_sync_pre_commit_versions_dependency_groups(
+    mock_load_config: MagicMock, mock_syncer: MagicMock, project: MagicMock, tmp_path: Path
+) -> None:
+    from sync_pre_commit_lock.actions.sync_hooks import GenericLockedPackage
+    from sync_pre_commit_lock.pdm_plugin import sync_pre_commit_versions
+
+    mock_load_config.return_value = SyncPreCommitLockConfig(dependency_groups=["default"])
+    project.root = tmp_path
+    project.config = {}
+    (tmp_path / "pdm.lock").write_text(PDM_LOCK.format(extra_target=""))
+    locked = {"ruff": GenericLockedPackage("ruff", "0.6.7"), "pyyaml": GenericLockedPackage("pyyaml", "6.0.1")}
+
+    sync_pre_commit_versions(project, locked, dry_run=True)
+
+    assert mock_syncer.call_args.kwargs["locked_packages"] == {
+        "ruff": GenericLockedPackage("ruff", "0.6.7"),
+        "pdm": GenericLockedPackage("pdm", pdm_version),
+    }
+
+
+@patch("sync_pre_commit_lock.pdm_plugin.SyncPreCommitHooksVersion")
+@patch("sync_pre_commit_lock.pdm_plugin.load_config")
+def test_on_pdm_lock_dependency_groups_from_resolution(
+    mock_load_config: MagicMock, mock_syncer: MagicMock, project: MagicMock, tmp_path: Path
+) -> None:
+    from sync_pre_commit_lock.actions.sync_hooks import GenericLockedPackage
+
+    mock_load_config.return_value = SyncPreCommitLockConfig(dependency_groups=["lint"])
+    project.root = tmp_path
+    project.config = {}
+    # Stale lockfile, e.g. with `pdm lock --dry-run`: ruff is not in the `lint` group yet
+    (tmp_path / "pdm.lock").write_text(PDM_LOCK.format(extra_target=""))
+    candidates = [
+        Candidate(NamedRequirement("ruff", groups=["lint"]), version="0.6.7"),
+        Candidate(NamedRequirement("pyyaml", groups=["default"]), version="6.0.1"),
+    ]
+    resolution = {c.name: [c] if Version(pdm_version) >= Version("2.17") else c for c in candidates}
+
+    on_pdm_lock_check_pre_commit(project, dry_run=True, resolution=resolution)  # type: ignore[arg-type]
+
+    assert mock_syncer.call_args.kwargs["locked_packages"] == {
+        "ruff": GenericLockedPackage("ruff", "0.6.7"),
+        "pdm": GenericLockedPackage("pdm", pdm_version),
+    }
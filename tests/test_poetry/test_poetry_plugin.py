@@ -1,4 +1,5 @@
 import re
+from pathlib import Path
 from textwrap import dedent
 from unittest.mock import MagicMock, patch
 
@@ -11,8 +12,9 @@ from poetry.console.application import Application
 from poetry.console.commands.install import InstallCommand
 from poetry.console.commands.lock import LockCommand
 from poetry.console.commands.self.self_command import SelfCommand
+from poetry.packages.locker import Locker
 
-from sync_pre_commit_lock.poetry_plugin import SyncPreCommitLockPlugin, SyncPreCommitPoetryCommand
+from sync_pre_commit_lock.poetry_plugin import SyncPreCommitLockPlugin, SyncPreCommitPoetryCommand, load_poetry_lock
 from sync_pre_commit_lock.pre_commit_config import PreCommitHook, PreCommitRepo
 
 
@@ -69,7 +71,9 @@ def test_handle_post_command_self_command() -> None:
 
 @patch("sync_pre_commit_lock.poetry_plugin.SyncPreCommitHooksVersion.execute")
 @patch("sync_pre_commit_lock.config.toml.load", return_value={"tool": {"sync-pre-commit-lock": {}}})
-def test_handle_post_command_install_add_lock_update_commands(mocked_execute: MagicMock, mock_load: MagicMock) -> None:
+def test_handle_post_command_install_add_lock_update_commands(
+    mocked_execute: MagicMock, mock_load: MagicMock, tmp_path: Path
+) -> None:
     event = MagicMock(
         spec=ConsoleTerminateEvent,
         exit_code=0,
@@ -80,6 +84,7 @@ def test_handle_post_command_install_add_lock_update_commands(mocked_execute: Ma
 
     plugin = SyncPreCommitLockPlugin()
     plugin.application = MagicMock()
+    plugin.application.poetry.locker.lock = tmp_path / "poetry.lock"
     plugin.application.poetry.locker.locked_repository.return_value.packages = [MagicMock()]
 
     plugin._handle_post_command(event, event_name, dispatcher)
@@ -108,6 +113,32 @@ def test_handle_post_command_application_none() -> None:
         pytest.fail("RuntimeError not raised")
 
 
+POETRY_PROJECT = Path(__file__).parent.parent / "fixtures" / "poetry_project"
+
+
+def test_load_poetry_lock_matches_locked_repository() -> None:
+    lock_path = POETRY_PROJECT / "poetry.lock"
+    repository = Locker(lock_path, {}).locked_repository()
+
+    locked_packages = load_poetry_lock(lock_path)
+
+    assert locked_packages is not None
+    assert {name: tuple(package) for name, package in locked_packages.items()} == {
+        str(package.name): (str(package.name), str(package.version)) for package in repository.packages
+    }
+
+
+@pytest.mark.parametrize("lock_version", ["3.0", "0.9"])
+def test_load_poetry_lock_unsupported_version(tmp_path: Path, lock_version: str) -> None:
+    lock_path = tmp_path / "poetry.lock"
+    lock_path.write_text(
+        f'[[package]]\nname = "black"\nversion = "23.3.0"\n\n[metadata]\nlock-version = "{lock_version}"\n'
+    )
+
+    assert load_poetry_lock(lock_path) is None
+    assert load_poetry_lock(tmp_path / "missing.lock") is None
+
+
 def assert_output(out: str, expected: str):
     __tracebackhide__ = True
 
@@ -264,3 +295,50 @@ def test_poetry_printer_list_success_renamed_repository(capsys: pytest.CaptureFi
 def test_direct_command_invocation():
     with pytest.raises(RuntimeError, match="self.application is None"):
         SyncPreCommitPoetryCommand().handle()
+
+
+def test_poetry_printer_print_diff(capsys: pytest.CaptureFixture[str]) -> None:
+    from cleo.io.inputs.input import Input
+    from cleo.io.io import IO
+    from cleo.io.outputs.output import Output
+
+    from sync_pre_commit_lock.poetry_plugin import PoetryPrinter
+
+    output = Output()
+
+    def _write(message: str, new_line: bool = False):
+        print(message)  # noqa: T201
+
+    output._write = _write
+    printer = PoetryPrinter(IO(input=Input(), output=output, error_output=output))
+
+    printer.print_diff(["@@ -1 +1 @@\n", "-  additional_dependencies: [<dep>==1]\n", "+  rev: 2\n"])
+
+    assert capsys.readouterr().out.splitlines() == [
+        "@@ -1 +1 @@",
+        "-  additional_dependencies: [<dep>==1]",
+        "+  rev: 2",
+    ]
+
+
+@pytest.mark.parametrize(
+    ("verbosity", "debug_enabled", "info_enabled"),
+    [("QUIET", False, False), ("NORMAL", False, True), ("DEBUG", True, True)],
+)
+def test_poetry_printer_is_enabled(verbosity: str, debug_enabled: bool, info_enabled: bool) -> None:
+    from cleo.io.buffered_io import BufferedIO
+    from cleo.io.outputs.output import Verbosity
+
+    from sync_pre_commit_lock.poetry_plugin import PoetryPrinter
+
+    io = BufferedIO()
+    io.set_verbosity(Verbosity[verbosity])
+    printer = PoetryPrinter(io)
+    build = MagicMock(return_value="message")
+
+    printer.debug(build)
+
+    assert printer.is_enabled("debug") is debug_enabled
+    assert printer.is_enabled("info") is info_enabled
+    assert build.called is debug_enabled
+    assert ("message" in io.fetch_output()) is debug_enabled
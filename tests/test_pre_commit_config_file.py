@@ -1,3 +1,4 @@
+import shutil
 from pathlib import Path
 from unittest.mock import MagicMock, mock_open
 
@@ -53,45 +54,32 @@ def test_repos_property() -> None:
 FIXTURES = Path(__file__).parent / "fixtures" / "sample_pre_commit_config"
 
 
-@pytest.mark.parametrize(
-    ("path", "offset"),
-    [
-        (FIXTURES / "pre-commit-config-document-separator.yaml", 4),
-        (FIXTURES / "pre-commit-config-start-empty-lines.yaml", 0),
-        (FIXTURES / "pre-commit-config-with-local.yaml", 2),
-        (FIXTURES / "pre-commit-config.yaml", 1),
-        (FIXTURES / "sample-django-stubs.yaml", 0),
-    ],
-)
-def test_files_offset(path: Path, offset: int) -> None:
+def test_update_versions(tmp_path: Path) -> None:
+    path = tmp_path / ".pre-commit-config.yaml"
+    shutil.copy(FIXTURES / "pre-commit-config-document-separator.yaml", path)
     config = PreCommitHookConfig.from_yaml_file(path)
-    assert config.document_start_offset == offset
-
-
-def test_update_versions() -> None:
-    config = PreCommitHookConfig.from_yaml_file(FIXTURES / "pre-commit-config-document-separator.yaml")
-    config.pre_commit_config_file_path = MagicMock()
 
     initial_repo = PreCommitRepo("https://github.com/psf/black", "23.2.0", [PreCommitHook("black")])
     updated_repo = PreCommitRepo("https://github.com/psf/black", "23.3.0", [PreCommitHook("black")])
     config.update_pre_commit_repo_versions({initial_repo: updated_repo})
-    assert config.pre_commit_config_file_path.open.call_args[0][0] == "w"
+    assert "rev: 23.3.0" in path.read_text()
+    written = path.stat()
 
     config.update_pre_commit_repo_versions({})
-    assert config.pre_commit_config_file_path.open.call_count == 1
+    assert path.stat() == written
 
     with pytest.raises(RuntimeError):
         config.update_pre_commit_repo_versions(
             {PreCommitRepo("https://github.com/psf/notexist", "23.2.0"): updated_repo}
         )
-        assert config.pre_commit_config_file_path.open.call_count == 1
+    assert path.stat() == written
 
 
 @pytest.mark.parametrize("base", ["only-deps", "with-deps", "with-one-liner-deps", "without-new-deps"])
-def test_update_additional_dependencies_versions(base: str) -> None:
-    config = PreCommitHookConfig.from_yaml_file(FIXTURES / f"pre-commit-config-{base}.yaml")
-    mock_file = config.pre_commit_config_file_path = MagicMock()
-    mock_file.open = mock_open()
+def test_update_additional_dependencies_versions(base: str, tmp_path: Path) -> None:
+    path = tmp_path / ".pre-commit-config.yaml"
+    shutil.copy(FIXTURES / f"pre-commit-config-{base}.yaml", path)
+    config = PreCommitHookConfig.from_yaml_file(path)
 
     initial_repo = config.repos[0]
     updated_repo = PreCommitRepo(
@@ -104,7 +92,45 @@ def test_update_additional_dependencies_versions(base: str) -> None:
 
     expected = (FIXTURES / f"pre-commit-config-{base}.expected.yaml").read_text()
 
-    mock_file.open().writelines.assert_called_once_with(expected.splitlines(keepends=True))
+    assert path.read_text() == expected
+
+
+@pytest.mark.parametrize(
+    "content,expected",
+    [
+        pytest.param(
+            "repos:\n  - repo: https://github.com/psf/black\n    rev: '1.0'  # Not 1.0.1\n",
+            "repos:\n  - repo: https://github.com/psf/black\n    rev: '2.0'  # Not 1.0.1\n",
+            id="only-the-node",
+        ),
+        pytest.param(
+            "repos:\r\n  - repo: https://github.com/psf/black.git\r\n    rev: 1.0\r\n",
+            "repos:\r\n  - repo: https://github.com/psf/black.git\r\n    rev: 2.0\r\n",
+            id="crlf-not-normalized",
+        ),
+        pytest.param(
+            "repos: [{repo: https://github.com/psf/black, rev: '1.0', hooks: [{id: black}]}]  # 1.0\n",
+            "repos: [{repo: https://github.com/psf/black, rev: '2.0', hooks: [{id: black}]}]  # 1.0\n",
+            id="strictyaml-flow-style",
+        ),
+        pytest.param(
+            "repos:\n  - repo: https://github.com/psf/black\n    rev: 1.0\n"
+            "  - repo: https://github.com/psf/black\n    rev: 1.0\n",
+            "repos:\n  - repo: https://github.com/psf/black\n    rev: 2.0\n"
+            "  - repo: https://github.com/psf/black\n    rev: 2.0\n",
+            id="duplicated-repo",
+        ),
+    ],
+)
+def test_update_versions_splices_nodes(content: str, expected: str, tmp_path: Path) -> None:
+    path = tmp_path / ".pre-commit-config.yaml"
+    path.write_bytes(content.encode())
+    config = PreCommitHookConfig(content, path)
+
+    (repo,) = config.repos_normalized
+    config.update_pre_commit_repo_versions({repo: PreCommitRepo(repo.repo, "2.0", repo.hooks)})
+
+    assert path.read_bytes().decode() == expected
 
 
 # Syntactic sugar
@@ -185,6 +211,16 @@ Hook = PreCommitHook
             ),
             False,
         ),
+        (
+            Repo("https://some.url", "0.42", [Hook("hook", ["somelib"])]),
+            Repo("https://some.url", "0.42", [Hook("hook", ["somelib"]), Hook("other-hook")]),
+            False,
+        ),
+        (
+            Repo("https://some.url", "0.42", [Hook("hook", ["somelib"])]),
+            Repo("https://some.url", "0.42", [Hook("hook", ["somelib", "another-lib"])]),
+            False,
+        ),
     ),
 )
 def test_precommit_repo_equality(repo1: PreCommitRepo, repo2: PreCommitRepo, equal: bool):
@@ -192,7 +228,28 @@ def test_precommit_repo_equality(repo1: PreCommitRepo, repo2: PreCommitRepo, equ
     assert (hash(repo1) == hash(repo2)) is equal
 
 
-def test_prek_config_support() -> None:
+def test_precommit_hooks_are_interned() -> None:
+    hook = PreCommitHook("hook", ["somelib", "another-lib"])
+
+    assert PreCommitHook("hook", ("somelib", "another-lib")) is hook
+    assert PreCommitHook("hook", ["somelib"]) is not hook
+    assert hook.additional_dependencies == ("somelib", "another-lib")
+
+
+def test_precommit_repo_is_immutable() -> None:
+    repo = PreCommitRepo("https://some.url", "0.42", [PreCommitHook("hook")])
+
+    with pytest.raises(AttributeError):
+        repo.rev = "0.43"  # type: ignore[misc]
+    with pytest.raises(AttributeError):
+        repo.hooks[0].id = "other-hook"  # type: ignore[misc]
+    assert repo.hooks == (PreCommitHook("hook"),)
+    assert repr(repo) == (
+        "PreCommitRepo(repo='https://some.url', rev='0.42', hooks=(PreCommitHook(id='hook', additional_dependencies=()),))"
+    )
+
+
+def test_prek_config_support(tmp_path: Path) -> None:
     # A config file with prek-specific keys
     file_content = """\
 minimum_prek_version: "0.1.0"
@@ -206,10 +263,10 @@ repos:
         env:
             FOO: bar
 """
-    mock_path = MagicMock(spec=Path)
-    mock_path.open = mock_open(read_data=file_content)
+    path = tmp_path / ".pre-commit-config.yaml"
+    path.write_text(file_content)
 
-    config = PreCommitHookConfig.from_yaml_file(mock_path)
+    config = PreCommitHookConfig.from_yaml_file(path)
 
     updated_repo = PreCommitRepo(
         "https://github.com/psf/black",
@@ -217,7 +274,6 @@ repos:
         [PreCommitHook("black")],
     )
 
-    mock_path.open = mock_open()
     config.update_pre_commit_repo_versions({config.repos[0]: updated_repo})
 
     expected_content = """\
@@ -232,4 +288,4 @@ repos:
         env:
             FOO: bar
 """
-    mock_path.open().writelines.assert_called_once_with(expected_content.splitlines(keepends=True))
+    assert path.read_text() == expected_content
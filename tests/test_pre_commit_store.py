@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import sqlite3
+from contextlib import closing
+from typing import TYPE_CHECKING, Any
+from unittest.mock import patch
+
+import pytest
+
+from sync_pre_commit_lock.pre_commit_config import PreCommitHook, PreCommitRepo
+from sync_pre_commit_lock.pre_commit_store import EnvironmentEstimate, PreCommitStore, db_repo_name, store_dir
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+REPO = "https://github.com/pre-commit/mirrors-mypy"
+
+
+@pytest.fixture
+def store(tmp_path: Path) -> PreCommitStore:
+    """A store with an installed environment for mypy v1.1.0 with `types-requests==2.0`."""
+    installed = tmp_path / "repoabc"
+    (installed / "py_env-python3").mkdir(parents=True)
+    (installed / "py_env-python3" / ".install_state_v1").write_text("{}")
+    with sqlite3.connect(tmp_path / "db.db") as db:
+        db.execute("CREATE TABLE repos (repo TEXT NOT NULL, ref TEXT NOT NULL, path TEXT NOT NULL)")
+        db.execute("INSERT INTO repos VALUES (?, ?, ?)", (f"{REPO}:types-requests==2.0", "v1.1.0", str(installed)))
+        # Cloned, but no environment installed
+        db.execute("INSERT INTO repos VALUES (?, ?, ?)", (REPO, "v1.1.0", str(tmp_path / "repodef")))
+    db.close()
+    return PreCommitStore(tmp_path)
+
+
+def test_store_dir(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.delenv("PRE_COMMIT_HOME", raising=False)
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    assert store_dir() == tmp_path / "pre-commit"
+
+    monkeypatch.setenv("PRE_COMMIT_HOME", str(tmp_path / "home"))
+    assert store_dir() == tmp_path / "home"
+
+
+def test_db_repo_name() -> None:
+    assert db_repo_name(REPO, []) == REPO
+    assert db_repo_name(REPO, ["a==1", "b"]) == f"{REPO}:a==1,b"
+
+
+def test_has_environment(store: PreCommitStore) -> None:
+    assert store.has_environment(REPO, "v1.1.0", ["types-requests==2.0"])
+    assert not store.has_environment(REPO, "v1.1.0", [])
+    assert not store.has_environment(REPO, "v1.2.0", ["types-requests==2.0"])
+
+
+def test_missing_or_invalid_store_is_empty(tmp_path: Path) -> None:
+    assert PreCommitStore(tmp_path / "missing").clones == {}
+    (tmp_path / "db.db").write_text("not a database")
+    assert PreCommitStore(tmp_path).clones == {}
+
+
+def test_clones_closes_the_database(store: PreCommitStore) -> None:
+    connections: list[sqlite3.Connection] = []
+    sqlite_connect = sqlite3.connect
+
+    def connect(*args: Any, **kwargs: Any) -> sqlite3.Connection:
+        connections.append(sqlite_connect(*args, **kwargs))
+        return connections[-1]
+
+    with patch("sync_pre_commit_lock.pre_commit_store.sqlite3.connect", side_effect=connect):
+        assert len(store.clones) == 2
+
+    with pytest.raises(sqlite3.ProgrammingError):
+        connections[0].execute("SELECT 1")
+
+
+def test_estimate(store: PreCommitStore) -> None:
+    old = PreCommitRepo(
+        REPO, "v1.0.0", [PreCommitHook("mypy", ["types-requests==1.0"]), PreCommitHook("dmypy", ["other"])]
+    )
+    new = PreCommitRepo(
+        REPO, "v1.1.0", [PreCommitHook("mypy", ["types-requests==2.0"]), PreCommitHook("dmypy", ["other"])]
+    )
+
+    estimate = store.estimate(old, new)
+
+    assert estimate == EnvironmentEstimate(hooks=("mypy", "dmypy"), cold=("dmypy",))
+    assert estimate.describe() == "(2 new hook environments, 1 to build)"
+
+
+def test_estimate_with_the_repo_as_written(store: PreCommitStore) -> None:
+    installed = store.path / "repoghi"
+    (installed / "py_env-python3").mkdir(parents=True)
+    (installed / "py_env-python3" / ".install_state_v1").write_text("{}")
+    with closing(sqlite3.connect(store.path / "db.db")) as db, db:
+        db.execute("INSERT INTO repos VALUES (?, ?, ?)", (f"{REPO}.git", "v1.2.0", str(installed)))
+    old = PreCommitRepo(REPO, "v1.1.0", [PreCommitHook("mypy")])
+    new = PreCommitRepo(REPO, "v1.2.0", [PreCommitHook("mypy")])
+
+    assert store.estimate(old, new, f"{REPO}.git") == EnvironmentEstimate(hooks=("mypy",), cold=())
+    assert store.estimate(old, new) == EnvironmentEstimate(hooks=("mypy",), cold=("mypy",))
+
+
+def test_estimate_unchanged_hooks(store: PreCommitStore) -> None:
+    old = PreCommitRepo(REPO, "v1.1.0", [PreCommitHook("mypy", ["types-requests"]), PreCommitHook("dmypy")])
+    new = PreCommitRepo(REPO, "v1.1.0", [PreCommitHook("mypy", ["types-requests==2.0"]), PreCommitHook("dmypy")])
+
+    estimate = store.estimate(old, new)
+
+    assert estimate == EnvironmentEstimate(hooks=("mypy",), cold=())
+    assert store.estimate(new, new).describe() == ""
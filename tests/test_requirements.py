@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import pytest
+from packaging.requirements import InvalidRequirement, Requirement
+from packaging.specifiers import SpecifierSet
+from packaging.utils import canonicalize_name
+from packaging.version import Version
+
+from sync_pre_commit_lock.requirements import (
+    ParsedRequirement,
+    _parse_simple_requirement,
+    evaluate_marker,
+    parse_requirement,
+    pin_requirement,
+    specifier_contains,
+    specifier_floor,
+)
+
+
+def test_parse_requirement() -> None:
+    assert parse_requirement("Types_PyYAML>=6,<7") == ParsedRequirement("Types_PyYAML", "types-pyyaml", "<7,>=6")
+    assert parse_requirement("somelib") == ParsedRequirement("somelib", "somelib", "")
+    assert parse_requirement("somelib>=1 ; python_version<'3.11'") == ParsedRequirement(
+        "somelib", "somelib", ">=1", 'python_version < "3.11"'
+    )
+
+
+def test_parse_requirement_is_cached() -> None:
+    parse_requirement.cache_clear()
+
+    first = parse_requirement("types-requests==2.31.0")
+    assert parse_requirement("types-requests==2.31.0") is first
+    assert parse_requirement.cache_info().hits == 1
+    assert parse_requirement.cache_info().misses == 1
+
+
+def test_parse_requirement_invalid() -> None:
+    with pytest.raises(InvalidRequirement):
+        parse_requirement("not a requirement")
+
+
+@pytest.mark.parametrize(
+    ("requirement", "expected"),
+    [
+        ("somelib", "somelib==1.2.3"),
+        ("somelib>=1,<2", "somelib==1.2.3"),
+        ("somelib[extra2,extra1]==1.0", "somelib[extra2,extra1]==1.2.3"),
+        ("somelib == 1.0", "somelib ==1.2.3"),
+        ("somelib >=1.0 , <2 ", "somelib ==1.2.3 "),
+        ("somelib (>=1.0)", "somelib (==1.2.3)"),
+        ("somelib ; python_version < '3.11'", "somelib==1.2.3 ; python_version < '3.11'"),
+        ("somelib==1.0;python_version<'3.11'", "somelib==1.2.3;python_version<'3.11'"),
+        ("somelib @ https://example.com/somelib-1.0.tar.gz", "somelib @ https://example.com/somelib-1.0.tar.gz"),
+    ],
+)
+def test_pin_requirement(requirement: str, expected: str) -> None:
+    assert pin_requirement(requirement, "1.2.3") == expected
+
+
+DIFFERENTIAL_CORPUS = [
+    "types-requests",
+    "types-requests==2.31.0.20240106",
+    "Types_PyYAML>=6.0",
+    "somelib.ns==1.0",
+    "somelib==01.0",
+    "somelib>=1,<2",
+    "somelib<2,>=1",
+    "somelib>=1.0,>=1.0",
+    "somelib>=1,>=1.0",
+    "somelib==1,==1.0",
+    "somelib>=01,<2.0",
+    "somelib >= 1.0 , < 2",
+    "somelib== 1.0",
+    "somelib\t==1.0",
+    " somelib==1.0 ",
+    "somelib!=1.5,~=1.4",
+    "somelib~=1.4.5",
+    "somelib[extra]",
+    "somelib[extra]==1.0",
+    "somelib [extra] ==1.0",
+    "somelib[b, a,a]>1",
+    "somelib[B,a]<1",
+    "somelib[extra-1,extra_2]>=1.0",
+    # Not in a common form, parsed by packaging
+    "somelib==1.*",
+    "somelib!=1.0.*",
+    "somelib===1.0",
+    "somelib==1.0rc1",
+    "somelib==1.0.post1",
+    "somelib==1.0+local",
+    "somelib==v1.0",
+    "somelib>=1.0; python_version < '3.11'",
+    "somelib[extra]==1.0 ; sys_platform == 'win32'",
+    "somelib @ https://example.com/somelib-1.0.tar.gz",
+    "somelib (>=1.0)",
+    "somelib==1.0,",
+    "somelib[]",
+]
+
+
+def _packaging_parse(requirement: str) -> ParsedRequirement:
+    parsed = Requirement(requirement)
+    return ParsedRequirement(
+        parsed.name, canonicalize_name(parsed.name), str(parsed.specifier), str(parsed.marker or "")
+    )
+
+
+def _packaging_pin(requirement: str, version: str) -> str:
+    parsed = Requirement(requirement)
+    if not parsed.url:
+        parsed.specifier = SpecifierSet(f"=={version}")
+    return str(parsed)
+
+
+@pytest.mark.parametrize("requirement", DIFFERENTIAL_CORPUS)
+def test_parse_requirement_matches_packaging(requirement: str) -> None:
+    try:
+        expected = _packaging_parse(requirement)
+    except InvalidRequirement:
+        with pytest.raises(InvalidRequirement):
+            parse_requirement(requirement)
+    else:
+        assert parse_requirement(requirement) == expected
+
+
+@pytest.mark.parametrize("version", ["1.2.3", "2.31.0.20240106", "1.0rc1", "1.0.post2.dev3", "1.0a1", "2024.1"])
+@pytest.mark.parametrize("requirement", DIFFERENTIAL_CORPUS)
+def test_pin_requirement_matches_packaging(requirement: str, version: str) -> None:
+    try:
+        expected = _packaging_pin(requirement, version)
+    except InvalidRequirement:
+        with pytest.raises(InvalidRequirement):
+            pin_requirement(requirement, version)
+    else:
+        # Equivalent once serialized by packaging, without reformatting the requirement
+        assert str(Requirement(pin_requirement(requirement, version))) == expected
+
+
+@pytest.mark.parametrize("requirement", ["somelib~=1", "somelib>=1.0.*", "somelib<>1", "-somelib", "somelib[extra"])
+def test_parse_requirement_invalid_matches_packaging(requirement: str) -> None:
+    with pytest.raises(InvalidRequirement):
+        Requirement(requirement)
+    with pytest.raises(InvalidRequirement):
+        parse_requirement(requirement)
+
+
+def test_common_requirements_use_the_fast_path() -> None:
+    assert _parse_simple_requirement("types-requests==2.31.0") == ("types-requests", "", "==2.31.0")
+    assert _parse_simple_requirement("somelib[b,a]>=1,<2") == ("somelib", "[a,b]", "<2,>=1")
+    assert _parse_simple_requirement("somelib>=1.0; python_version < '3.11'") is None
+
+
+def test_pin_requirement_operator() -> None:
+    assert pin_requirement("somelib[extra]==1.0", "1.2.3", ">=") == "somelib[extra]>=1.2.3"
+    assert pin_requirement("somelib==1.0; python_version < '3.11'", "1.2.3", ">=") == (
+        "somelib>=1.2.3; python_version < '3.11'"
+    )
+
+
+@pytest.mark.parametrize(
+    ("specifier", "version", "expected"),
+    [
+        ("", "1.0", True),
+        (">=1.0", "1.2.3", True),
+        ("<2,>=1.0", "2.0", False),
+        ("==1.*", "1.5rc1", True),
+        ("~=1.4", "1.3", False),
+        (">=1.0", "not-a-version", False),
+    ],
+)
+def test_specifier_contains(specifier: str, version: str, expected: bool) -> None:
+    assert specifier_contains(specifier, version) is expected
+
+
+@pytest.mark.parametrize(
+    ("specifier", "expected"),
+    [
+        ("", None),
+        ("<2", None),
+        ("==1.*", None),
+        ("==1.2", Version("1.2")),
+        ("<3,>=1.0,~=1.4", Version("1.4")),
+        (">1.0,!=2.0", Version("1.0")),
+    ],
+)
+def test_specifier_floor(specifier: str, expected: Version | None) -> None:
+    assert specifier_floor(specifier) == expected
+
+
+@pytest.mark.parametrize(
+    ("marker", "python_version", "expected"),
+    [
+        ("python_version < '3.11'", "3.10", True),
+        ("python_version < '3.11'", "3.11.4", False),
+        ("python_full_version >= '3.11.4'", "3.11.4", True),
+        ("not a marker", "3.11", False),
+        ("dependency_groups == 'x'", "3.11", True),
+        ("python_version < '3.11' and 'dev' in dependency_groups", "3.10", True),
+    ],
+)
+def test_evaluate_marker(marker: str, python_version: str, expected: bool) -> None:
+    assert evaluate_marker(marker, python_version) is expected
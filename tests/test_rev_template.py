@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import pytest
+from packaging.version import Version
+
+from sync_pre_commit_lock.rev_template import compile_rev_template
+
+
+@pytest.mark.parametrize(
+    "template,version,expected",
+    [
+        ("${rev}", "1.2.3", "1.2.3"),
+        ("v${rev}", "1.2.3", "v1.2.3"),
+        ("${rev}-mirror", "1.2.3", "1.2.3-mirror"),
+        ("v${rev|truncate:2}", "1.2.3", "v1.2"),
+        ("v${rev|truncate:2}", "1.2.3rc1", "v1.2"),
+        ("${rev|truncate:1}", "not.a.version", "not"),
+        ("${rev|normalize}", "1.0.0-RC.1", "1.0.0rc1"),
+        ("${rev|normalize}", "not-a-version", "not-a-version"),
+        ("${rev|normalize|truncate:2}", "1.2.3.post1", "1.2"),
+        ("stable", "1.2.3", "stable"),
+    ],
+)
+def test_rev_template_format(template: str, version: str, expected: str) -> None:
+    assert compile_rev_template(template).format(version) == expected
+
+
+@pytest.mark.parametrize(
+    "template,rev,expected",
+    [
+        ("${rev}", "1.0", Version("1.0")),
+        ("v${rev}", "v1.0.0", Version("1.0")),
+        ("v${rev}", "v1.0.0rc1", Version("1.0.0-rc.1")),
+        ("release-${rev}-final", "release-2.0-final", Version("2.0")),
+        ("${rev}", "v1.0", None),
+        ("v${rev}", "1.0", None),
+        ("v${rev}", "v 1.0", None),
+        ("v${rev}", "v", None),
+        ("v${rev}", "vmain", None),
+        ("stable", "stable", None),
+    ],
+)
+def test_rev_template_parse(template: str, rev: str, expected: Version | None) -> None:
+    assert compile_rev_template(template).parse(rev) == expected
+
+
+def test_rev_template_parse_with_transforms() -> None:
+    template = compile_rev_template("v${rev|truncate:2}-mirror")
+
+    assert template.parse("v1.2-mirror") == Version("1.2")
+    assert template.version("1.2.3") == Version("1.2")
+    assert template.parse("v1.2") is None
+
+
+@pytest.mark.parametrize("template", ["${rev|unknown}", "${rev|truncate}", "${rev|truncate:0}", "${rev|normalize:1}"])
+def test_rev_template_invalid_transform(template: str) -> None:
+    with pytest.raises(ValueError, match="Unknown rev template transform"):
+        compile_rev_template(template)
+
+
+def test_rev_template_is_compiled_once() -> None:
+    assert compile_rev_template("v${rev}") is compile_rev_template("v${rev}")
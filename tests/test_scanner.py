@@ -0,0 +1,135 @@
+from pathlib import Path
+
+import pytest
+
+from sync_pre_commit_lock.pre_commit_config import PreCommitHookConfig
+from sync_pre_commit_lock.scanner import ScalarNode, Span, UnsupportedSyntax, scan_repos
+
+FIXTURES = Path(__file__).parent / "fixtures" / "sample_pre_commit_config"
+
+
+@pytest.mark.parametrize("path", sorted(FIXTURES.glob("*.yaml")), ids=lambda path: path.name)
+def test_scanner_matches_strictyaml(path: Path) -> None:
+    text = path.read_text()
+    config = PreCommitHookConfig(text, path)
+
+    assert config.repo_nodes == config._repo_nodes_from_yaml()
+
+    lines = text.splitlines()
+    for repo in config.repo_nodes:
+        for hook in repo.hooks:
+            for node in (repo.repo, hook.id, *hook.additional_dependencies):
+                assert node.span is not None
+                line, column, length = node.span
+                assert lines[line][column : column + length] == node.value
+
+
+def test_scan_spans() -> None:
+    text = """\
+# comment
+---
+ci:
+  autofix: true
+repos:
+- repo: https://github.com/psf/black  # comment
+  rev: "23.3.0"
+  hooks:
+  - id: black
+    additional_dependencies: [types-PyYAML, 'types-requests==1.0']
+  - id: black-jupyter
+    additional_dependencies:
+    - click==8.0  # comment
+"""
+    (repo,) = scan_repos(text)
+
+    assert repo.repo.value == "https://github.com/psf/black"
+    assert repo.repo.span == Span(5, 8, 28)
+    assert repo.rev is not None
+    assert repo.rev.value == "23.3.0"
+    assert repo.rev.span == Span(6, 8, 6)
+    assert [hook.id.value for hook in repo.hooks] == ["black", "black-jupyter"]
+    assert [(dep.value, dep.span) for dep in repo.hooks[0].additional_dependencies] == [
+        ("types-PyYAML", Span(9, 30, 12)),
+        ("types-requests==1.0", Span(9, 45, 19)),
+    ]
+    assert [(dep.value, dep.span) for dep in repo.hooks[1].additional_dependencies] == [
+        ("click==8.0", Span(12, 6, 10)),
+    ]
+
+
+def test_scan_skips_unknown_values() -> None:
+    text = """\
+exclude: |
+  (?x)^(
+      docs/.*
+  )$
+repos:
+  - repo: local
+    hooks:
+      - id: script
+        entry: >
+          some folded
+          text
+        types_or:
+        - python
+        - pyi
+        env:
+          FOO: bar
+  - repo: https://github.com/psf/black
+    rev: 23.3.0
+"""
+    repos = scan_repos(text)
+
+    assert [(repo.repo.value, repo.rev and repo.rev.value) for repo in repos] == [
+        ("local", None),
+        ("https://github.com/psf/black", "23.3.0"),
+    ]
+    assert repos[0].hooks[0].id.value == "script"
+
+
+def test_scan_empty_document() -> None:
+    assert scan_repos("# Only a comment\n") == ()
+    assert scan_repos("repos: []\n") == ()
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        pytest.param("repos: [{repo: local}]\n", id="flow-repos"),
+        pytest.param("repos:\n  - repo: &url https://example.com\n    rev: v1\n", id="anchor"),
+        pytest.param("x: &anchor\n  a: b\nrepos:\n  - *anchor\n", id="alias"),
+        pytest.param("repos:\n  - repo: local\n    repo: local\n", id="duplicate-key"),
+        pytest.param('repos:\n  - repo: "https://example.com\\n"\n    rev: v1\n', id="escaped-string"),
+        pytest.param("repos:\n  - repo: https://example.com\n      /continued\n", id="multi-line-scalar"),
+        pytest.param(
+            "repos:\n  - repo: local\n    hooks:\n      - id: a\n        args: [\n          --fix]\n",
+            id="multi-line-flow",
+        ),
+        pytest.param("repos:\n\t- repo: local\n", id="tabs"),
+        pytest.param("---\nrepos: []\n---\nrepos: []\n", id="multiple-documents"),
+        pytest.param("- repo: local\n", id="root-sequence"),
+        pytest.param("dummy_stream", id="root-scalar"),
+    ],
+)
+def test_scan_unsupported_syntax(text: str) -> None:
+    with pytest.raises(UnsupportedSyntax):
+        scan_repos(text)
+
+
+def test_config_falls_back_to_strictyaml() -> None:
+    text = "repos: [{repo: https://github.com/psf/black, rev: 23.3.0, hooks: [{id: black}]}]\n"
+    config = PreCommitHookConfig(text, Path("dummy_path"))
+
+    assert "yaml" in config.__dict__
+    assert [(repo.repo, repo.rev) for repo in config.repos] == [("https://github.com/psf/black", "23.3.0")]
+    (repo,) = config.repo_nodes
+    assert repo.rev == ScalarNode("23.3.0", Span(0, 50, 6))
+
+
+def test_strictyaml_nodes_without_span() -> None:
+    text = 'repos:\n  - repo: "https://github.com/psf/\\\n    black"\n    rev: 23.3.0\n'
+    config = PreCommitHookConfig(text, Path("dummy_path"))
+
+    (repo,) = config.repo_nodes
+    assert repo.repo == ScalarNode("https://github.com/psf/black", None)
+    assert repo.rev == ScalarNode("23.3.0", Span(3, 9, 6))
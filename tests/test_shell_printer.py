@@ -1,9 +1,11 @@
 import re
+from collections.abc import Callable
 from textwrap import dedent
 
 import pytest
 
 from sync_pre_commit_lock.pre_commit_config import PreCommitHook, PreCommitRepo
+from sync_pre_commit_lock.pre_commit_store import EnvironmentEstimate
 from sync_pre_commit_lock.shell import ShellPrinter, Verbosity, use_color
 
 
@@ -126,6 +128,24 @@ def test_shell_printer_list_success(capsys: pytest.CaptureFixture[str]) -> None:
     assert normalize(captured.out) == expected
 
 
+def test_shell_printer_list_success_with_environments(capsys: pytest.CaptureFixture[str]) -> None:
+    printer = ShellPrinter()
+
+    printer.list_updated_packages(
+        {
+            "package": (
+                PreCommitRepo("https://repo1.local/test", "rev1", [PreCommitHook("hook")]),
+                PreCommitRepo("https://repo1.local/test", "rev2", [PreCommitHook("hook")]),
+            )
+        },
+        {"package": EnvironmentEstimate(hooks=("hook",), cold=("hook",))},
+    )
+    captured = capsys.readouterr()
+
+    expected = "[sync-pre-commit-lock] ✔ https://repo1.local/test \t rev1 -> rev2 (1 new hook environments, 1 to build)"
+    assert normalize(captured.out) == expected
+
+
 def test_shell_printer_list_success_additional_dependency(capsys: pytest.CaptureFixture[str]) -> None:
     printer = ShellPrinter()
 
@@ -224,3 +244,35 @@ def test_shell_printer_list_success_renamed_repository(capsys: pytest.CaptureFix
 
     expected = "[sync-pre-commit-lock] ✔ https://{old -> new}.repo.local/test \t rev1 -> rev2"
     assert normalize(captured.out) == expected
+
+
+@pytest.mark.parametrize(
+    ("verbosity", "expected"),
+    [
+        (Verbosity.QUIET, {"debug": False, "info": False, "error": True}),
+        (Verbosity.NORMAL, {"debug": False, "info": True, "error": True}),
+        (Verbosity.DEBUG, {"debug": True, "info": True, "error": True}),
+    ],
+)
+def test_shell_printer_lazy_messages(
+    capsys: pytest.CaptureFixture[str], verbosity: Verbosity, expected: dict[str, bool]
+) -> None:
+    printer = ShellPrinter(with_prefix=False, verbosity=verbosity)
+    built: list[str] = []
+
+    def message(level: str) -> Callable[[], str]:
+        def build() -> str:
+            built.append(level)
+            return level
+
+        return build
+
+    for level, enabled in expected.items():
+        assert printer.is_enabled(level) is enabled  # type: ignore[arg-type]
+    printer.debug(message("debug"))
+    printer.info(message("info"))
+    printer.error(message("error"))
+
+    assert built == [level for level, enabled in expected.items() if enabled]
+    captured = capsys.readouterr()
+    assert normalize(captured.out + captured.err).split() == built
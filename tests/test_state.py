@@ -0,0 +1,225 @@
+import json
+import os
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from sync_pre_commit_lock import Printer
+from sync_pre_commit_lock.actions.sync_hooks import GenericLockedPackage, SyncPreCommitHooksVersion
+from sync_pre_commit_lock.config import SyncPreCommitLockConfig
+from sync_pre_commit_lock.state import RACY_WINDOW_NS, SyncState, cache_dir
+
+CONFIG = """\
+repos:
+  - repo: https://github.com/psf/black-pre-commit-mirror
+    rev: 23.3.0
+    hooks:
+      - id: black
+"""
+SKIPPED = "Nothing changed since the last sync, pre-commit hooks are up to date."
+
+
+def age(path: Path) -> None:
+    """Move the mtime out of the racy window"""
+    mtime_ns = path.stat().st_mtime_ns - 2 * RACY_WINDOW_NS
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+@pytest.fixture
+def pre_commit_config(tmp_path: Path) -> Path:
+    path = tmp_path / ".pre-commit-config.yaml"
+    path.write_text(CONFIG)
+    age(path)
+    return path
+
+
+def syncer(
+    path: Path, version: str = "23.3.0", dry_run: bool = False, full: bool = False, **config: list[str]
+) -> SyncPreCommitHooksVersion:
+    return SyncPreCommitHooksVersion(
+        printer=MagicMock(spec=Printer),
+        pre_commit_config_file_path=path,
+        locked_packages={
+            "black": GenericLockedPackage("black", version),
+            "ruff": GenericLockedPackage("ruff", "0.1.0"),
+            "click": GenericLockedPackage("click", "8.1.0"),
+        },
+        plugin_config=SyncPreCommitLockConfig(**config),
+        dry_run=dry_run,
+        state=SyncState.load(path),
+        full=full,
+    )
+
+
+def sync(path: Path, version: str = "23.3.0", dry_run: bool = False, full: bool = False, **config: list[str]) -> bool:
+    """Run a sync and return whether it was skipped"""
+    action = syncer(path, version, dry_run, full, **config)
+    action.execute()
+    return (SKIPPED,) in [call.args for call in action.printer.info.call_args_list]  # type: ignore[attr-defined]
+
+
+def test_state_is_stored_in_cache_dir(pre_commit_config: Path, isolated_cache: Path) -> None:
+    sync(pre_commit_config)
+
+    assert cache_dir() == isolated_cache / "sync-pre-commit-lock"
+    (state_file,) = cache_dir().iterdir()
+    assert json.loads(state_file.read_text())["file"]["stat"] is not None
+
+
+def test_sync_is_skipped_when_nothing_changed(pre_commit_config: Path) -> None:
+    assert not sync(pre_commit_config)
+    assert sync(pre_commit_config)
+
+
+def test_file_is_not_hashed_when_stat_unchanged(pre_commit_config: Path) -> None:
+    sync(pre_commit_config)
+    stat = pre_commit_config.stat()
+    # Same size, mtime and inode: the file is trusted without reading it
+    pre_commit_config.write_text(CONFIG.replace("23.3.0", "22.1.0"))
+    os.utime(pre_commit_config, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    assert sync(pre_commit_config)
+
+
+@pytest.mark.parametrize(
+    "changes",
+    [
+        pytest.param({"version": "24.1.0"}, id="locked-version"),
+        pytest.param({"ignore": ["black"]}, id="plugin-config"),
+    ],
+)
+def test_sync_runs_when_inputs_changed(pre_commit_config: Path, changes: dict) -> None:
+    sync(pre_commit_config)
+
+    assert not sync(pre_commit_config, **changes)
+
+
+def test_sync_runs_when_pre_commit_config_changed(pre_commit_config: Path) -> None:
+    sync(pre_commit_config)
+    pre_commit_config.write_text(CONFIG.replace("23.3.0", "22.1.0"))
+
+    assert not sync(pre_commit_config)
+    assert pre_commit_config.read_text() == CONFIG
+    assert sync(pre_commit_config)
+
+
+def test_dry_run_with_changes_is_not_recorded(pre_commit_config: Path) -> None:
+    sync(pre_commit_config, version="24.1.0", dry_run=True)
+
+    assert not sync(pre_commit_config, version="24.1.0", dry_run=True)
+
+
+def test_racily_clean_file_is_hashed(pre_commit_config: Path) -> None:
+    pre_commit_config.touch()
+    sync(pre_commit_config)
+    state = SyncState.load(pre_commit_config)
+    assert state.data["file"]["stat"] is None
+
+    age(pre_commit_config)
+    assert sync(pre_commit_config)
+    assert SyncState.load(pre_commit_config).data["file"]["stat"] is not None
+
+
+def test_invalid_state_is_ignored(pre_commit_config: Path) -> None:
+    sync(pre_commit_config)
+    state = SyncState.load(pre_commit_config)
+    state.path.write_text("{not json")
+
+    assert SyncState.load(pre_commit_config).data == {}
+    assert not sync(pre_commit_config)
+
+
+INCREMENTAL_CONFIG = """\
+repos:
+  - repo: https://github.com/psf/black-pre-commit-mirror
+    rev: 23.3.0
+    hooks:
+      - id: black
+        additional_dependencies: [click==8.1.0]
+  - repo: https://github.com/astral-sh/ruff-pre-commit
+    rev: v0.1.0
+    hooks:
+      - id: ruff
+"""
+
+
+def evaluated_repos(action: SyncPreCommitHooksVersion) -> list[str]:
+    with patch.object(
+        SyncPreCommitHooksVersion,
+        "get_pre_commit_repo_new_version",
+        autospec=True,
+        side_effect=SyncPreCommitHooksVersion.get_pre_commit_repo_new_version,
+    ) as new_version:
+        action.execute()
+    return sorted(call.args[1].repo for call in new_version.call_args_list)
+
+
+def test_only_changed_repos_are_evaluated(pre_commit_config: Path) -> None:
+    pre_commit_config.write_text(INCREMENTAL_CONFIG)
+    assert len(evaluated_repos(syncer(pre_commit_config))) == 2
+
+    # Not skipped, as the config changed, but no repo changed
+    pre_commit_config.write_text("# Comment\n" + INCREMENTAL_CONFIG)
+    assert evaluated_repos(syncer(pre_commit_config)) == []
+
+    assert evaluated_repos(syncer(pre_commit_config, version="24.1.0")) == [
+        "https://github.com/psf/black-pre-commit-mirror"
+    ]
+    assert "rev: 24.1.0" in pre_commit_config.read_text()
+
+
+def test_updated_repo_is_evaluated_once_more(pre_commit_config: Path) -> None:
+    pre_commit_config.write_text(INCREMENTAL_CONFIG)
+    evaluated_repos(syncer(pre_commit_config, version="24.1.0"))
+
+    # Only recorded once read in sync from the config
+    pre_commit_config.write_text("# Comment\n" + pre_commit_config.read_text())
+    assert evaluated_repos(syncer(pre_commit_config, version="24.1.0")) == [
+        "https://github.com/psf/black-pre-commit-mirror"
+    ]
+    pre_commit_config.write_text("# Comment\n" + pre_commit_config.read_text())
+    assert evaluated_repos(syncer(pre_commit_config, version="24.1.0")) == []
+
+
+def test_refused_downgrade_is_evaluated_again(pre_commit_config: Path) -> None:
+    pre_commit_config.write_text(INCREMENTAL_CONFIG)
+    evaluated_repos(syncer(pre_commit_config, version="22.1.0", downgrade_policy="refuse"))  # type: ignore[arg-type]
+
+    pre_commit_config.write_text("# Comment\n" + INCREMENTAL_CONFIG)
+    action = syncer(pre_commit_config, version="22.1.0", downgrade_policy="refuse")  # type: ignore[arg-type]
+    assert evaluated_repos(action) == ["https://github.com/psf/black-pre-commit-mirror"]
+    action.printer.warning.assert_called_once()  # type: ignore[attr-defined]
+    assert "rev: 23.3.0" in pre_commit_config.read_text()
+
+
+def test_additional_dependency_change_is_evaluated(pre_commit_config: Path) -> None:
+    pre_commit_config.write_text(INCREMENTAL_CONFIG)
+    evaluated_repos(syncer(pre_commit_config))
+
+    action = syncer(pre_commit_config)
+    action.locked_packages["click"] = GenericLockedPackage("click", "8.2.0")
+    assert evaluated_repos(action) == ["https://github.com/psf/black-pre-commit-mirror"]
+    assert "click==8.2.0" in pre_commit_config.read_text()
+
+
+def test_full_sync_evaluates_every_repo(pre_commit_config: Path) -> None:
+    pre_commit_config.write_text(INCREMENTAL_CONFIG)
+    evaluated_repos(syncer(pre_commit_config))
+
+    assert len(evaluated_repos(syncer(pre_commit_config, full=True))) == 2
+
+
+def test_settings_change_evaluates_every_repo(pre_commit_config: Path) -> None:
+    pre_commit_config.write_text(INCREMENTAL_CONFIG)
+    evaluated_repos(syncer(pre_commit_config))
+
+    assert len(evaluated_repos(syncer(pre_commit_config, ignore=["click"]))) == 2
+
+
+def test_plugin_upgrade_evaluates_every_repo(pre_commit_config: Path) -> None:
+    pre_commit_config.write_text(INCREMENTAL_CONFIG)
+    evaluated_repos(syncer(pre_commit_config))
+
+    with patch("sync_pre_commit_lock.state.plugin_version", return_value="99.0.0"):
+        assert len(evaluated_repos(syncer(pre_commit_config))) == 2
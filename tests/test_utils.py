@@ -1,6 +1,11 @@
+import os
+import stat
+from pathlib import Path
+from unittest.mock import patch
+
 import pytest
 
-from sync_pre_commit_lock.utils import normalize_git_url, url_diff
+from sync_pre_commit_lock.utils import normalize_git_url, url_diff, write_if_changed
 
 
 # Here are the test cases
@@ -37,3 +42,61 @@ def test_normalize_git_url(url: str, expected: str) -> None:
 )
 def test_url_diff(old: str, new: str, expected: str):
     assert url_diff(old, new) == expected
+
+
+def test_write_if_changed(tmp_path: Path) -> None:
+    path = tmp_path / "file.yaml"
+    path.write_text("old\n")
+    path.chmod(0o640)
+
+    assert write_if_changed(path, "new\n")
+
+    assert path.read_text() == "new\n"
+    assert stat.S_IMODE(path.stat().st_mode) == 0o640
+    assert [p.name for p in tmp_path.iterdir()] == ["file.yaml"]
+
+
+@pytest.mark.skipif(os.name != "posix", reason="POSIX file modes")
+def test_write_if_changed_creates_file_with_default_mode(tmp_path: Path) -> None:
+    path = tmp_path / "file.yaml"
+    umask = os.umask(0o027)
+    try:
+        assert write_if_changed(path, "new\n")
+    finally:
+        os.umask(umask)
+
+    assert path.read_text() == "new\n"
+    assert stat.S_IMODE(path.stat().st_mode) == 0o640
+
+
+def test_write_if_changed_skips_identical_contents(tmp_path: Path) -> None:
+    path = tmp_path / "file.yaml"
+    path.write_text("same\n")
+    before = path.stat()
+
+    assert not write_if_changed(path, "same\n")
+
+    assert path.stat() == before
+
+
+def test_write_if_changed_follows_symlinks(tmp_path: Path) -> None:
+    target = tmp_path / "target.yaml"
+    target.write_text("old\n")
+    link = tmp_path / "link.yaml"
+    link.symlink_to(target)
+
+    assert write_if_changed(link, "new\n", fsync=True)
+
+    assert link.is_symlink()
+    assert target.read_text() == "new\n"
+
+
+def test_write_if_changed_cleans_up_on_error(tmp_path: Path) -> None:
+    path = tmp_path / "file.yaml"
+    path.write_text("old\n")
+
+    with patch.object(Path, "replace", side_effect=OSError), pytest.raises(OSError):
+        write_if_changed(path, "new\n")
+
+    assert path.read_text() == "old\n"
+    assert [p.name for p in tmp_path.iterdir()] == ["file.yaml"]
@@ -34,3 +34,115 @@ def test_sync_pre_commit(project: Path, monkeypatch: pytest.MonkeyPatch, capsys:
     captured = capsys.readouterr()
 
     assert "https://github.com/astral-sh/ruff-pre-commit \t v0.1.0 -> v0.13.2" in captured.out
+
+
+def test_sync_pre_commit_diff(project: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture):
+    from sync_pre_commit_lock.uv import sync_pre_commit
+
+    monkeypatch.chdir(project)
+    monkeypatch.setattr("sys.argv", ["sync-pre-commit-uv", "--diff", "--dry-run"])
+    original = (project / ".pre-commit-config.yaml").read_text()
+
+    sync_pre_commit()
+
+    out = capsys.readouterr().out
+    assert "--- a/.pre-commit-config.yaml" in out
+    assert "-    rev: v0.1.0" in out
+    assert "+    rev: v0.13.2" in out
+    assert (project / ".pre-commit-config.yaml").read_text() == original
+
+
+def test_sync_pre_commit_full(project: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture):
+    from sync_pre_commit_lock.uv import sync_pre_commit
+
+    monkeypatch.chdir(project)
+    monkeypatch.setattr("sys.argv", ["sync-pre-commit-uv"])
+    sync_pre_commit()
+    sync_pre_commit()
+    assert "Nothing changed since the last sync" in capsys.readouterr().out
+
+    monkeypatch.setattr("sys.argv", ["sync-pre-commit-uv", "--full"])
+    sync_pre_commit()
+    assert "All pre-commit hooks are already up to date with the lockfile: ruff (v0.13.2)" in capsys.readouterr().out
+
+
+def test_load_lock_matches_toml(project: Path):
+    from sync_pre_commit_lock.uv import _load_lock_toml, load_lock
+
+    lock_path = project / "uv.lock"
+
+    assert load_lock(lock_path) == _load_lock_toml(lock_path)
+
+
+def test_load_lock_only_names(project: Path):
+    from sync_pre_commit_lock.uv import load_lock
+
+    lock = load_lock(project / "uv.lock", names={"ruff", "not-locked"})
+
+    assert list(lock) == ["ruff"]
+
+
+def test_load_lock_unknown_version_fallback(project: Path):
+    from sync_pre_commit_lock.uv import load_lock
+
+    lock_path = project / "uv.lock"
+    lock_path.write_text('version = 2\n\n[[package]]\nversion = "1.0"\nname = "ruff"\n')
+
+    assert load_lock(lock_path)["ruff"].version == "1.0"
+
+
+@pytest.mark.parametrize(
+    "python_version,expected",
+    [("3.9", "3.13.0"), ("3.9.18", "3.13.0"), ("3.10", "3.14.1"), ("3.13.1", "3.14.1")],
+)
+def test_load_lock_forked_versions(project: Path, python_version: str, expected: str):
+    from sync_pre_commit_lock.uv import _load_lock_toml, load_lock, load_lock_versions
+
+    lock_path = project / "uv.lock"
+
+    assert [locked.version for locked in load_lock_versions(lock_path)["rapidfuzz"]] == ["3.13.0", "3.14.1"]
+    assert load_lock(lock_path, python_version=python_version)["rapidfuzz"].version == expected
+    assert load_lock(lock_path, python_version=python_version) == _load_lock_toml(
+        lock_path, python_version=python_version
+    )
+
+
+def test_select_version():
+    from sync_pre_commit_lock.lockfile import LockedVersion
+    from sync_pre_commit_lock.uv import select_version
+
+    assert select_version([LockedVersion("1.0")]) == "1.0"
+    assert select_version([LockedVersion("1.0", ("python_version < '3'",)), LockedVersion("2.0")]) == "2.0"
+    # No fork matches: the highest version, whatever the order
+    forks = [LockedVersion("10.0", ("sys_platform == 'nope'",)), LockedVersion("9.0", ("invalid marker",))]
+    assert select_version(forks) == "10.0"
+    assert select_version(forks[::-1]) == "10.0"
+
+
+def test_sync_pre_commit_python(project: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture):
+    from sync_pre_commit_lock.uv import sync_pre_commit
+
+    monkeypatch.chdir(project)
+    monkeypatch.setattr("sys.argv", ["sync-pre-commit-uv", "--python", "3.9", "--dry-run"])
+
+    sync_pre_commit()
+
+    assert "https://github.com/astral-sh/ruff-pre-commit \t v0.1.0 -> v0.13.2" in capsys.readouterr().out
+
+
+def test_sync_pre_commit_dependency_groups(
+    project: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture
+):
+    from sync_pre_commit_lock.uv import sync_pre_commit
+
+    monkeypatch.chdir(project)
+    monkeypatch.setattr("sys.argv", ["sync-pre-commit-uv", "--dry-run"])
+    pyproject = project / "pyproject.toml"
+    pyproject.write_text(pyproject.read_text() + '\n[tool.sync-pre-commit-lock]\ndependency-groups = ["testtox"]\n')
+
+    sync_pre_commit()
+    assert "v0.13.2" not in capsys.readouterr().out
+
+    monkeypatch.setenv("SYNC_PRE_COMMIT_LOCK_DEPENDENCY_GROUPS", "dev")
+    sync_pre_commit()
+    assert "v0.1.0 -> v0.13.2" in capsys.readouterr().out